@@ -109,8 +109,25 @@ export const generateExternalId = () => {
 export const listSessions = (clientId: string) =>
   api.get<ChatSession[]>(`/api/v1/sessions/client/${clientId}`);
 
-export const getSessionMessages = (sessionId: string) =>
-  api.get<ChatMessage[]>(`/api/v1/sessions/${sessionId}/messages`);
+export const getSessionMessagesPage = (sessionId: string, cursor?: string) =>
+  api.get<ChatMessage[]>(`/api/v1/sessions/${sessionId}/messages`, {
+    params: cursor ? { cursor } : undefined,
+  });
+
+// The API returns the newest page first; follow X-Next-Cursor back to the start
+export const getSessionMessages = async (sessionId: string) => {
+  const response = await getSessionMessagesPage(sessionId);
+  let messages = response.data;
+  let cursor = response.headers["x-next-cursor"];
+
+  while (cursor) {
+    const older = await getSessionMessagesPage(sessionId, cursor);
+    messages = [...older.data, ...messages];
+    cursor = older.headers["x-next-cursor"];
+  }
+
+  return { ...response, data: messages };
+};
 
 export const createSession = (clientId: string, agentId: string) => {
   const externalId = generateExternalId();
@@ -0,0 +1,53 @@
+"""add_a2a_tasks_table
+
+Revision ID: add_a2a_tasks_table
+Revises: add_agent_linking_to_channels
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "add_a2a_tasks_table"
+down_revision: Union[str, None] = "add_agent_linking_to_channels"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'a2a_tasks',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('agent_id', sa.UUID(), nullable=False),
+        sa.Column('context_id', sa.String(), nullable=True),
+        sa.Column('state', sa.String(), nullable=False),
+        sa.Column('status_message', sa.JSON(), nullable=True),
+        sa.Column('artifacts', sa.JSON(), nullable=True),
+        sa.Column('history', sa.JSON(), nullable=True),
+        sa.Column('state_history', sa.JSON(), nullable=True),
+        sa.Column('push_notification_config', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['agent_id'], ['agents.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.CheckConstraint(
+            "state IN ('submitted', 'working', 'input-required', 'completed', "
+            "'canceled', 'failed', 'rejected', 'auth-required', 'unknown')",
+            name='check_a2a_task_state',
+        ),
+    )
+    op.create_index(op.f('ix_a2a_tasks_agent_id'), 'a2a_tasks', ['agent_id'], unique=False)
+    op.create_index(op.f('ix_a2a_tasks_context_id'), 'a2a_tasks', ['context_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_a2a_tasks_context_id'), table_name='a2a_tasks')
+    op.drop_index(op.f('ix_a2a_tasks_agent_id'), table_name='a2a_tasks')
+    op.drop_table('a2a_tasks')
@@ -0,0 +1,66 @@
+"""add_artifact_storage
+
+Revision ID: add_artifact_storage
+Revises: add_session_event_archive
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "add_artifact_storage"
+down_revision: Union[str, None] = "add_session_event_archive"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'artifact_blobs',
+        sa.Column('sha256', sa.String(length=64), nullable=False),
+        sa.Column('size', sa.BigInteger(), nullable=False),
+        sa.Column('storage_key', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('last_referenced_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('sha256'),
+    )
+    op.create_table(
+        'artifact_versions',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('app_name', sa.String(), nullable=False),
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('session_id', sa.String(), nullable=False),
+        sa.Column('filename', sa.String(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('sha256', sa.String(length=64), nullable=False),
+        sa.Column('mime_type', sa.String(), nullable=True),
+        sa.Column('size', sa.BigInteger(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['sha256'], ['artifact_blobs.sha256'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint(
+            'app_name',
+            'user_id',
+            'session_id',
+            'filename',
+            'version',
+            name='uq_artifact_versions_file_version',
+        ),
+    )
+    op.create_index('ix_artifact_versions_sha256', 'artifact_versions', ['sha256'], unique=False)
+    op.create_index(op.f('ix_artifact_versions_expires_at'), 'artifact_versions', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_artifact_versions_expires_at'), table_name='artifact_versions')
+    op.drop_index('ix_artifact_versions_sha256', table_name='artifact_versions')
+    op.drop_table('artifact_versions')
+    op.drop_table('artifact_blobs')
@@ -0,0 +1,130 @@
+"""add_audit_log_partitions
+
+Revision ID: add_audit_log_partitions
+Revises: add_workflow_timers
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "add_audit_log_partitions"
+down_revision: Union[str, None] = "add_workflow_timers"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = (
+    'id, user_id, action, resource_type, resource_id, details, '
+    'ip_address, user_agent, created_at'
+)
+
+# Months created past the current one; the app keeps this window moving
+PARTITIONS_AHEAD = 3
+
+
+def _add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def _create_audit_logs_table(*constraints, **kwargs) -> None:
+    op.create_table(
+        'audit_logs',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('user_id', sa.UUID(), nullable=True),
+        sa.Column('action', sa.String(), nullable=False),
+        sa.Column('resource_type', sa.String(), nullable=False),
+        sa.Column('resource_id', sa.String(), nullable=True),
+        sa.Column('details', sa.JSON(), nullable=True),
+        sa.Column('ip_address', sa.String(), nullable=True),
+        sa.Column('user_agent', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='SET NULL'),
+        *constraints,
+        **kwargs,
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.rename_table('audit_logs', 'audit_logs_legacy')
+    op.execute(
+        'ALTER TABLE audit_logs_legacy '
+        'RENAME CONSTRAINT audit_logs_pkey TO audit_logs_legacy_pkey'
+    )
+
+    # The partition key has to be part of the primary key
+    _create_audit_logs_table(
+        sa.PrimaryKeyConstraint('id', 'created_at'),
+        postgresql_partition_by='RANGE (created_at)',
+    )
+    op.create_index(
+        'ix_audit_logs_created_at', 'audit_logs', ['created_at', 'id'], unique=False
+    )
+    op.create_index(
+        'ix_audit_logs_user_created_at',
+        'audit_logs',
+        ['user_id', 'created_at'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_audit_logs_resource_action_created_at',
+        'audit_logs',
+        ['resource_type', 'action', 'created_at'],
+        unique=False,
+    )
+
+    # One partition per month from the oldest existing log
+    now = datetime.now(timezone.utc)
+    oldest = op.get_bind().execute(
+        sa.text('SELECT min(created_at) FROM audit_logs_legacy')
+    ).scalar()
+    first = (oldest or now).astimezone(timezone.utc)
+    month = datetime(first.year, first.month, 1, tzinfo=timezone.utc)
+    current = datetime(now.year, now.month, 1, tzinfo=timezone.utc)
+    last = _add_months(current, PARTITIONS_AHEAD)
+    while month <= last:
+        next_month = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE audit_logs_p{month:%Y%m} PARTITION OF audit_logs "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month.isoformat()}')"
+        )
+        month = next_month
+    op.execute('CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT')
+
+    op.execute(
+        f'INSERT INTO audit_logs ({COLUMNS}) '
+        f'SELECT id, user_id, action, resource_type, resource_id, details, '
+        f'ip_address, user_agent, COALESCE(created_at, now()) '
+        f'FROM audit_logs_legacy'
+    )
+    op.drop_table('audit_logs_legacy')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.rename_table('audit_logs', 'audit_logs_partitioned')
+    op.execute(
+        'ALTER TABLE audit_logs_partitioned '
+        'RENAME CONSTRAINT audit_logs_pkey TO audit_logs_partitioned_pkey'
+    )
+    for name in (
+        'ix_audit_logs_created_at',
+        'ix_audit_logs_user_created_at',
+        'ix_audit_logs_resource_action_created_at',
+    ):
+        op.execute(f'ALTER INDEX {name} RENAME TO {name}_partitioned')
+
+    _create_audit_logs_table(sa.PrimaryKeyConstraint('id'))
+    op.execute(
+        f'INSERT INTO audit_logs ({COLUMNS}) '
+        f'SELECT {COLUMNS} FROM audit_logs_partitioned'
+    )
+    # Dropping the parent drops every partition with it
+    op.drop_table('audit_logs_partitioned')
@@ -0,0 +1,68 @@
+"""add_dashboard_rollups
+
+Revision ID: add_dashboard_rollups
+Revises: add_audit_log_partitions
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "add_dashboard_rollups"
+down_revision: Union[str, None] = "add_audit_log_partitions"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Triggers installed by src/services/dashboard_service.py on startup
+COUNTED_TABLES = ('agents', 'crm_contacts', 'crm_pipelines', 'sessions')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'dashboard_daily_rollups',
+        sa.Column('client_id', sa.UUID(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('metric', sa.String(), nullable=False),
+        sa.Column('created', sa.BigInteger(), server_default='0', nullable=False),
+        sa.Column('deleted', sa.BigInteger(), server_default='0', nullable=False),
+        sa.PrimaryKeyConstraint('client_id', 'day', 'metric'),
+    )
+    op.create_table(
+        'dashboard_rollup_watermarks',
+        sa.Column('source', sa.String(), nullable=False),
+        sa.Column('watermark', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('source'),
+    )
+
+    # Sessions are read by the aggregator from the ADK table by create_time;
+    # the table only exists once the ADK session service has started
+    inspector = sa.inspect(op.get_bind())
+    if 'sessions' in inspector.get_table_names():
+        op.execute(
+            'CREATE INDEX IF NOT EXISTS ix_sessions_create_time '
+            'ON sessions (create_time)'
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    tables = inspector.get_table_names()
+    for table in COUNTED_TABLES:
+        if table in tables:
+            op.execute(f'DROP TRIGGER IF EXISTS {table}_dashboard_rollup ON {table}')
+    op.execute('DROP FUNCTION IF EXISTS dashboard_rollup_count()')
+    op.execute('DROP FUNCTION IF EXISTS dashboard_rollup_session_deleted()')
+    op.execute(
+        'DROP FUNCTION IF EXISTS dashboard_rollup_add(uuid, date, text, bigint, bigint)'
+    )
+    op.execute('DROP INDEX IF EXISTS ix_sessions_create_time')
+    op.drop_table('dashboard_rollup_watermarks')
+    op.drop_table('dashboard_daily_rollups')
@@ -0,0 +1,79 @@
+"""add_memory_entries
+
+Revision ID: add_memory_entries
+Revises: add_artifact_storage
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+
+import os
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "add_memory_entries"
+down_revision: Union[str, None] = "add_artifact_storage"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'memory_entries',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('app_name', sa.String(), nullable=False),
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('session_id', sa.String(), nullable=False),
+        sa.Column('event_id', sa.String(), nullable=False),
+        sa.Column('author', sa.String(), nullable=True),
+        sa.Column('content', sa.Text(), nullable=False),
+        sa.Column('event_timestamp', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint(
+            'app_name',
+            'user_id',
+            'session_id',
+            'event_id',
+            name='uq_memory_entries_event',
+        ),
+    )
+    op.create_index(
+        'ix_memory_entries_namespace',
+        'memory_entries',
+        ['app_name', 'user_id', 'event_timestamp'],
+        unique=False,
+    )
+
+    # Full-text search over memory entries
+    op.execute(
+        "ALTER TABLE memory_entries ADD COLUMN search_vector tsvector "
+        "GENERATED ALWAYS AS (to_tsvector('simple', content)) STORED"
+    )
+    op.execute(
+        'CREATE INDEX ix_memory_entries_search_vector '
+        'ON memory_entries USING gin (search_vector)'
+    )
+
+    # Semantic search, only where the pgvector extension is installed
+    available = op.get_bind().execute(
+        sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'vector'")
+    ).first()
+    if available:
+        dimensions = int(os.getenv('MEMORY_EMBEDDING_DIMENSIONS', 1536))
+        op.execute('CREATE EXTENSION IF NOT EXISTS vector')
+        op.execute(f'ALTER TABLE memory_entries ADD COLUMN embedding vector({dimensions})')
+        op.execute(
+            'CREATE INDEX ix_memory_entries_embedding '
+            'ON memory_entries USING hnsw (embedding vector_cosine_ops)'
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_memory_entries_namespace', table_name='memory_entries')
+    op.drop_table('memory_entries')
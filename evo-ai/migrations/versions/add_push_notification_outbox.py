@@ -0,0 +1,53 @@
+"""add_push_notification_outbox
+
+Revision ID: add_push_notification_outbox
+Revises: add_a2a_tasks_table
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "add_push_notification_outbox"
+down_revision: Union[str, None] = "add_a2a_tasks_table"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'push_notification_outbox',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('task_id', sa.UUID(), nullable=True),
+        sa.Column('url', sa.String(), nullable=False),
+        sa.Column('destination', sa.String(), nullable=False),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('push_config', sa.JSON(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('next_attempt_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('delivered_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.CheckConstraint(
+            "status IN ('pending', 'delivering', 'delivered', 'dead')",
+            name='check_push_notification_status',
+        ),
+    )
+    op.create_index(op.f('ix_push_notification_outbox_task_id'), 'push_notification_outbox', ['task_id'], unique=False)
+    op.create_index('ix_push_notification_outbox_due', 'push_notification_outbox', ['status', 'next_attempt_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_push_notification_outbox_due', table_name='push_notification_outbox')
+    op.drop_index(op.f('ix_push_notification_outbox_task_id'), table_name='push_notification_outbox')
+    op.drop_table('push_notification_outbox')
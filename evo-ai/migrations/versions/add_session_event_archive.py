@@ -0,0 +1,50 @@
+"""add_session_event_archive
+
+Revision ID: add_session_event_archive
+Revises: add_session_events_index
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "add_session_event_archive"
+down_revision: Union[str, None] = "add_session_events_index"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'session_event_archive',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('event_id', sa.String(), nullable=False),
+        sa.Column('app_name', sa.String(), nullable=False),
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('session_id', sa.String(), nullable=False),
+        sa.Column('invocation_id', sa.String(), nullable=True),
+        sa.Column('author', sa.String(), nullable=True),
+        sa.Column('content', sa.JSON(), nullable=True),
+        sa.Column('event_timestamp', sa.DateTime(), nullable=False),
+        sa.Column('summary_event_id', sa.String(), nullable=True),
+        sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_session_event_archive_session',
+        'session_event_archive',
+        ['app_name', 'user_id', 'session_id', 'event_timestamp'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_session_event_archive_session', table_name='session_event_archive')
+    op.drop_table('session_event_archive')
@@ -0,0 +1,36 @@
+"""add_session_events_index
+
+Revision ID: add_session_events_index
+Revises: add_push_notification_outbox
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "add_session_events_index"
+down_revision: Union[str, None] = "add_push_notification_outbox"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The events table is created by the ADK session service on first start
+    inspector = sa.inspect(op.get_bind())
+    if 'events' not in inspector.get_table_names():
+        return
+    op.execute(
+        'CREATE INDEX IF NOT EXISTS ix_events_session_timestamp '
+        'ON events (app_name, user_id, session_id, timestamp DESC, id DESC)'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('DROP INDEX IF EXISTS ix_events_session_timestamp')
@@ -0,0 +1,53 @@
+"""add_workflow_timers
+
+Revision ID: add_workflow_timers
+Revises: add_memory_entries
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "add_workflow_timers"
+down_revision: Union[str, None] = "add_memory_entries"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'workflow_timers',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('agent_id', sa.UUID(), nullable=False),
+        sa.Column('app_name', sa.String(), nullable=False),
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('session_id', sa.String(), nullable=False),
+        sa.Column('node_id', sa.String(), nullable=False),
+        sa.Column('checkpoint', sa.JSON(), nullable=False),
+        sa.Column('delivery_task_id', sa.UUID(), nullable=True),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('fire_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['agent_id'], ['agents.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.CheckConstraint(
+            "status IN ('pending', 'running', 'fired', 'failed')",
+            name='check_workflow_timer_status',
+        ),
+    )
+    op.create_index('ix_workflow_timers_due', 'workflow_timers', ['status', 'fire_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_workflow_timers_due', table_name='workflow_timers')
+    op.drop_table('workflow_timers')
@@ -38,6 +38,7 @@ This is the official and only A2A implementation for the Evo AI platform.
 Methods implemented:
 - message/send: Send a message and get response
 - message/stream: Send a message and stream response  
+- tasks/get, tasks/cancel, tasks/resubscribe: Tasks persisted in the a2a_tasks table
 - agent/authenticatedExtendedCard: Get agent information (via .well-known/agent.json)
 
 Features:
@@ -49,23 +50,44 @@ Features:
 """
 
 import uuid
+import asyncio
 import logging
 import json
 import base64
-import httpx
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 
 from fastapi import APIRouter, Depends, Header, Request, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from starlette.responses import JSONResponse
 from sse_starlette.sse import EventSourceResponse
 from sqlalchemy.sql import text
 
-from src.config.database import get_db
+from src.config.database import get_async_db, get_db, get_read_db, SessionLocal
 from src.config.settings import settings
-from src.services.agent_service import get_agent
+from src.services.agent_service import get_agent, get_agent_async
 from src.services.adk.agent_runner import run_agent, run_agent_stream
+from src.services.execution_scheduler import execution_scheduler
+from src.services.a2a_task_service import (
+    TERMINAL_STATES,
+    cancel_running_task,
+    cancel_when_canceled,
+    create_task,
+    get_task,
+    register_running_task,
+    set_push_notification_config,
+    task_to_a2a,
+    update_task_state,
+)
+from src.services.push_notification_service import enqueue_push_notification
+from src.services.workflow_timer_service import deliver_resumed_output_to
+from src.services.session_service import (
+    count_session_events,
+    get_session_events_page,
+)
+from src.models.models import Session as SessionModel
+from src.core.exceptions import TooManyRequestsError
 from src.services.service_providers import (
     session_service,
     artifacts_service,
@@ -75,6 +97,9 @@ from src.schemas.chat import FileData
 
 logger = logging.getLogger(__name__)
 
+# JSON-RPC server error returned when the execution scheduler is saturated
+SERVER_BUSY_ERROR_CODE = -32000
+
 router = APIRouter(
     prefix="/a2a",
     tags=["a2a-official"],
@@ -87,13 +112,38 @@ router = APIRouter(
 )
 
 
-async def verify_api_key(db: Session, x_api_key: str) -> bool:
+def server_busy_error(request_id: str, error: TooManyRequestsError) -> Dict[str, Any]:
+    """JSON-RPC error payload for a saturated execution scheduler."""
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "error": {
+            "code": SERVER_BUSY_ERROR_CODE,
+            "message": "Server busy",
+            "data": {
+                "error": error.detail["error"],
+                "retryAfter": error.retry_after,
+            },
+        },
+    }
+
+
+def server_busy_response(request_id: str, error: TooManyRequestsError) -> JSONResponse:
+    """HTTP 429 back-pressure response carrying the JSON-RPC error."""
+    return JSONResponse(
+        status_code=429,
+        headers={"Retry-After": str(error.retry_after)},
+        content=server_busy_error(request_id, error),
+    )
+
+
+async def verify_api_key(db: AsyncSession, x_api_key: str) -> bool:
     """Verifies API key against agent config."""
     if not x_api_key:
         raise HTTPException(status_code=401, detail="API key not provided")
 
-    query = text("SELECT * FROM agents WHERE config->>'api_key' = :api_key LIMIT 1")
-    result = db.execute(query, {"api_key": x_api_key}).first()
+    query = text("SELECT 1 FROM agents WHERE config->>'api_key' = :api_key LIMIT 1")
+    result = (await db.execute(query, {"api_key": x_api_key})).first()
 
     if not result:
         raise HTTPException(status_code=401, detail="Invalid API key")
@@ -267,97 +317,70 @@ def clean_message_content(content: str, role: str) -> str:
     return content
 
 
-def extract_conversation_history(
-    agent_id: str, external_id: str
-) -> List[Dict[str, Any]]:
-    """Extract conversation history from session using the same logic as /sessions/{session_id}/messages."""
-    logger.info(
-        f"🔍 extract_conversation_history called with agent_id={agent_id}, external_id={external_id}"
-    )
-
-    try:
-        from src.services.session_service import get_session_events, get_session_by_id
-
-        # Get session ID in the correct format (same as working endpoint)
-        session_id = f"{external_id}_{agent_id}"
-        logger.info(f"📋 Constructed session_id: {session_id}")
-
-        # First, verify session exists (same as working endpoint)
-        logger.info(f"🔍 Verifying session exists...")
-        session = get_session_by_id(session_service, session_id)
-        if not session:
-            logger.warning(f"⚠️ Session not found: {session_id}")
-            return []
-
-        logger.info(f"✅ Session found: {session_id}")
+def extract_conversation_history_page(
+    db: Session,
+    agent_id: str,
+    external_id: str,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    before_timestamp: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Extract the newest page of conversation history from a session.
 
-        # Get events using same method as working endpoint
-        logger.info(f"🔍 Getting events for session...")
-        events = get_session_events(session_service, session_id)
-        logger.info(
-            f"📋 get_session_events returned {len(events) if events else 0} events"
-        )
+    Only ``limit`` events are read from the session tables, so the cost does
+    not grow with the length of the conversation.
+    """
+    session_id = f"{external_id}_{agent_id}"
+    page = get_session_events_page(
+        db,
+        session_id,
+        limit=limit,
+        cursor=cursor,
+        before_timestamp=before_timestamp,
+    )
 
-        history = []
+    history = []
+    for event in page["events"]:
+        if not event.content or not event.content.parts:
+            continue
 
-        # Process events exactly like the working /messages endpoint
-        for i, event in enumerate(events):
-            logger.info(
-                f"🔍 Processing event {i}: id={getattr(event, 'id', 'NO_ID')}, author={getattr(event, 'author', 'NO_AUTHOR')}"
-            )
+        role = "user" if event.author == "user" else "agent"
+        for part in event.content.parts:
+            if not part.text:
+                continue
 
-            # Convert event to dict like in working endpoint
-            event_dict = (
-                event.model_dump() if hasattr(event, "model_dump") else event.__dict__
+            # Create A2A compatible history entry
+            history.append(
+                {
+                    "role": role,
+                    "content": clean_message_content(part.text, role),
+                    "messageId": event.id,
+                    "timestamp": event.timestamp,
+                    "author": event.author,
+                    "invocation_id": event.invocation_id,
+                }
             )
 
-            # Check if event has content with parts (same logic as working endpoint)
-            if event_dict.get("content") and event_dict["content"].get("parts"):
-                logger.info(
-                    f"📝 Event {i} has content with {len(event_dict['content']['parts'])} parts"
-                )
-
-                for j, part in enumerate(event_dict["content"]["parts"]):
-                    logger.info(f"📝 Processing part {j}: {part}")
-
-                    # Extract text content (same as working endpoint checks for text)
-                    if isinstance(part, dict) and part.get("text"):
-                        role = "user" if event_dict.get("author") == "user" else "agent"
-                        text_content = part["text"]
-
-                        # Clean the content to remove JSON artifacts
-                        cleaned_content = clean_message_content(text_content, role)
-                        logger.info(
-                            f"📝 Cleaned content for {role}: {cleaned_content[:50]}..."
-                        )
-
-                        # Create A2A compatible history entry
-                        history_entry = {
-                            "role": role,
-                            "content": cleaned_content,
-                            "messageId": event_dict.get("id"),
-                            "timestamp": event_dict.get("timestamp"),
-                            "author": event_dict.get("author"),
-                            "invocation_id": event_dict.get("invocation_id"),
-                        }
+    return {
+        "history": history,
+        "next_cursor": page["next_cursor"],
+        "has_more": page["has_more"],
+    }
 
-                        history.append(history_entry)
-                        logger.info(f"✅ Added history entry {len(history)}: {role}")
-                    else:
-                        logger.info(f"📝 Part {j} has no text content: {part}")
-            else:
-                logger.warning(f"⚠️ Event {i} has no content or parts")
 
+def extract_conversation_history(
+    db: Session, agent_id: str, external_id: str, limit: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """Extract the newest conversation history entries from a session."""
+    try:
+        page = extract_conversation_history_page(db, agent_id, external_id, limit)
         logger.info(
-            f"📚 extract_conversation_history extracted {len(history)} messages using working logic"
+            f"📚 extract_conversation_history extracted {len(page['history'])} messages"
         )
-        return history
+        return page["history"]
 
     except Exception as e:
         logger.error(f"❌ Error extracting conversation history: {e}")
-        import traceback
-
-        logger.error(f"Full traceback: {traceback.format_exc()}")
         return []
 
 
@@ -429,6 +452,7 @@ async def process_a2a_message(
     request: Request,
     x_api_key: str = Header(None, alias="x-api-key"),
     db: Session = Depends(get_db),
+    async_db: AsyncSession = Depends(get_async_db),
 ):
     """
     Process A2A messages according to official specification.
@@ -440,10 +464,10 @@ async def process_a2a_message(
     logger.info(f"🎯 A2A Spec endpoint called for agent {agent_id}")
 
     # Verify API key
-    await verify_api_key(db, x_api_key)
+    await verify_api_key(async_db, x_api_key)
 
     # Verify agent exists
-    agent = get_agent(db, agent_id)
+    agent = await get_agent_async(async_db, agent_id)
     if not agent:
         raise HTTPException(status_code=404, detail="Agent not found")
 
@@ -462,9 +486,13 @@ async def process_a2a_message(
         logger.info(f"📝 Method: {method}, ID: {request_id}")
 
         if method == "message/send":
-            return await handle_message_send(agent_id, params, request_id, db)
+            return await handle_message_send(
+                agent_id, params, request_id, db, client_id=agent.client_id
+            )
         elif method == "message/stream":
-            return await handle_message_stream(agent_id, params, request_id, db)
+            return await handle_message_stream(
+                agent_id, params, request_id, db, client_id=agent.client_id
+            )
         elif method == "tasks/get":
             return await handle_tasks_get(agent_id, params, request_id, db)
         elif method == "tasks/cancel":
@@ -529,7 +557,11 @@ async def process_a2a_message(
 
 
 async def handle_message_send(
-    agent_id: uuid.UUID, params: Dict[str, Any], request_id: str, db: Session
+    agent_id: uuid.UUID,
+    params: Dict[str, Any],
+    request_id: str,
+    db: Session,
+    client_id: Optional[uuid.UUID] = None,
 ) -> JSONResponse:
     """Handle message/send according to A2A spec."""
 
@@ -648,15 +680,54 @@ async def handle_message_send(
     logger.info(f"📎 Extracted files: {len(files)}")
 
     # Generate IDs
-    task_id = str(uuid.uuid4())
     context_id = message.get("messageId", str(uuid.uuid4()))
+    scheduler_key = client_id or agent_id
+
+    # A2A spec: blocking defaults to true; non-blocking calls get a working task back
+    blocking = configuration.get("blocking", True) is not False
+
+    if not blocking and execution_scheduler.would_reject(scheduler_key):
+        return server_busy_response(
+            request_id,
+            TooManyRequestsError(
+                "Execution queue is full",
+                retry_after=execution_scheduler.retry_after(),
+            ),
+        )
+
+    # Create current user message object for history
+    current_user_message = {
+        "content": text,
+        "messageId": message.get("messageId"),
+        "timestamp": None,  # Could add current timestamp
+    }
+
+    task = create_task(
+        db,
+        agent_id,
+        context_id,
+        state="working",
+        history=[
+            {
+                "role": "user",
+                "parts": [{"type": "text", "text": text}],
+                "messageId": message.get("messageId"),
+                "contextId": context_id,
+                "kind": "message",
+            }
+        ],
+        push_notification_config=push_notification_config,
+    )
+    task_id = str(task.id)
 
     try:
         # Extract conversation history for context
         logger.info(
             f"🔍 Attempting to extract conversation history for agent {agent_id}, context {context_id}"
         )
-        conversation_history = extract_conversation_history(str(agent_id), context_id)
+        conversation_history = extract_conversation_history(
+            db, str(agent_id), context_id, settings.A2A_HISTORY_CONTEXT_EVENTS
+        )
         logger.info(
             f"📚 Session history extracted: {len(conversation_history)} messages"
         )
@@ -671,6 +742,30 @@ async def handle_message_send(
         combined_history = combine_histories(request_history, conversation_history)
         logger.info(f"📖 Combined history has {len(combined_history)} total messages")
 
+        if not blocking:
+            # Long runs: answer now, clients poll tasks/get or use tasks/resubscribe
+            execution = asyncio.create_task(
+                execute_task(
+                    task_id,
+                    agent_id,
+                    scheduler_key,
+                    context_id,
+                    text,
+                    files,
+                    combined_history,
+                    current_user_message,
+                )
+            )
+            register_running_task(task_id, execution)
+            logger.info(f"⏳ Task {task_id} running in background")
+            return JSONResponse(
+                content={
+                    "jsonrpc": "2.0",
+                    "id": request_id,
+                    "result": task_to_a2a(task),
+                }
+            )
+
         # Log detailed combined history for debugging
         for i, msg in enumerate(combined_history):
             logger.info(f"  History[{i}]: {msg['role']} - {msg['content'][:50]}...")
@@ -683,16 +778,20 @@ async def handle_message_send(
             f"📚 ADK will provide session context automatically ({len(combined_history)} previous messages available)"
         )
 
-        result = await run_agent(
-            agent_id=str(agent_id),
-            external_id=context_id,
-            message=text,  # Send only the original message - ADK handles context
-            session_service=session_service,
-            artifacts_service=artifacts_service,
-            memory_service=memory_service,
-            db=db,
-            files=files if files else None,
-        )
+        # Output of workflows resumed after a long delay is pushed to the client
+        delivery_task_id = task_id if push_notification_config else None
+        async with execution_scheduler.slot(scheduler_key):
+            with deliver_resumed_output_to(delivery_task_id):
+                result = await run_agent(
+                    agent_id=str(agent_id),
+                    external_id=context_id,
+                    message=text,  # Send only the original message - ADK handles context
+                    session_service=session_service,
+                    artifacts_service=artifacts_service,
+                    memory_service=memory_service,
+                    db=db,
+                    files=files if files else None,
+                )
 
         final_response = result.get("final_response", "No response")
         logger.info(f"✅ Agent response: {final_response}")
@@ -702,13 +801,6 @@ async def handle_message_send(
             f"🏗️ Creating task response with {len(combined_history) if combined_history else 0} history messages"
         )
 
-        # Create current user message object for history
-        current_user_message = {
-            "content": text,
-            "messageId": message.get("messageId"),
-            "timestamp": None,  # Could add current timestamp
-        }
-
         # Create A2A compliant response with history
         task_response = create_task_response(
             task_id,
@@ -722,11 +814,21 @@ async def handle_message_send(
             f"📦 Task response created with {len(task_response.get('artifacts', []))} artifacts"
         )
 
-        # Handle push notification if configured
+        update_task_state(
+            db,
+            task_id,
+            "completed",
+            artifacts=task_response["artifacts"],
+            history=task_response.get("history"),
+        )
+
+        # Queue the push notification; delivery happens in the background
         if push_notification_config:
             try:
-                await send_push_notification(task_response, push_notification_config)
-                logger.info(f"🔔 Push notification sent successfully")
+                enqueue_push_notification(
+                    db, task_response, push_notification_config, task_id
+                )
+                logger.info(f"🔔 Push notification queued")
             except Exception as e:
                 logger.error(f"❌ Push notification failed: {e}")
                 # Continue execution - push notification failure shouldn't break the response
@@ -735,8 +837,12 @@ async def handle_message_send(
             content={"jsonrpc": "2.0", "id": request_id, "result": task_response}
         )
 
+    except TooManyRequestsError as e:
+        update_task_state(db, task_id, "rejected", status_message=agent_text(str(e)))
+        return server_busy_response(request_id, e)
     except Exception as e:
         logger.error(f"❌ Agent execution error: {e}")
+        update_task_state(db, task_id, "failed", status_message=agent_text(str(e)))
         return JSONResponse(
             content={
                 "jsonrpc": "2.0",
@@ -750,8 +856,93 @@ async def handle_message_send(
         )
 
 
+def agent_text(text: str) -> Dict[str, Any]:
+    """Build an agent A2A message with a single text part."""
+    return {"role": "agent", "parts": [{"type": "text", "text": text}], "kind": "message"}
+
+
+async def execute_task(
+    task_id: str,
+    agent_id: uuid.UUID,
+    scheduler_key: Any,
+    context_id: str,
+    text: str,
+    files: List[FileData],
+    combined_history: List[Dict[str, Any]],
+    current_user_message: Dict[str, Any],
+):
+    """Run a non-blocking message/send task and record its outcome in the task store."""
+    # The request session is closed once the response is sent
+    db = SessionLocal()
+    # tasks/cancel may reach another worker; it only updates the stored state
+    cancel_watcher = asyncio.create_task(
+        cancel_when_canceled(
+            task_id, asyncio.current_task(), settings.A2A_TASK_POLL_INTERVAL
+        )
+    )
+    try:
+        try:
+            # Clients of background tasks poll or get pushed the resumed output
+            async with execution_scheduler.slot(scheduler_key):
+                with deliver_resumed_output_to(task_id):
+                    result = await run_agent(
+                        agent_id=str(agent_id),
+                        external_id=context_id,
+                        message=text,
+                        session_service=session_service,
+                        artifacts_service=artifacts_service,
+                        memory_service=memory_service,
+                        db=db,
+                        files=files if files else None,
+                    )
+
+            task_response = create_task_response(
+                task_id,
+                context_id,
+                result.get("final_response", "No response"),
+                combined_history if combined_history else None,
+                current_user_message,
+            )
+            task = update_task_state(
+                db,
+                task_id,
+                "completed",
+                artifacts=task_response["artifacts"],
+                history=task_response.get("history"),
+            )
+        except asyncio.CancelledError:
+            logger.info(f"🛑 Task {task_id} cancelled")
+            task = update_task_state(db, task_id, "canceled")
+        except TooManyRequestsError as e:
+            task = update_task_state(
+                db, task_id, "rejected", status_message=agent_text(str(e))
+            )
+        except Exception as e:
+            logger.error(f"❌ Background task {task_id} failed: {e}")
+            task = update_task_state(
+                db, task_id, "failed", status_message=agent_text(str(e))
+            )
+        finally:
+            cancel_watcher.cancel()
+
+        # Push configs may have been set after the task started
+        if task and task.push_notification_config:
+            try:
+                enqueue_push_notification(
+                    db, task_to_a2a(task), task.push_notification_config, task_id
+                )
+            except Exception as e:
+                logger.error(f"❌ Push notification failed: {e}")
+    finally:
+        db.close()
+
+
 async def handle_message_stream(
-    agent_id: uuid.UUID, params: Dict[str, Any], request_id: str, db: Session
+    agent_id: uuid.UUID,
+    params: Dict[str, Any],
+    request_id: str,
+    db: Session,
+    client_id: Optional[uuid.UUID] = None,
 ) -> EventSourceResponse:
     """Handle message/stream according to A2A spec."""
 
@@ -787,8 +978,21 @@ async def handle_message_stream(
     if not text and files:
         text = "Analyze the provided files"
 
+    # Reject up front when saturated; the slot itself is taken by the stream
+    scheduler_key = client_id or agent_id
+    if execution_scheduler.would_reject(scheduler_key):
+        return server_busy_response(
+            request_id,
+            TooManyRequestsError(
+                "Execution queue is full",
+                retry_after=execution_scheduler.retry_after(),
+            ),
+        )
+
     # Extract and combine conversation history
-    conversation_history = extract_conversation_history(str(agent_id), context_id)
+    conversation_history = extract_conversation_history(
+        db, str(agent_id), context_id, settings.A2A_HISTORY_CONTEXT_EVENTS
+    )
     request_history = extract_history_from_params(params)
     combined_history = combine_histories(request_history, conversation_history)
 
@@ -800,39 +1004,40 @@ async def handle_message_stream(
             )
 
             # Stream agent execution - ADK handles session history automatically
-            async for chunk in run_agent_stream(
-                agent_id=str(agent_id),
-                external_id=context_id,
-                message=text,  # Send only the original message - ADK handles context
-                session_service=session_service,
-                artifacts_service=artifacts_service,
-                memory_service=memory_service,
-                db=db,
-                files=files if files else None,
-            ):
-                # Parse chunk and convert to A2A format
-                try:
-                    chunk_data = json.loads(chunk)
-
-                    # Create TaskStatusUpdateEvent
-                    event = {
-                        "jsonrpc": "2.0",
-                        "id": request_id,
-                        "result": {
-                            "id": str(uuid.uuid4()),
-                            "status": {
-                                "state": "working",
-                                "message": chunk_data.get("content", {}),
+            async with execution_scheduler.slot(scheduler_key):
+                async for chunk in run_agent_stream(
+                    agent_id=str(agent_id),
+                    external_id=context_id,
+                    message=text,  # Send only the original message - ADK handles context
+                    session_service=session_service,
+                    artifacts_service=artifacts_service,
+                    memory_service=memory_service,
+                    db=db,
+                    files=files if files else None,
+                ):
+                    # Parse chunk and convert to A2A format
+                    try:
+                        chunk_data = json.loads(chunk)
+
+                        # Create TaskStatusUpdateEvent
+                        event = {
+                            "jsonrpc": "2.0",
+                            "id": request_id,
+                            "result": {
+                                "id": str(uuid.uuid4()),
+                                "status": {
+                                    "state": "working",
+                                    "message": chunk_data.get("content", {}),
+                                },
+                                "final": False,
                             },
-                            "final": False,
-                        },
-                    }
+                        }
 
-                    yield {"data": json.dumps(event)}
+                        yield {"data": json.dumps(event)}
 
-                except Exception as e:
-                    logger.error(f"Error processing chunk: {e}")
-                    continue
+                    except Exception as e:
+                        logger.error(f"Error processing chunk: {e}")
+                        continue
 
             # Send final event
             final_event = {
@@ -846,6 +1051,8 @@ async def handle_message_stream(
             }
             yield {"data": json.dumps(final_event)}
 
+        except TooManyRequestsError as e:
+            yield {"data": json.dumps(server_busy_error(request_id, e))}
         except Exception as e:
             logger.error(f"❌ Streaming error: {e}")
             error_event = {
@@ -865,7 +1072,7 @@ async def handle_message_stream(
 @router.get("/{agent_id}/.well-known/agent.json")
 async def get_agent_card(
     agent_id: uuid.UUID,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """Get agent card according to A2A specification."""
 
@@ -889,7 +1096,7 @@ async def get_agent_card(
         "capabilities": {
             "streaming": True,
             "pushNotifications": True,  # Now supporting push notifications
-            "stateTransitionHistory": False,
+            "stateTransitionHistory": True,
         },
         "securitySchemes": {
             "apiKey": {
@@ -995,17 +1202,18 @@ async def list_agent_sessions(
     agent_id: uuid.UUID,
     external_id: str,
     x_api_key: str = Header(None, alias="x-api-key"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
+    async_db: AsyncSession = Depends(get_async_db),
 ):
     """List sessions for an agent and external_id (A2A extension)."""
 
     logger.info(f"📋 Listing sessions for agent {agent_id}, external_id: {external_id}")
 
     # Verify API key
-    await verify_api_key(db, x_api_key)
+    await verify_api_key(async_db, x_api_key)
 
     # Verify agent exists
-    agent = get_agent(db, agent_id)
+    agent = await get_agent_async(async_db, agent_id)
     if not agent:
         raise HTTPException(status_code=404, detail="Agent not found")
 
@@ -1014,21 +1222,28 @@ async def list_agent_sessions(
         sessions = []
         session_id = f"{external_id}_{agent_id}"
 
-        # Try to get session
-        session = session_service.get_session(
-            app_name=str(agent_id), user_id=external_id, session_id=session_id
+        # Look the session up without loading its events
+        session = (
+            db.query(SessionModel)
+            .filter(
+                SessionModel.app_name == str(agent_id),
+                SessionModel.user_id == external_id,
+                SessionModel.id == session_id,
+            )
+            .first()
         )
 
         if session:
-            # Extract conversation history
-            history = extract_conversation_history(str(agent_id), external_id)
-
             sessions.append(
                 {
                     "sessionId": session_id,
                     "contextId": external_id,
-                    "lastUpdate": getattr(session, "last_update_time", None),
-                    "messageCount": len(history),
+                    "lastUpdate": (
+                        session.update_time.timestamp()
+                        if session.update_time
+                        else None
+                    ),
+                    "messageCount": count_session_events(db, session_id),
                     "status": "active",
                 }
             )
@@ -1045,18 +1260,25 @@ async def get_session_history(
     agent_id: uuid.UUID,
     session_id: str,
     x_api_key: str = Header(None, alias="x-api-key"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
+    async_db: AsyncSession = Depends(get_async_db),
     limit: int = 50,
+    cursor: Optional[str] = None,
+    before_timestamp: Optional[float] = None,
 ):
-    """Get conversation history for a specific session (A2A extension)."""
+    """Get conversation history for a specific session (A2A extension).
+
+    Returns the newest ``limit`` events; pass ``nextCursor`` back as ``cursor``
+    to page towards older messages.
+    """
 
     logger.info(f"📚 Getting history for session {session_id}")
 
     # Verify API key
-    await verify_api_key(db, x_api_key)
+    await verify_api_key(async_db, x_api_key)
 
     # Verify agent exists
-    agent = get_agent(db, agent_id)
+    agent = await get_agent_async(async_db, agent_id)
     if not agent:
         raise HTTPException(status_code=404, detail="Agent not found")
 
@@ -1067,17 +1289,30 @@ async def get_session_history(
         else:
             external_id = session_id
 
-        # Extract conversation history
-        history = extract_conversation_history(str(agent_id), external_id)
-
-        # Limit results
-        if limit > 0:
-            history = history[-limit:]
+        # Extract only the requested page of conversation history
+        page = extract_conversation_history_page(
+            db,
+            str(agent_id),
+            external_id,
+            limit=limit,
+            cursor=cursor,
+            before_timestamp=before_timestamp,
+        )
+        history = page["history"]
 
         return JSONResponse(
-            {"sessionId": session_id, "history": history, "total": len(history)}
+            {
+                "sessionId": session_id,
+                "history": history,
+                "total": len(history),
+                "nextCursor": page["next_cursor"],
+                "hasMore": page["has_more"],
+            }
         )
 
+    except HTTPException:
+        raise
+
     except Exception as e:
         logger.error(f"❌ Error getting session history: {e}")
         raise HTTPException(
@@ -1090,7 +1325,8 @@ async def get_conversation_history(
     agent_id: uuid.UUID,
     request: Request,
     x_api_key: str = Header(None, alias="x-api-key"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
+    async_db: AsyncSession = Depends(get_async_db),
 ):
     """
     Get conversation history according to A2A specification.
@@ -1101,10 +1337,10 @@ async def get_conversation_history(
     logger.info(f"📚 A2A Conversation History requested for agent {agent_id}")
 
     # Verify API key
-    await verify_api_key(db, x_api_key)
+    await verify_api_key(async_db, x_api_key)
 
     # Verify agent exists
-    agent = get_agent(db, agent_id)
+    agent = await get_agent_async(async_db, agent_id)
     if not agent:
         raise HTTPException(status_code=404, detail="Agent not found")
 
@@ -1134,13 +1370,9 @@ async def get_conversation_history(
                 }
             )
 
-        # Extract conversation history using session_service
-        history = extract_conversation_history(str(agent_id), context_id)
-
-        # Limit history if requested
+        # Extract only the requested number of newest events
         limit = params.get("limit", 50)
-        if limit > 0:
-            history = history[-limit:]
+        history = extract_conversation_history(db, str(agent_id), context_id, limit)
 
         # Format as A2A Task response with history artifacts
         task_id = str(uuid.uuid4())
@@ -1231,181 +1463,22 @@ async def get_conversation_history(
         )
 
 
-async def send_push_notification(
-    task_response: Dict[str, Any], push_notification_config: Dict[str, Any]
-):
-    """Send push notification according to A2A specification section 9.5.
-
-    A2A spec PushNotificationConfig object:
-    - url: The absolute HTTPS webhook URL where the A2A Server should POST task updates
-    - token (optional): Client-generated opaque token for validation
-    - authentication (optional): PushNotificationAuthenticationInfo for authenticating to client's webhook
-
-    Alternative formats supported for compatibility:
-    - webhookUrl instead of url
-    - webhookAuthenticationInfo instead of authentication
-    """
-    # Support both official spec format and common variations
-    webhook_url = push_notification_config.get("url") or push_notification_config.get(
-        "webhookUrl"
+# Task management functions (A2A spec section 7.3-7.7)
+def task_not_found_response(request_id: str, task_id: str) -> JSONResponse:
+    """JSON-RPC TaskNotFoundError response."""
+    return JSONResponse(
+        content={
+            "jsonrpc": "2.0",
+            "id": request_id,
+            "error": {
+                "code": -32001,
+                "message": "Task not found",
+                "data": {"taskId": task_id},
+            },
+        }
     )
-    webhook_token = push_notification_config.get("token")
-
-    # Support both official and alternative authentication field names
-    authentication = push_notification_config.get(
-        "authentication"
-    ) or push_notification_config.get("webhookAuthenticationInfo")
-
-    if not webhook_url:
-        raise ValueError("pushNotificationConfig.url (or webhookUrl) is required")
-
-    # Validate HTTPS requirement (A2A spec: url MUST be HTTPS for security to prevent SSRF)
-    if not webhook_url.startswith("https://"):
-        raise ValueError(
-            "pushNotificationConfig.url MUST use HTTPS to prevent SSRF attacks"
-        )
-
-    logger.info(f"🔔 Sending push notification to: {webhook_url}")
-
-    # Prepare headers according to A2A spec section 9.5
-    headers = {
-        "Content-Type": "application/json",
-        "User-Agent": f"A2A-Server/{getattr(settings, 'API_VERSION', '1.0.0')}",
-    }
-
-    # Add client token if provided (A2A spec: server SHOULD include in X-A2A-Notification-Token header)
-    if webhook_token:
-        headers["X-A2A-Notification-Token"] = webhook_token
-        logger.info(f"🔑 Added client token to notification headers")
-
-    # Handle authentication according to A2A spec PushNotificationAuthenticationInfo
-    if authentication:
-        auth_type = authentication.get("type")
-
-        # Handle "none" type (no authentication)
-        if auth_type == "none":
-            logger.info(f"🔓 No authentication required for webhook")
-
-        # Handle schemes-based authentication (official A2A spec format)
-        elif "schemes" in authentication:
-            auth_schemes = authentication.get("schemes", [])
-            auth_credentials = authentication.get("credentials")
-
-            for scheme in auth_schemes:
-                if scheme.lower() == "bearer":
-                    # Bearer token authentication
-                    if auth_credentials:
-                        headers["Authorization"] = f"Bearer {auth_credentials}"
-                        logger.info(f"🔐 Added Bearer authentication")
-                    else:
-                        logger.warning(
-                            "⚠️ Bearer scheme specified but no credentials provided"
-                        )
-
-                elif scheme.lower() == "apikey":
-                    # API Key authentication
-                    if auth_credentials:
-                        try:
-                            # A2A spec example: JSON like {"in": "header", "name": "X-Client-Webhook-Key", "value": "actual_key"}
-                            if isinstance(auth_credentials, str):
-                                cred_data = json.loads(auth_credentials)
-                            else:
-                                cred_data = auth_credentials
-
-                            if cred_data.get("in") == "header":
-                                header_name = cred_data.get("name", "X-API-Key")
-                                header_value = cred_data.get("value")
-                                if header_value:
-                                    headers[header_name] = header_value
-                                    logger.info(
-                                        f"🔐 Added API Key authentication to header: {header_name}"
-                                    )
-                        except (json.JSONDecodeError, TypeError):
-                            # Fallback: treat credentials as direct API key value
-                            headers["X-API-Key"] = str(auth_credentials)
-                            logger.info(f"🔐 Added API Key authentication (fallback)")
-                    else:
-                        logger.warning(
-                            "⚠️ ApiKey scheme specified but no credentials provided"
-                        )
-
-                else:
-                    logger.warning(f"⚠️ Unsupported authentication scheme: {scheme}")
-
-        # Handle basic authentication types
-        elif auth_type == "bearer":
-            token = authentication.get("token") or authentication.get("credentials")
-            if token:
-                headers["Authorization"] = f"Bearer {token}"
-                logger.info(f"🔐 Added Bearer authentication (alternative format)")
-
-        elif auth_type == "apikey":
-            api_key = (
-                authentication.get("apiKey")
-                or authentication.get("key")
-                or authentication.get("credentials")
-            )
-            header_name = authentication.get("headerName", "X-API-Key")
-            if api_key:
-                headers[header_name] = api_key
-                logger.info(f"🔐 Added API Key authentication to header: {header_name}")
-
-        else:
-            logger.warning(f"⚠️ Unsupported authentication type: {auth_type}")
-
-    # According to A2A spec section 9.5, the notification payload should contain
-    # sufficient information for client to identify Task ID and new state
-    # The spec suggests sending the full Task object as JSON payload
-    notification_payload = task_response
-
-    try:
-        # Use 30 second timeout as recommended for webhook calls
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            logger.info(
-                f"📤 Sending POST request to webhook with {len(headers)} headers"
-            )
-
-            response = await client.post(
-                webhook_url, headers=headers, json=notification_payload
-            )
-
-            # Log the response according to A2A spec recommendations
-            if response.status_code == 200:
-                logger.info(f"✅ Push notification sent successfully to {webhook_url}")
-            elif 200 <= response.status_code < 300:
-                logger.info(
-                    f"✅ Push notification accepted with status {response.status_code} from {webhook_url}"
-                )
-            else:
-                logger.warning(
-                    f"⚠️ Push notification received non-success response: {response.status_code} from {webhook_url}"
-                )
-                try:
-                    response_text = response.text[
-                        :200
-                    ]  # Log first 200 chars of response
-                    logger.warning(f"Response body: {response_text}")
-                except:
-                    pass
-
-            # Don't raise exception for non-200 status codes per A2A spec
-            # The webhook might have its own status handling, and notification
-            # delivery is best-effort
 
-    except httpx.TimeoutException:
-        logger.error(f"❌ Push notification timeout (30s) to {webhook_url}")
-        raise Exception(f"Push notification timeout to {webhook_url}")
 
-    except httpx.RequestError as e:
-        logger.error(f"❌ Push notification request error to {webhook_url}: {e}")
-        raise Exception(f"Push notification request error: {e}")
-
-    except Exception as e:
-        logger.error(f"❌ Push notification unexpected error to {webhook_url}: {e}")
-        raise Exception(f"Push notification error: {e}")
-
-
-# Task management functions (A2A spec section 7.3-7.7)
 async def handle_tasks_get(
     agent_id: uuid.UUID, params: Dict[str, Any], request_id: str, db: Session
 ) -> JSONResponse:
@@ -1413,7 +1486,7 @@ async def handle_tasks_get(
     logger.info(f"🔍 Processing tasks/get for agent {agent_id}")
 
     try:
-        task_id = params.get("taskId")
+        task_id = params.get("id") or params.get("taskId")
         if not task_id:
             return JSONResponse(
                 content={
@@ -1427,16 +1500,11 @@ async def handle_tasks_get(
                 }
             )
 
-        # In our implementation, tasks are ephemeral and complete immediately
-        # For A2A compliance, we return a completed task with minimal info
-        task_response = {
-            "id": task_id,
-            "status": {
-                "state": "completed",
-                "timestamp": datetime.now().isoformat() + "Z",
-            },
-            "kind": "task",
-        }
+        task = get_task(db, task_id, agent_id)
+        if not task:
+            return task_not_found_response(request_id, task_id)
+
+        task_response = task_to_a2a(task, history_length=params.get("historyLength"))
 
         return JSONResponse(
             content={"jsonrpc": "2.0", "id": request_id, "result": task_response}
@@ -1464,7 +1532,7 @@ async def handle_tasks_cancel(
     logger.info(f"🛑 Processing tasks/cancel for agent {agent_id}")
 
     try:
-        task_id = params.get("taskId")
+        task_id = params.get("id") or params.get("taskId")
         if not task_id:
             return JSONResponse(
                 content={
@@ -1478,17 +1546,30 @@ async def handle_tasks_cancel(
                 }
             )
 
-        # In our implementation, tasks complete immediately, so cancellation is not needed
-        # Return success for A2A compliance
+        task = get_task(db, task_id, agent_id)
+        if not task:
+            return task_not_found_response(request_id, task_id)
+
+        if task.state in TERMINAL_STATES:
+            return JSONResponse(
+                content={
+                    "jsonrpc": "2.0",
+                    "id": request_id,
+                    "error": {
+                        "code": -32002,
+                        "message": "Task cannot be canceled",
+                        "data": {"taskId": task_id, "state": task.state},
+                    },
+                }
+            )
+
+        # Stop the execution if it runs here; executions on other workers
+        # watch the stored state and stop themselves
+        cancel_running_task(task_id)
+        task = update_task_state(db, task_id, "canceled")
+
         return JSONResponse(
-            content={
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "result": {
-                    "success": True,
-                    "message": f"Task {task_id} cancellation requested",
-                },
-            }
+            content={"jsonrpc": "2.0", "id": request_id, "result": task_to_a2a(task)}
         )
 
     except Exception as e:
@@ -1507,8 +1588,6 @@ async def handle_tasks_cancel(
 
 
 # Task push notification config management (A2A spec section 7.5-7.6)
-task_push_configs = {}  # In-memory storage for demo - use database in production
-
 
 async def handle_tasks_push_notification_config_set(
     agent_id: uuid.UUID, params: Dict[str, Any], request_id: str, db: Session
@@ -1517,7 +1596,7 @@ async def handle_tasks_push_notification_config_set(
     logger.info(f"🔔 Processing tasks/pushNotificationConfig/set for agent {agent_id}")
 
     try:
-        task_id = params.get("taskId")
+        task_id = params.get("id") or params.get("taskId")
         push_config = params.get("pushNotificationConfig")
 
         if not task_id:
@@ -1561,8 +1640,11 @@ async def handle_tasks_push_notification_config_set(
                 }
             )
 
-        # Store the config (in production, save to database)
-        task_push_configs[task_id] = push_config
+        task = get_task(db, task_id, agent_id)
+        if not task:
+            return task_not_found_response(request_id, task_id)
+
+        set_push_notification_config(db, task, push_config)
         logger.info(f"✅ Push notification config stored for task {task_id}")
 
         return JSONResponse(
@@ -1595,7 +1677,7 @@ async def handle_tasks_push_notification_config_get(
     logger.info(f"🔍 Processing tasks/pushNotificationConfig/get for agent {agent_id}")
 
     try:
-        task_id = params.get("taskId")
+        task_id = params.get("id") or params.get("taskId")
         if not task_id:
             return JSONResponse(
                 content={
@@ -1609,8 +1691,8 @@ async def handle_tasks_push_notification_config_get(
                 }
             )
 
-        # Retrieve the config (in production, get from database)
-        push_config = task_push_configs.get(task_id)
+        task = get_task(db, task_id, agent_id)
+        push_config = task.push_notification_config if task else None
 
         if push_config:
             return JSONResponse(
@@ -1651,14 +1733,60 @@ async def handle_tasks_push_notification_config_get(
         )
 
 
+def load_task_data(task_id: str) -> Optional[Dict[str, Any]]:
+    """Serialize a stored task; a fresh session sees updates from other workers"""
+    db = SessionLocal()
+    try:
+        task = get_task(db, task_id)
+        return task_to_a2a(task) if task else None
+    finally:
+        db.close()
+
+
+async def task_update_generator(task_id: str, request_id: str):
+    """Stream status updates of a stored task until it reaches a terminal state."""
+    last_state = None
+    deadline = asyncio.get_running_loop().time() + settings.A2A_TASK_RESUBSCRIBE_TIMEOUT
+
+    while True:
+        task_data = await asyncio.to_thread(load_task_data, task_id)
+
+        if task_data is None:
+            return
+
+        state = task_data["status"]["state"]
+        final = state in TERMINAL_STATES
+        if state != last_state or final:
+            last_state = state
+            result = {
+                "taskId": task_data["id"],
+                "contextId": task_data["contextId"],
+                "status": task_data["status"],
+                "final": final,
+                "kind": "status-update",
+            }
+            if final:
+                result["artifacts"] = task_data["artifacts"]
+            yield {
+                "data": json.dumps(
+                    {"jsonrpc": "2.0", "id": request_id, "result": result}
+                )
+            }
+
+        if final or asyncio.get_running_loop().time() >= deadline:
+            return
+
+        await asyncio.sleep(settings.A2A_TASK_POLL_INTERVAL)
+
+
 async def handle_tasks_resubscribe(
     agent_id: uuid.UUID, params: Dict[str, Any], request_id: str, db: Session
-) -> JSONResponse:
+):
     """Handle tasks/resubscribe according to A2A spec section 7.7."""
     logger.info(f"🔄 Processing tasks/resubscribe for agent {agent_id}")
 
     try:
-        task_id = params.get("taskId")
+        task_id = params.get("id") or params.get("taskId")
         push_config = params.get("pushNotificationConfig")
 
         if not task_id:
@@ -1674,24 +1802,16 @@ async def handle_tasks_resubscribe(
                 }
             )
 
+        task = get_task(db, task_id, agent_id)
+        if not task:
+            return task_not_found_response(request_id, task_id)
+
         # Update push notification config if provided
         if push_config:
-            task_push_configs[task_id] = push_config
+            set_push_notification_config(db, task, push_config)
             logger.info(f"✅ Push notification config updated for task {task_id}")
 
-        # In our implementation, tasks complete immediately
-        # Return success for A2A compliance
-        return JSONResponse(
-            content={
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "result": {
-                    "success": True,
-                    "taskId": task_id,
-                    "message": "Resubscription successful",
-                },
-            }
-        )
+        return EventSourceResponse(task_update_generator(task_id, request_id))
 
     except Exception as e:
         logger.error(f"❌ tasks/resubscribe error: {e}")
@@ -1743,7 +1863,7 @@ async def handle_agent_authenticated_extended_card(
             "capabilities": {
                 "streaming": True,
                 "pushNotifications": True,
-                "stateTransitionHistory": False,
+                "stateTransitionHistory": True,
                 "multiTurnConversations": True,
                 "fileProcessing": True,
             },
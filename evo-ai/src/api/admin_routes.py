@@ -28,20 +28,42 @@
 """
 
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from sqlalchemy.orm import Session
 import uuid
 
-from src.config.database import get_db
+from src.config.database import get_db, get_pool_stats
 from src.core.jwt_middleware import get_jwt_token, verify_admin
 from src.schemas.audit import AuditLogResponse, AuditLogFilter
-from src.services.audit_service import get_audit_logs, create_audit_log
+from src.services.audit_service import (
+    audit_writer,
+    get_audit_logs_page,
+    create_audit_log,
+)
+from src.services.audit_partition_service import audit_partition_manager
+from src.services.dashboard_service import dashboard_aggregator, dashboard_cache
 from src.services.user_service import (
     get_admin_users,
     create_admin_user,
     deactivate_user,
 )
 from src.schemas.user import UserResponse, AdminUserCreate
+from src.services.adk.agent_cache import agent_cache
+from src.services.apikey_cache import api_key_cache
+from src.services.adk.mcp_pool import mcp_pool
+from src.services.adk.tool_cache import get_tool_cache_stats
+from src.utils.a2a_enhanced_client import a2a_client_registry
+from src.services.execution_scheduler import execution_scheduler
+from src.services.push_notification_service import push_dispatcher, get_outbox_stats
+from src.services.session_compaction_service import session_compactor
+from src.services.workflow_timer_service import (
+    workflow_timer_scheduler,
+    get_timer_stats,
+)
+from src.services.service_providers import artifacts_service, memory_service
+from src.services.adk.custom_agents.workflow_agent import (
+    get_workflow_graph_cache_stats,
+)
 
 router = APIRouter(
     prefix="/admin",
@@ -51,9 +73,63 @@ router = APIRouter(
 )
 
 
+# Runtime metrics
+@router.get("/metrics")
+async def read_runtime_metrics(
+    db: Session = Depends(get_db),
+    payload: dict = Depends(get_jwt_token),
+):
+    """
+    Get in-process runtime metrics (caches, pools) for this worker
+
+    Args:
+        db: Database session
+        payload: JWT token payload
+
+    Returns:
+        dict: Metrics grouped by component
+    """
+    return {
+        "db_pool": get_pool_stats(),
+        "agent_cache": agent_cache.stats(),
+        "api_key_cache": api_key_cache.stats(),
+        "mcp_pool": mcp_pool.stats(),
+        "http_tool_cache": get_tool_cache_stats(),
+        "workflow_graph_cache": get_workflow_graph_cache_stats(),
+        "a2a_clients": a2a_client_registry.stats(),
+        "execution_scheduler": execution_scheduler.stats(),
+        "push_notifications": {
+            **push_dispatcher.stats(),
+            "outbox": get_outbox_stats(db),
+        },
+        "session_compaction": session_compactor.stats(),
+        "audit_writer": audit_writer.stats(),
+        "audit_partitions": audit_partition_manager.stats(),
+        "dashboard": {
+            **dashboard_aggregator.stats(),
+            "cache": dashboard_cache.stats(),
+        },
+        "workflow_timers": {
+            **workflow_timer_scheduler.stats(),
+            "timers": get_timer_stats(db),
+        },
+        "artifacts": (
+            artifacts_service.stats()
+            if hasattr(artifacts_service, "stats")
+            else {"backend": "memory"}
+        ),
+        "memory": (
+            memory_service.stats()
+            if hasattr(memory_service, "stats")
+            else {"backend": "memory"}
+        ),
+    }
+
+
 # Audit routes
 @router.get("/audit-logs", response_model=List[AuditLogResponse])
 async def read_audit_logs(
+    response: Response,
     filters: AuditLogFilter = Depends(),
     db: Session = Depends(get_db),
     payload: dict = Depends(get_jwt_token),
@@ -61,7 +137,11 @@ async def read_audit_logs(
     """
     Get audit logs with optional filters
 
+    Logs are returned newest first. When older logs exist, the X-Next-Cursor
+    response header holds the cursor for the next page.
+
     Args:
+        response: Response whose pagination headers are set
         filters: Filters for log search
         db: Database session
         payload: JWT token payload
@@ -69,10 +149,11 @@ async def read_audit_logs(
     Returns:
         List[AuditLogResponse]: List of audit logs
     """
-    return get_audit_logs(
+    page = get_audit_logs_page(
         db,
         skip=filters.skip,
         limit=filters.limit,
+        cursor=filters.cursor,
         user_id=filters.user_id,
         action=filters.action,
         resource_type=filters.resource_type,
@@ -80,6 +161,10 @@ async def read_audit_logs(
         start_date=filters.start_date,
         end_date=filters.end_date,
     )
+    response.headers["X-Has-More"] = "true" if page["has_more"] else "false"
+    if page["next_cursor"]:
+        response.headers["X-Next-Cursor"] = page["next_cursor"]
+    return page["logs"]
 
 
 # Admin routes
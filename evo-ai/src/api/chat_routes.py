@@ -52,7 +52,12 @@ from src.services import (
 from src.schemas.chat import ChatRequest, ChatResponse, ErrorResponse, FileData
 from src.services.adk.agent_runner import run_agent as run_agent_adk, run_agent_stream
 from src.services.crewai.agent_runner import run_agent as run_agent_crewai
-from src.core.exceptions import AgentNotFoundError
+from src.core.exceptions import (
+    AgentNotFoundError,
+    ArtifactQuotaExceededError,
+    TooManyRequestsError,
+)
+from src.services.execution_scheduler import execution_scheduler
 from src.services.service_providers import (
     session_service,
     artifacts_service,
@@ -221,19 +226,40 @@ async def websocket_chat(
                             logger.error(f"Error processing files: {str(e)}")
                             files = None
 
-                    async for chunk in run_agent_stream(
-                        agent_id=agent_id,
-                        external_id=external_id,
-                        message=message,
-                        session_service=session_service,
-                        artifacts_service=artifacts_service,
-                        memory_service=memory_service,
-                        db=db,
-                        files=files,
-                    ):
+                    try:
+                        async with execution_scheduler.slot(agent.client_id):
+                            async for chunk in run_agent_stream(
+                                agent_id=agent_id,
+                                external_id=external_id,
+                                message=message,
+                                session_service=session_service,
+                                artifacts_service=artifacts_service,
+                                memory_service=memory_service,
+                                db=db,
+                                files=files,
+                            ):
+                                await websocket.send_json(
+                                    {
+                                        "message": json.loads(chunk),
+                                        "turn_complete": False,
+                                    }
+                                )
+                    except TooManyRequestsError as e:
+                        # Keep the connection open; the client may retry the turn
                         await websocket.send_json(
-                            {"message": json.loads(chunk), "turn_complete": False}
+                            {
+                                "error": e.detail,
+                                "retry_after": e.retry_after,
+                                "turn_complete": True,
+                            }
                         )
+                        continue
+                    except ArtifactQuotaExceededError as e:
+                        # The upload was rejected; the client may send a smaller one
+                        await websocket.send_json(
+                            {"error": e.detail, "turn_complete": True}
+                        )
+                        continue
 
                     # Send signal of complete turn
                     await websocket.send_json({"message": "", "turn_complete": True})
@@ -269,6 +295,8 @@ async def websocket_chat(
     responses={
         400: {"model": ErrorResponse},
         404: {"model": ErrorResponse},
+        413: {"model": ErrorResponse},
+        429: {"model": ErrorResponse},
         500: {"model": ErrorResponse},
     },
 )
@@ -276,30 +304,31 @@ async def chat(
     request: ChatRequest,
     agent_id: str,
     external_id: str,
-    _=Depends(get_agent_by_api_key),
+    agent=Depends(get_agent_by_api_key),
     db: Session = Depends(get_db),
 ):
     try:
-        if settings.AI_ENGINE == "adk":
-            final_response = await run_agent_adk(
-                agent_id,
-                external_id,
-                request.message,
-                session_service,
-                artifacts_service,
-                memory_service,
-                db,
-                files=request.files,
-            )
-        elif settings.AI_ENGINE == "crewai":
-            final_response = await run_agent_crewai(
-                agent_id,
-                external_id,
-                request.message,
-                session_service,
-                db,
-                files=request.files,
-            )
+        async with execution_scheduler.slot(agent.client_id):
+            if settings.AI_ENGINE == "adk":
+                final_response = await run_agent_adk(
+                    agent_id,
+                    external_id,
+                    request.message,
+                    session_service,
+                    artifacts_service,
+                    memory_service,
+                    db,
+                    files=request.files,
+                )
+            elif settings.AI_ENGINE == "crewai":
+                final_response = await run_agent_crewai(
+                    agent_id,
+                    external_id,
+                    request.message,
+                    session_service,
+                    db,
+                    files=request.files,
+                )
 
         return {
             "response": final_response["final_response"],
@@ -310,6 +339,8 @@ async def chat(
 
     except AgentNotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e)) from e
+    except (TooManyRequestsError, ArtifactQuotaExceededError):
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
@@ -15,12 +15,14 @@
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from uuid import UUID
+import asyncio
 import logging
 
-from src.config.database import get_db
+from src.config.database import SessionLocal, get_async_read_db, get_db
 from src.core.jwt_middleware import get_jwt_token
 from src.services.audit_service import create_audit_log
 from src.services.crm_service import CRMService
@@ -57,13 +59,22 @@ router = APIRouter(
 # ═══════════════════════════════════════════════════════════════════════════
 
 
+def _create_audit_log_in_thread(*args, **kwargs):
+    """Grava o audit log numa sessão síncrona própria (rotas com sessão assíncrona)"""
+    db = SessionLocal()
+    try:
+        return create_audit_log(db, *args, **kwargs)
+    finally:
+        db.close()
+
+
 @router.get("/leads", status_code=status.HTTP_200_OK)
 async def list_leads(
     page: int = Query(1, ge=1, description="Página (começa em 1)"),
     limit: int = Query(20, ge=1, le=100, description="Itens por página"),
     status: Optional[str] = Query(None, description="Filtrar por status"),
     search: Optional[str] = Query(None, description="Buscar por nome, email, etc"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     payload: dict = Depends(get_jwt_token),
 ):
     """Listar todos os leads com filtros e paginação"""
@@ -75,7 +86,7 @@ async def list_leads(
                 detail="client_id não encontrado no token",
             )
 
-        leads, total = CRMService.list_leads(
+        leads, total = await CRMService.list_leads_async(
             db,
             client_id=UUID(client_id),
             page=page,
@@ -85,8 +96,8 @@ async def list_leads(
         )
 
         try:
-            create_audit_log(
-                db,
+            await asyncio.to_thread(
+                _create_audit_log_in_thread,
                 payload.get("user_id") or payload.get("sub"),
                 "list",
                 "crm_lead",
@@ -288,7 +299,7 @@ async def list_contacts(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
     search: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     payload: dict = Depends(get_jwt_token),
 ):
     """Listar todos os contatos"""
@@ -300,7 +311,7 @@ async def list_contacts(
                 detail="client_id não encontrado",
             )
 
-        contacts, total = CRMService.list_contacts(
+        contacts, total = await CRMService.list_contacts_async(
             db,
             client_id=UUID(client_id),
             page=page,
@@ -465,7 +476,7 @@ async def delete_contact(
 async def list_pipelines(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     payload: dict = Depends(get_jwt_token),
 ):
     """Listar todos os pipelines"""
@@ -477,7 +488,7 @@ async def list_pipelines(
                 detail="client_id não encontrado",
             )
 
-        pipelines, total = CRMService.list_pipelines(
+        pipelines, total = await CRMService.list_pipelines_async(
             db,
             client_id=UUID(client_id),
             page=page,
@@ -613,7 +624,7 @@ async def list_deals(
     pipeline_id: Optional[str] = Query(None),
     stage: Optional[str] = Query(None),
     search: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     payload: dict = Depends(get_jwt_token),
 ):
     """Listar todos os deals"""
@@ -625,7 +636,7 @@ async def list_deals(
                 detail="client_id não encontrado",
             )
 
-        deals, total = CRMService.list_deals(
+        deals, total = await CRMService.list_deals_async(
             db,
             client_id=UUID(client_id),
             page=page,
@@ -791,7 +802,7 @@ async def delete_deal(
 @router.get("/kanban", status_code=status.HTTP_200_OK)
 async def list_kanban_cards(
     pipeline_id: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     payload: dict = Depends(get_jwt_token),
 ):
     """Listar cards do kanban"""
@@ -803,7 +814,7 @@ async def list_kanban_cards(
                 detail="client_id não encontrado",
             )
 
-        cards = CRMService.list_kanban_cards(
+        cards = await CRMService.list_kanban_cards_async(
             db,
             client_id=UUID(client_id),
             pipeline_id=UUID(pipeline_id) if pipeline_id else None,
@@ -5,13 +5,20 @@
 └──────────────────────────────────────────────────────────────────────────────┘
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from typing import Dict, Any
+from uuid import UUID
 import logging
 
-from src.config.database import get_db
+from src.config.database import get_read_db
 from src.core.jwt_middleware import get_jwt_token
+from src.services.dashboard_service import (
+    dashboard_cache,
+    get_chat_chart,
+    get_contacts_chart,
+    get_dashboard_stats as load_dashboard_stats,
+    get_recent_activity,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -22,21 +29,29 @@ router = APIRouter(
 )
 
 
+def _client_id(payload: dict) -> UUID:
+    client_id = payload.get("client_id")
+    if not client_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="client_id não encontrado no token",
+        )
+    return UUID(client_id)
+
+
 @router.get("/stats", status_code=status.HTTP_200_OK)
-async def get_dashboard_stats(db: Session = Depends(get_db), payload: dict = Depends(get_jwt_token)):
+async def get_dashboard_stats(
+    db: Session = Depends(get_read_db),
+    payload: dict = Depends(get_jwt_token),
+):
     """Get dashboard statistics"""
     try:
-        stats = {
-            "totalAgents": 24,
-            "chatSessions": 1234,
-            "activeContacts": 5678,
-            "activePipelines": 12,
-            "agentGrowth": 2,
-            "chatGrowth": 18,
-            "contactGrowth": 201,
-            "pipelineGrowth": 3,
-        }
-        return stats
+        client_id = _client_id(payload)
+        return dashboard_cache.get_or_load(
+            client_id, "stats", lambda: load_dashboard_stats(db, client_id)
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting dashboard stats: {str(e)}")
         raise HTTPException(
@@ -46,16 +61,21 @@ async def get_dashboard_stats(db: Session = Depends(get_db), payload: dict = Dep
 
 
 @router.get("/activity", status_code=status.HTTP_200_OK)
-async def get_dashboard_activity(db: Session = Depends(get_db), payload: dict = Depends(get_jwt_token)):
+async def get_dashboard_activity(
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_read_db),
+    payload: dict = Depends(get_jwt_token),
+):
     """Get dashboard recent activity"""
     try:
-        activity = [
-            {"action": "Novo agente criado", "time": "Há 2 horas", "user": "João Silva"},
-            {"action": "Pipeline 'Vendas' atualizado", "time": "Há 4 horas", "user": "Maria Santos"},
-            {"action": "Canal WhatsApp conectado", "time": "Há 6 horas", "user": "Pedro Costa"},
-            {"action": "Campanha 'Promoção' iniciada", "time": "Há 1 dia", "user": "Ana Rodrigues"},
-        ]
-        return activity
+        client_id = _client_id(payload)
+        return dashboard_cache.get_or_load(
+            client_id,
+            f"activity:{limit}",
+            lambda: get_recent_activity(db, client_id, limit),
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting dashboard activity: {str(e)}")
         raise HTTPException(
@@ -65,19 +85,19 @@ async def get_dashboard_activity(db: Session = Depends(get_db), payload: dict =
 
 
 @router.get("/charts/chat", status_code=status.HTTP_200_OK)
-async def get_chat_chart_data(db: Session = Depends(get_db), payload: dict = Depends(get_jwt_token)):
+async def get_chat_chart_data(
+    days: int = Query(7, ge=1, le=366),
+    db: Session = Depends(get_read_db),
+    payload: dict = Depends(get_jwt_token),
+):
     """Get chat activity chart data"""
     try:
-        data = [
-            {"date": "2025-01-09", "sessions": 145},
-            {"date": "2025-01-10", "sessions": 189},
-            {"date": "2025-01-11", "sessions": 167},
-            {"date": "2025-01-12", "sessions": 234},
-            {"date": "2025-01-13", "sessions": 198},
-            {"date": "2025-01-14", "sessions": 201},
-            {"date": "2025-01-15", "sessions": 178},
-        ]
-        return data
+        client_id = _client_id(payload)
+        return dashboard_cache.get_or_load(
+            client_id, f"chat:{days}", lambda: get_chat_chart(db, client_id, days)
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting chat chart data: {str(e)}")
         raise HTTPException(
@@ -87,18 +107,21 @@ async def get_chat_chart_data(db: Session = Depends(get_db), payload: dict = Dep
 
 
 @router.get("/charts/contacts", status_code=status.HTTP_200_OK)
-async def get_contacts_chart_data(db: Session = Depends(get_db), payload: dict = Depends(get_jwt_token)):
+async def get_contacts_chart_data(
+    months: int = Query(6, ge=1, le=36),
+    db: Session = Depends(get_read_db),
+    payload: dict = Depends(get_jwt_token),
+):
     """Get contacts growth chart data"""
     try:
-        data = [
-            {"month": "2024-08", "contacts": 4100},
-            {"month": "2024-09", "contacts": 4350},
-            {"month": "2024-10", "contacts": 4620},
-            {"month": "2024-11", "contacts": 4980},
-            {"month": "2024-12", "contacts": 5400},
-            {"month": "2025-01", "contacts": 5678},
-        ]
-        return data
+        client_id = _client_id(payload)
+        return dashboard_cache.get_or_load(
+            client_id,
+            f"contacts:{months}",
+            lambda: get_contacts_chart(db, client_id, months),
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting contacts chart data: {str(e)}")
         raise HTTPException(
@@ -27,9 +27,11 @@
 └──────────────────────────────────────────────────────────────────────────────┘
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from src.config.database import get_db
+from src.config.database import get_async_read_db, get_db, get_read_db
 from typing import List, Optional, Dict, Any
 import uuid
 import base64
@@ -43,8 +45,10 @@ from src.services import (
 from google.adk.events import Event
 from google.adk.sessions import Session as Adk_Session
 from src.services.session_service import (
-    get_session_events,
+    get_session_events_page,
     get_session_by_id,
+    get_session_record,
+    get_session_record_async,
     delete_session,
     get_sessions_by_agent,
     get_sessions_by_client,
@@ -122,26 +126,34 @@ async def get_session(
 )
 async def get_agent_messages(
     session_id: str,
-    db: Session = Depends(get_db),
+    response: Response,
+    db: Session = Depends(get_read_db),
+    async_db: AsyncSession = Depends(get_async_read_db),
     payload: dict = Depends(get_jwt_token),
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    before_timestamp: Optional[float] = None,
 ):
     """
     Gets messages from a session with embedded artifacts.
 
-    This function loads all messages from a session and processes any references
-    to artifacts, loading them and converting them to base64 for direct use in the frontend.
+    This function loads the messages of a session and processes any references to
+    artifacts, loading them and converting them to base64 for direct use in the
+    frontend. Without limit, cursor or before_timestamp the whole history is returned;
+    with any of them only a page of the newest messages is, and when older messages
+    exist the X-Next-Cursor response header holds the cursor for the previous page.
     """
-    # Get the session
-    session = get_session_by_id(session_service, session_id)
+    # Get the session without loading its events
+    session = await get_session_record_async(async_db, session_id)
     if not session:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Session not found"
         )
 
     # Verify if the session's agent belongs to the user's client
-    agent_id = uuid.UUID(session.app_name) if session.app_name else None
+    agent_id = uuid.UUID(session["app_name"]) if session["app_name"] else None
     if agent_id:
-        agent = agent_service.get_agent(db, agent_id)
+        agent = await agent_service.get_agent_async(async_db, agent_id)
         if agent:
             await verify_user_client(payload, db, agent.client_id)
 
@@ -154,7 +166,19 @@ async def get_agent_messages(
 
     user_id, app_name = parts[0], parts[1]
 
-    events = get_session_events(session_service, session_id)
+    page = get_session_events_page(
+        db,
+        session_id,
+        limit=limit,
+        cursor=cursor,
+        before_timestamp=before_timestamp,
+        # Callers that don't page keep getting the full history
+        paged=limit is not None or cursor is not None or before_timestamp is not None,
+    )
+    events = page["events"]
+    response.headers["X-Has-More"] = "true" if page["has_more"] else "false"
+    if page["next_cursor"]:
+        response.headers["X-Next-Cursor"] = page["next_cursor"]
 
     processed_events = []
     for event in events:
@@ -301,6 +325,71 @@ async def get_agent_messages(
     return processed_events
 
 
+@router.get("/{session_id}/artifacts/{filename}")
+async def download_artifact(
+    session_id: str,
+    filename: str,
+    version: Optional[int] = None,
+    db: Session = Depends(get_db),
+    payload: dict = Depends(get_jwt_token),
+):
+    """
+    Streams an artifact of a session without loading it fully into memory.
+    """
+    session = get_session_record(db, session_id)
+    if not session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Session not found"
+        )
+
+    # Verify if the session's agent belongs to the user's client
+    agent_id = uuid.UUID(session["app_name"]) if session["app_name"] else None
+    if agent_id:
+        agent = agent_service.get_agent(db, agent_id)
+        if agent:
+            await verify_user_client(payload, db, agent.client_id)
+
+    if not hasattr(artifacts_service, "open_artifact"):
+        artifact = artifacts_service.load_artifact(
+            app_name=session["app_name"],
+            user_id=session["user_id"],
+            session_id=session_id,
+            filename=filename,
+            version=version,
+        )
+        if not artifact or not artifact.inline_data:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Artifact not found"
+            )
+        return Response(
+            content=artifact.inline_data.data,
+            media_type=artifact.inline_data.mime_type,
+        )
+
+    opened = artifacts_service.open_artifact(
+        app_name=session["app_name"],
+        user_id=session["user_id"],
+        session_id=session_id,
+        filename=filename,
+        version=version,
+    )
+    if opened is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Artifact not found"
+        )
+
+    metadata, chunks = opened
+    return StreamingResponse(
+        chunks,
+        media_type=metadata["mime_type"] or "application/octet-stream",
+        headers={
+            "Content-Length": str(metadata["size"]),
+            "ETag": f'"{metadata["sha256"]}"',
+            "X-Artifact-Version": str(metadata["version"]),
+        },
+    )
+
+
 @router.delete(
     "/{session_id}",
     status_code=status.HTTP_204_NO_CONTENT,
@@ -28,15 +28,105 @@
 """
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from src.config.settings import settings
 
 POSTGRES_CONNECTION_STRING = settings.POSTGRES_CONNECTION_STRING
+POSTGRES_READ_REPLICA_CONNECTION_STRING = (
+    settings.POSTGRES_READ_REPLICA_CONNECTION_STRING or None
+)
 
-engine = create_engine(POSTGRES_CONNECTION_STRING)
+# The sync and async engines each keep their own pool, so the per-database
+# budget (DB_POOL_SIZE + DB_MAX_OVERFLOW) is split between them
+SYNC_POOL_SIZE = max(settings.DB_POOL_SIZE - settings.DB_POOL_SIZE // 2, 1)
+SYNC_MAX_OVERFLOW = settings.DB_MAX_OVERFLOW - settings.DB_MAX_OVERFLOW // 2
+ASYNC_POOL_SIZE = max(settings.DB_POOL_SIZE // 2, 1)
+ASYNC_MAX_OVERFLOW = settings.DB_MAX_OVERFLOW // 2
+
+POOL_OPTIONS = {
+    "pool_timeout": settings.DB_POOL_TIMEOUT,
+    "pool_recycle": settings.DB_POOL_RECYCLE,
+    "pool_pre_ping": settings.DB_POOL_PRE_PING,
+}
+
+
+def _connect_args():
+    """libpq options applied to every new connection"""
+    if settings.DB_STATEMENT_TIMEOUT > 0:
+        return {"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT}"}
+    return {}
+
+
+def _async_connect_args():
+    """asyncpg equivalent of _connect_args"""
+    if settings.DB_STATEMENT_TIMEOUT > 0:
+        return {
+            "server_settings": {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT)}
+        }
+    return {}
+
+
+def _async_connection_string(connection_string: str):
+    """Point the connection string at the asyncpg driver"""
+    url = make_url(connection_string).set(drivername="postgresql+asyncpg")
+    # asyncpg takes "ssl" instead of libpq's "sslmode"
+    if "sslmode" in url.query:
+        query = dict(url.query)
+        query["ssl"] = query.pop("sslmode")
+        url = url.set(query=query)
+    return url
+
+
+# Sync pool shared by the API and the ADK/CrewAI session services
+engine = create_engine(
+    POSTGRES_CONNECTION_STRING,
+    connect_args=_connect_args(),
+    pool_size=SYNC_POOL_SIZE,
+    max_overflow=SYNC_MAX_OVERFLOW,
+    **POOL_OPTIONS,
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine for the request path; no connection is opened until first use
+async_engine = create_async_engine(
+    _async_connection_string(POSTGRES_CONNECTION_STRING),
+    connect_args=_async_connect_args(),
+    pool_size=ASYNC_POOL_SIZE,
+    max_overflow=ASYNC_MAX_OVERFLOW,
+    **POOL_OPTIONS,
+)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+# Read replica engines fall back to the primary when no replica is configured
+if POSTGRES_READ_REPLICA_CONNECTION_STRING:
+    read_engine = create_engine(
+        POSTGRES_READ_REPLICA_CONNECTION_STRING,
+        connect_args=_connect_args(),
+        pool_size=SYNC_POOL_SIZE,
+        max_overflow=SYNC_MAX_OVERFLOW,
+        **POOL_OPTIONS,
+    )
+    async_read_engine = create_async_engine(
+        _async_connection_string(POSTGRES_READ_REPLICA_CONNECTION_STRING),
+        connect_args=_async_connect_args(),
+        pool_size=ASYNC_POOL_SIZE,
+        max_overflow=ASYNC_MAX_OVERFLOW,
+        **POOL_OPTIONS,
+    )
+else:
+    read_engine = engine
+    async_read_engine = async_engine
+
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+AsyncReadSessionLocal = async_sessionmaker(
+    async_read_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
 Base = declarative_base()
 
 
@@ -46,3 +136,51 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_read_db():
+    async with AsyncReadSessionLocal() as db:
+        yield db
+
+
+def _pool_stats(pool, capacity: int) -> dict:
+    """Checkout counters for a QueuePool"""
+    checked_out = pool.checkedout()
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": checked_out,
+        "overflow": pool.overflow(),
+        "capacity": capacity,
+        "saturation": round(checked_out / capacity, 3) if capacity else 0.0,
+    }
+
+
+def get_pool_stats() -> dict:
+    """Pool saturation for the primary and replica engines"""
+    sync_capacity = SYNC_POOL_SIZE + SYNC_MAX_OVERFLOW
+    async_capacity = ASYNC_POOL_SIZE + ASYNC_MAX_OVERFLOW
+    stats = {
+        "primary": _pool_stats(engine.pool, sync_capacity),
+        "primary_async": _pool_stats(async_engine.sync_engine.pool, async_capacity),
+        "read_replica": read_engine is not engine,
+    }
+    if read_engine is not engine:
+        stats["replica"] = _pool_stats(read_engine.pool, sync_capacity)
+        stats["replica_async"] = _pool_stats(
+            async_read_engine.sync_engine.pool, async_capacity
+        )
+    return stats
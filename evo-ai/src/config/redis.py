@@ -35,6 +35,7 @@ function to create a Redis connection pool for the application.
 """
 
 import os
+import time
 import redis
 from dotenv import load_dotenv
 import logging
@@ -60,6 +61,9 @@ def get_redis_config():
         "ssl": os.getenv("REDIS_SSL", "false").lower() == "true",
         "key_prefix": os.getenv("REDIS_KEY_PREFIX", "a2a:"),
         "default_ttl": int(os.getenv("REDIS_TTL", 3600)),
+        "connect_timeout": float(os.getenv("REDIS_CONNECT_TIMEOUT", 2.0)),
+        "socket_timeout": float(os.getenv("REDIS_SOCKET_TIMEOUT", 5.0)),
+        "retry_interval": float(os.getenv("REDIS_RETRY_INTERVAL", 30.0)),
     }
 
 
@@ -85,6 +89,8 @@ def create_redis_pool(config=None):
             password=config["password"] if config["password"] else None,
             ssl=config["ssl"],
             decode_responses=True,
+            socket_connect_timeout=config["connect_timeout"],
+            socket_timeout=config["socket_timeout"],
         )
         # Test the connection
         redis_client = redis.Redis(connection_pool=connection_pool)
@@ -97,3 +103,33 @@ def create_redis_pool(config=None):
     except redis.RedisError as e:
         logger.error(f"Redis connection error: {e}")
         raise
+
+
+_redis_client = None
+# Monotonic time before which a failed connection is not retried
+_retry_after = 0.0
+
+
+def get_redis_client():
+    """
+    Return a shared Redis client built on the application connection pool.
+
+    After a failed connection attempt, None is returned without retrying for
+    REDIS_RETRY_INTERVAL seconds, so callers don't block on every call while
+    Redis is down.
+
+    Returns:
+        redis.Redis: Redis client, or None if Redis is unreachable
+    """
+    global _redis_client, _retry_after
+    if _redis_client is None:
+        if time.monotonic() < _retry_after:
+            return None
+        config = get_redis_config()
+        try:
+            _redis_client = redis.Redis(connection_pool=create_redis_pool(config))
+        except Exception as e:
+            _retry_after = time.monotonic() + config["retry_interval"]
+            logger.warning(f"Redis unavailable, continuing without it: {e}")
+            return None
+    return _redis_client
@@ -93,3 +93,29 @@ class InternalServerError(BaseAPIException):
         super().__init__(
             status_code=500, message=message, error_code="INTERNAL_SERVER_ERROR"
         )
+
+
+class TooManyRequestsError(BaseAPIException):
+    """Exception when the server is saturated and the request must be retried later"""
+
+    def __init__(self, message: str, retry_after: int = 1):
+        super().__init__(
+            status_code=429,
+            message=message,
+            error_code="TOO_MANY_REQUESTS",
+            details={"retry_after": retry_after},
+        )
+        self.retry_after = retry_after
+        self.headers = {"Retry-After": str(retry_after)}
+
+
+class ArtifactQuotaExceededError(BaseAPIException):
+    """Exception when an artifact is too large or its session quota is used up"""
+
+    def __init__(self, message: str, details: Optional[Dict[str, Any]] = None):
+        super().__init__(
+            status_code=413,
+            message=message,
+            error_code="ARTIFACT_QUOTA_EXCEEDED",
+            details=details,
+        )
@@ -34,16 +34,30 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import HTMLResponse
-from src.config.database import engine, Base
+from src.config.database import async_engine, async_read_engine, engine, Base
 from src.config.settings import settings
 from src.utils.logger import setup_logger
 from src.utils.otel import init_otel
+from src.services.adk.mcp_pool import mcp_pool
+from src.utils.http_client import close_http_client
+from src.utils.a2a_enhanced_client import a2a_client_registry
+from src.services.audit_partition_service import audit_partition_manager
+from src.services.audit_service import audit_writer
+from src.services.dashboard_service import dashboard_aggregator
+from src.services.push_notification_service import push_dispatcher
+from src.services.session_compaction_service import session_compactor
+from src.services.workflow_timer_service import workflow_timer_scheduler
+from src.services.apikey_cache import api_key_cache
+from src.services.adk.artifact_service import PersistentArtifactService
 
 # Necessary for other modules
 from src.services.service_providers import session_service  # noqa: F401
 from src.services.service_providers import artifacts_service  # noqa: F401
 from src.services.service_providers import memory_service  # noqa: F401
 
+# Registers the CRM tables so create_all builds them
+import src.models.crm_models  # noqa: F401
+
 import src.api.auth_routes
 import src.api.admin_routes
 import src.api.chat_routes
@@ -54,6 +68,7 @@ import src.api.tool_routes
 import src.api.client_routes
 import src.api.a2a_routes
 import src.api.channels_routes
+import src.api.dashboard_routes
 
 # Add the root directory to PYTHONPATH
 root_dir = Path(__file__).parent.parent
@@ -77,6 +92,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Has-More"],
 )
 
 # Static files configuration
@@ -117,6 +133,7 @@ app.include_router(agent_router, prefix=API_PREFIX)
 app.include_router(a2a_router, prefix=API_PREFIX)
 # Channels router already includes '/api/v1' in its own prefix
 app.include_router(src.api.channels_routes.router)
+app.include_router(src.api.dashboard_routes.router)
 
 # Evolution API documentation endpoints
 @app.get("/evolution-swagger", response_class=HTMLResponse)
@@ -129,6 +146,39 @@ async def evolution_redoc():
     html_path = Path("src/templates/evolution_redoc.html")
     return HTMLResponse(html_path.read_text(encoding="utf-8"))
 
+
+@app.on_event("startup")
+async def start_background_workers():
+    push_dispatcher.start()
+    session_compactor.start()
+    workflow_timer_scheduler.start()
+    api_key_cache.start()
+    audit_partition_manager.start()
+    audit_writer.start()
+    dashboard_aggregator.start()
+    if isinstance(artifacts_service, PersistentArtifactService):
+        artifacts_service.start()
+
+
+@app.on_event("shutdown")
+async def close_shared_resources():
+    await push_dispatcher.stop()
+    await session_compactor.stop()
+    await workflow_timer_scheduler.stop()
+    api_key_cache.stop()
+    await audit_writer.stop()
+    await audit_partition_manager.stop()
+    await dashboard_aggregator.stop()
+    if isinstance(artifacts_service, PersistentArtifactService):
+        await artifacts_service.stop()
+    await mcp_pool.close()
+    await close_http_client()
+    await a2a_client_registry.close()
+    await async_engine.dispose()
+    if async_read_engine is not async_engine:
+        await async_read_engine.dispose()
+
+
 # Inicializa o OpenTelemetry para Langfuse
 init_otel()
 
@@ -32,12 +32,17 @@ from sqlalchemy import (
     Column,
     String,
     UUID,
+    Date,
     DateTime,
     ForeignKey,
     JSON,
     Text,
     CheckConstraint,
     Boolean,
+    Integer,
+    BigInteger,
+    Index,
+    UniqueConstraint,
 )
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship, backref
@@ -247,10 +252,26 @@ class AuditLog(Base):
     details = Column(JSON, nullable=True)
     ip_address = Column(String, nullable=True)
     user_agent = Column(String, nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Partition key, so it is part of the primary key
+    created_at = Column(
+        DateTime(timezone=True), primary_key=True, server_default=func.now()
+    )
 
     user = relationship("User", backref="audit_logs")
 
+    # Monthly partitions are managed by audit_partition_service
+    __table_args__ = (
+        Index("ix_audit_logs_created_at", "created_at", "id"),
+        Index("ix_audit_logs_user_created_at", "user_id", "created_at"),
+        Index(
+            "ix_audit_logs_resource_action_created_at",
+            "resource_type",
+            "action",
+            "created_at",
+        ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
 
 class ApiKey(Base):
     __tablename__ = "api_keys"
@@ -265,3 +286,201 @@ class ApiKey(Base):
     is_active = Column(Boolean, default=True)
 
     client = relationship("Client", backref="api_keys")
+
+
+class A2ATask(Base):
+    __tablename__ = "a2a_tasks"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    agent_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("agents.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    context_id = Column(String, nullable=True, index=True)
+    state = Column(String, nullable=False, default="submitted")
+    status_message = Column(JSON, nullable=True)
+    artifacts = Column(JSON, nullable=True)
+    history = Column(JSON, nullable=True)
+    state_history = Column(JSON, nullable=True)
+    push_notification_config = Column(JSON, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    __table_args__ = (
+        CheckConstraint(
+            "state IN ('submitted', 'working', 'input-required', 'completed', "
+            "'canceled', 'failed', 'rejected', 'auth-required', 'unknown')",
+            name="check_a2a_task_state",
+        ),
+    )
+
+    agent = relationship("Agent", backref=backref("a2a_tasks", cascade="all, delete"))
+
+
+class PushNotificationOutbox(Base):
+    __tablename__ = "push_notification_outbox"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    task_id = Column(UUID(as_uuid=True), nullable=True, index=True)
+    url = Column(String, nullable=False)
+    destination = Column(String, nullable=False)
+    payload = Column(JSON, nullable=False)
+    push_config = Column(JSON, nullable=False)
+    status = Column(String, nullable=False, default="pending")
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_error = Column(Text, nullable=True)
+    delivered_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    __table_args__ = (
+        CheckConstraint(
+            "status IN ('pending', 'delivering', 'delivered', 'dead')",
+            name="check_push_notification_status",
+        ),
+        Index("ix_push_notification_outbox_due", "status", "next_attempt_at"),
+    )
+
+
+class SessionEventArchive(Base):
+    __tablename__ = "session_event_archive"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    event_id = Column(String, nullable=False)
+    app_name = Column(String, nullable=False)
+    user_id = Column(String, nullable=False)
+    session_id = Column(String, nullable=False)
+    invocation_id = Column(String, nullable=True)
+    author = Column(String, nullable=True)
+    content = Column(JSON, nullable=True)
+    event_timestamp = Column(DateTime, nullable=False)
+    summary_event_id = Column(String, nullable=True)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index(
+            "ix_session_event_archive_session",
+            "app_name",
+            "user_id",
+            "session_id",
+            "event_timestamp",
+        ),
+    )
+
+
+class ArtifactBlob(Base):
+    __tablename__ = "artifact_blobs"
+
+    sha256 = Column(String(64), primary_key=True)
+    size = Column(BigInteger, nullable=False)
+    storage_key = Column(String, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_referenced_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class ArtifactVersion(Base):
+    __tablename__ = "artifact_versions"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    app_name = Column(String, nullable=False)
+    user_id = Column(String, nullable=False)
+    session_id = Column(String, nullable=False)
+    filename = Column(String, nullable=False)
+    version = Column(Integer, nullable=False)
+    sha256 = Column(String(64), ForeignKey("artifact_blobs.sha256"), nullable=False)
+    mime_type = Column(String, nullable=True)
+    size = Column(BigInteger, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=True, index=True)
+
+    __table_args__ = (
+        UniqueConstraint(
+            "app_name",
+            "user_id",
+            "session_id",
+            "filename",
+            "version",
+            name="uq_artifact_versions_file_version",
+        ),
+        Index("ix_artifact_versions_sha256", "sha256"),
+    )
+
+
+class MemoryEntry(Base):
+    __tablename__ = "memory_entries"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    app_name = Column(String, nullable=False)
+    user_id = Column(String, nullable=False)
+    session_id = Column(String, nullable=False)
+    event_id = Column(String, nullable=False)
+    author = Column(String, nullable=True)
+    content = Column(Text, nullable=False)
+    event_timestamp = Column(DateTime(timezone=True), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint(
+            "app_name",
+            "user_id",
+            "session_id",
+            "event_id",
+            name="uq_memory_entries_event",
+        ),
+        Index("ix_memory_entries_namespace", "app_name", "user_id", "event_timestamp"),
+    )
+
+
+class WorkflowTimer(Base):
+    __tablename__ = "workflow_timers"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    agent_id = Column(
+        UUID(as_uuid=True), ForeignKey("agents.id", ondelete="CASCADE"), nullable=False
+    )
+    app_name = Column(String, nullable=False)
+    user_id = Column(String, nullable=False)
+    session_id = Column(String, nullable=False)
+    node_id = Column(String, nullable=False)
+    checkpoint = Column(JSON, nullable=False)
+    # A2A task that receives the output of the resumed run
+    delivery_task_id = Column(UUID(as_uuid=True), nullable=True)
+    status = Column(String, nullable=False, default="pending")
+    attempts = Column(Integer, nullable=False, default=0)
+    fire_at = Column(DateTime(timezone=True), nullable=False)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    __table_args__ = (
+        CheckConstraint(
+            "status IN ('pending', 'running', 'fired', 'failed')",
+            name="check_workflow_timer_status",
+        ),
+        Index("ix_workflow_timers_due", "status", "fire_at"),
+    )
+
+
+# Agents, contacts and pipelines are counted by triggers (dashboard_service);
+# sessions live in the ADK-owned table and are added by the dashboard aggregator,
+# while a delete trigger on that table records removed sessions
+class DashboardDailyRollup(Base):
+    __tablename__ = "dashboard_daily_rollups"
+
+    # No foreign key: triggers still write while a client is being deleted
+    client_id = Column(UUID(as_uuid=True), primary_key=True)
+    day = Column(Date, primary_key=True)
+    metric = Column(String, primary_key=True)
+    created = Column(BigInteger, nullable=False, default=0)
+    deleted = Column(BigInteger, nullable=False, default=0)
+
+
+class DashboardRollupWatermark(Base):
+    __tablename__ = "dashboard_rollup_watermarks"
+
+    source = Column(String, primary_key=True)
+    watermark = Column(DateTime(timezone=True), nullable=False)
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -115,6 +115,18 @@ class HTTPToolErrorHandling(BaseModel):
         from_attributes = True
 
 
+class HTTPToolCache(BaseModel):
+    """Configuration of the response cache of an HTTP tool"""
+
+    ttl: int = Field(..., gt=0, description="Time to live of cached responses in seconds")
+    max_entries: int = Field(
+        default=1000, gt=0, description="Maximum cached responses kept in memory"
+    )
+
+    class Config:
+        from_attributes = True
+
+
 class HTTPTool(BaseModel):
     """Configuration of an HTTP tool"""
 
@@ -126,6 +138,15 @@ class HTTPTool(BaseModel):
     parameters: HTTPToolParameters
     description: str
     error_handling: HTTPToolErrorHandling
+    max_concurrency: Optional[int] = Field(
+        default=None,
+        gt=0,
+        description="Maximum in-flight requests for this tool (defaults to HTTP_TOOL_MAX_CONCURRENCY)",
+    )
+    cache: Optional[HTTPToolCache] = Field(
+        default=None,
+        description="Response cache for idempotent endpoints, disabled when omitted",
+    )
 
     class Config:
         from_attributes = True
@@ -142,6 +163,33 @@ class CustomTools(BaseModel):
         from_attributes = True
 
 
+class SessionCompactionConfig(BaseModel):
+    """Compaction of long sessions into a summary plus archived events"""
+
+    enabled: bool = Field(default=False, description="Enable session compaction")
+    max_events: int = Field(
+        default=200, gt=0, description="Compact once a session has more events"
+    )
+    max_bytes: Optional[int] = Field(
+        default=None,
+        gt=0,
+        description="Compact once the stored event content exceeds this size",
+    )
+    keep_recent_events: int = Field(
+        default=40, ge=0, description="Newest events kept verbatim after compaction"
+    )
+    summarize: bool = Field(
+        default=True,
+        description="Summarize archived events with the agent's model (extractive fallback)",
+    )
+    max_summary_chars: int = Field(
+        default=4000, gt=0, description="Maximum length of the summary event"
+    )
+
+    class Config:
+        from_attributes = True
+
+
 def generate_api_key(length: int = 32) -> str:
     """Generate a secure API key."""
     alphabet = string.ascii_letters + string.digits
@@ -177,6 +225,9 @@ class LLMConfig(BaseModel):
     workflow: Optional[FlowNodes] = Field(
         default=None, description="Workflow configuration"
     )
+    session_compaction: Optional[SessionCompactionConfig] = Field(
+        default=None, description="Session history compaction"
+    )
 
     class Config:
         from_attributes = True
@@ -275,6 +326,9 @@ class AgentConfig(BaseModel):
     sub_agents: Optional[List[UUID]] = Field(
         default_factory=list, description="List of IDs of sub-agents used in agent"
     )
+    session_compaction: Optional[SessionCompactionConfig] = Field(
+        default=None, description="Session history compaction"
+    )
 
     class Config:
         from_attributes = True
@@ -72,3 +72,4 @@ class AuditLogFilter(BaseModel):
     end_date: Optional[datetime] = None
     skip: Optional[int] = Field(0, ge=0)
     limit: Optional[int] = Field(100, ge=1, le=1000)
+    cursor: Optional[str] = None
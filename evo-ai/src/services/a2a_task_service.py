@@ -0,0 +1,287 @@
+"""
+┌──────────────────────────────────────────────────────────────────────────────┐
+│ @author: Davidson Gomes                                                      │
+│ @file: a2a_task_service.py                                                   │
+│ Developed by: Davidson Gomes                                                 │
+│ Creation date: October 17, 2026                                              │
+│ Contact: contato@evolution-api.com                                           │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @copyright © Evolution API 2025. All rights reserved.                        │
+│ Licensed under the Apache License, Version 2.0                               │
+│                                                                              │
+│ You may not use this file except in compliance with the License.             │
+│ You may obtain a copy of the License at                                      │
+│                                                                              │
+│    http://www.apache.org/licenses/LICENSE-2.0                                │
+│                                                                              │
+│ Unless required by applicable law or agreed to in writing, software          │
+│ distributed under the License is distributed on an "AS IS" BASIS,            │
+│ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.     │
+│ See the License for the specific language governing permissions and          │
+│ limitations under the License.                                               │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @important                                                                   │
+│ For any future changes to the code in this file, it is recommended to        │
+│ include, together with the modification, the information of the developer    │
+│ who changed it and the date of modification.                                 │
+└──────────────────────────────────────────────────────────────────────────────┘
+"""
+
+"""
+Durable store for A2A tasks.
+
+Tasks created by message/send are persisted with their state transitions,
+artifacts, history and push notification config, so tasks/get, tasks/cancel
+and tasks/resubscribe work across requests and workers. Executions running
+in this process are tracked so they can be cancelled, and they watch the
+stored state so a cancel received by another worker stops them too.
+"""
+
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Union
+
+from fastapi import HTTPException, status
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from src.config.database import SessionLocal
+from src.models.models import A2ATask
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATES = {"completed", "canceled", "failed", "rejected"}
+
+# Executions running in this process, by task id
+_running_tasks: Dict[str, asyncio.Task] = {}
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def parse_task_id(task_id: Union[str, uuid.UUID, None]) -> Optional[uuid.UUID]:
+    """Parse a client supplied task id, returning None when it is not a valid id"""
+    if isinstance(task_id, uuid.UUID):
+        return task_id
+    try:
+        return uuid.UUID(str(task_id))
+    except (TypeError, ValueError):
+        return None
+
+
+def create_task(
+    db: Session,
+    agent_id: uuid.UUID,
+    context_id: Optional[str],
+    state: str = "submitted",
+    history: Optional[List[Dict[str, Any]]] = None,
+    push_notification_config: Optional[Dict[str, Any]] = None,
+) -> A2ATask:
+    """Create a new A2A task"""
+    try:
+        task = A2ATask(
+            agent_id=agent_id,
+            context_id=context_id,
+            state=state,
+            history=history or [],
+            artifacts=[],
+            state_history=[{"state": state, "timestamp": _now_iso()}],
+            push_notification_config=push_notification_config,
+        )
+        db.add(task)
+        db.commit()
+        db.refresh(task)
+        logger.info(f"A2A task created: {task.id} ({state})")
+        return task
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error(f"Error creating A2A task: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error creating A2A task",
+        )
+
+
+def get_task(
+    db: Session,
+    task_id: Union[str, uuid.UUID],
+    agent_id: Optional[uuid.UUID] = None,
+) -> Optional[A2ATask]:
+    """Search for an A2A task by ID, optionally scoped to an agent"""
+    parsed_id = parse_task_id(task_id)
+    if parsed_id is None:
+        return None
+    try:
+        query = db.query(A2ATask).filter(A2ATask.id == parsed_id)
+        if agent_id is not None:
+            query = query.filter(A2ATask.agent_id == agent_id)
+        return query.first()
+    except SQLAlchemyError as e:
+        logger.error(f"Error searching for A2A task {task_id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error searching for A2A task",
+        )
+
+
+def update_task_state(
+    db: Session,
+    task_id: Union[str, uuid.UUID],
+    state: str,
+    status_message: Optional[Dict[str, Any]] = None,
+    artifacts: Optional[List[Dict[str, Any]]] = None,
+    history: Optional[List[Dict[str, Any]]] = None,
+) -> Optional[A2ATask]:
+    """Move a task to a new state. Tasks already in a terminal state are left untouched"""
+    try:
+        task = get_task(db, task_id)
+        if not task:
+            return None
+
+        # Another request (e.g. tasks/cancel) may have finished the task first
+        db.refresh(task)
+        if task.state in TERMINAL_STATES:
+            logger.info(f"A2A task {task_id} already {task.state}, ignoring {state}")
+            return task
+
+        task.state = state
+        task.status_message = status_message
+        if artifacts is not None:
+            task.artifacts = artifacts
+        if history is not None:
+            task.history = history
+        # Reassign so the JSON column is flagged as modified
+        task.state_history = list(task.state_history or []) + [
+            {"state": state, "timestamp": _now_iso()}
+        ]
+
+        db.commit()
+        db.refresh(task)
+        logger.info(f"A2A task {task_id} moved to {state}")
+        return task
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error(f"Error updating A2A task {task_id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error updating A2A task",
+        )
+
+
+def append_task_artifacts(
+    db: Session, task_id: Union[str, uuid.UUID], artifacts: List[Dict[str, Any]]
+) -> Optional[A2ATask]:
+    """Add artifacts produced after the task finished (e.g. by a resumed workflow)"""
+    try:
+        task = get_task(db, task_id)
+        if not task:
+            return None
+
+        # Reassign so the JSON column is flagged as modified
+        task.artifacts = list(task.artifacts or []) + artifacts
+        db.commit()
+        db.refresh(task)
+        return task
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error(f"Error appending artifacts to A2A task {task_id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error updating A2A task",
+        )
+
+
+def set_push_notification_config(
+    db: Session, task: A2ATask, push_notification_config: Dict[str, Any]
+) -> A2ATask:
+    """Store the push notification config of a task"""
+    try:
+        task.push_notification_config = push_notification_config
+        db.commit()
+        db.refresh(task)
+        return task
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error(f"Error storing push config for A2A task {task.id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error storing push notification config",
+        )
+
+
+def task_to_a2a(task: A2ATask, history_length: Optional[int] = None) -> Dict[str, Any]:
+    """Serialize a stored task as an A2A Task object"""
+    timestamp = task.updated_at or task.created_at
+    task_status = {
+        "state": task.state,
+        "timestamp": (
+            timestamp.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+            if timestamp
+            else _now_iso()
+        ),
+    }
+    if task.status_message:
+        task_status["message"] = task.status_message
+
+    result = {
+        "id": str(task.id),
+        "contextId": task.context_id,
+        "status": task_status,
+        "artifacts": task.artifacts or [],
+        "kind": "task",
+        "metadata": {"stateTransitionHistory": task.state_history or []},
+    }
+
+    history = task.history or []
+    if history_length is not None:
+        history = history[-history_length:] if history_length > 0 else []
+    if history:
+        result["history"] = history
+
+    return result
+
+
+def register_running_task(task_id: Union[str, uuid.UUID], execution: asyncio.Task):
+    """Track a background execution so tasks/cancel can stop it"""
+    key = str(task_id)
+    _running_tasks[key] = execution
+    execution.add_done_callback(lambda _: _running_tasks.pop(key, None))
+
+
+def cancel_running_task(task_id: Union[str, uuid.UUID]) -> bool:
+    """Cancel the execution of a task if it runs in this process"""
+    execution = _running_tasks.get(str(task_id))
+    if execution is None or execution.done():
+        return False
+    execution.cancel()
+    return True
+
+
+def get_task_state(task_id: Union[str, uuid.UUID]) -> Optional[str]:
+    """Read the stored state of a task in a fresh session"""
+    db = SessionLocal()
+    try:
+        task = get_task(db, task_id)
+        return task.state if task else None
+    finally:
+        db.close()
+
+
+async def cancel_when_canceled(
+    task_id: Union[str, uuid.UUID], execution: asyncio.Task, interval: float
+):
+    """Cancel a local execution once its task is canceled, on any worker"""
+    while not execution.done():
+        await asyncio.sleep(interval)
+        try:
+            state = await asyncio.to_thread(get_task_state, task_id)
+        except Exception as e:
+            logger.warning(f"Error checking cancellation of A2A task {task_id}: {e}")
+            continue
+        if state == "canceled":
+            logger.info(f"A2A task {task_id} canceled elsewhere, stopping execution")
+            execution.cancel()
+            return
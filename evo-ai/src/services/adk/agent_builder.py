@@ -27,7 +27,7 @@
 └──────────────────────────────────────────────────────────────────────────────┘
 """
 
-from typing import List, Optional, Tuple
+from typing import Awaitable, Dict, List, Optional, Tuple
 from google.adk.agents.llm_agent import LlmAgent
 from google.adk.agents import SequentialAgent, ParallelAgent, LoopAgent, BaseAgent
 from google.adk.models.lite_llm import LiteLlm
@@ -35,42 +35,153 @@ from google.adk.tools.agent_tool import AgentTool
 from src.schemas.schemas import Agent
 from src.utils.logger import setup_logger
 from src.core.exceptions import AgentNotFoundError
-from src.services.agent_service import get_agent
+from src.services.agent_service import get_agent_graph, get_agents_by_ids
 from src.services.adk.custom_tools import CustomToolBuilder
 from src.services.adk.mcp_service import MCPService
+from src.services.adk.mcp_pool import mcp_pool
 from src.services.adk.custom_agents.a2a_agent import A2ACustomAgent
 from src.services.adk.custom_agents.workflow_agent import WorkflowAgent
 from src.services.adk.custom_agents.task_agent import TaskAgent
 from src.services.apikey_service import get_decrypted_api_key
+from src.services.apikey_cache import api_key_dependency
+from src.services.adk.agent_cache import agent_cache
+from src.services.mcp_server_service import mcp_server_dependency
 from sqlalchemy.orm import Session
 from contextlib import AsyncExitStack
 from google.adk.tools import load_memory
 
 from datetime import datetime
+import asyncio
+import time
 import uuid
 
 from src.schemas.agent_config import AgentTask
+from src.config.settings import settings
 
 logger = setup_logger(__name__)
 
+# Prompt variables resolved at build time with minute precision
+DATETIME_PLACEHOLDERS = (
+    "{current_datetime}",
+    "{current_day_of_week}",
+    "{current_date_iso}",
+    "{current_time}",
+)
+
 
 class AgentBuilder:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, agent_map: Optional[Dict[str, Agent]] = None):
         self.db = db
+        # Agents of the tree being built, keyed by ID; filled by get_agent_graph
+        self.agent_map = agent_map if agent_map is not None else {}
         self.custom_tool_builder = CustomToolBuilder()
-        self.mcp_service = MCPService()
+        # Build bookkeeping used by the agent cache
+        self.dependencies = set()
+        self.cacheable = True
+        self.time_sensitive = False
+
+    @staticmethod
+    def _merge_exit_stacks(
+        *exit_stacks: Optional[AsyncExitStack],
+    ) -> Optional[AsyncExitStack]:
+        """Combine the exit stacks of an agent and its children into one."""
+        exit_stacks = [stack for stack in exit_stacks if stack is not None]
+        if not exit_stacks:
+            return None
+        if len(exit_stacks) == 1:
+            return exit_stacks[0]
+
+        merged_stack = AsyncExitStack()
+        for stack in exit_stacks:
+            merged_stack.push_async_exit(stack)
+        return merged_stack
+
+    def _get_agents(self, agent_ids: List[str]) -> Dict[str, Agent]:
+        """Return the agent map, loading agents that were not prefetched."""
+        missing_ids = [
+            agent_id for agent_id in agent_ids if agent_id not in self.agent_map
+        ]
+        if missing_ids:
+            self.agent_map.update(get_agents_by_ids(self.db, missing_ids))
+        return self.agent_map
+
+    async def _build_concurrently(
+        self, builds: List[Awaitable[Tuple[BaseAgent, Optional[AsyncExitStack]]]]
+    ) -> List[Tuple[BaseAgent, Optional[AsyncExitStack]]]:
+        """Run child builds concurrently, at most AGENT_BUILD_CONCURRENCY at once.
+
+        The cap applies per parent, so nested builds never wait on a slot held
+        by their own parent. If any build fails, the exit stacks of the builds
+        that succeeded are closed before the error is raised.
+
+        Without the MCP pool, MCP toolsets enter their stdio/SSE contexts in
+        the task that builds them and must be closed from that same task, so
+        the builds then run one after another in the caller's task.
+        """
+        if not settings.MCP_POOL_ENABLED:
+            results = []
+            try:
+                for build in builds:
+                    results.append(await build)
+            except BaseException:
+                # Builds not started yet would warn as never awaited
+                for build in builds[len(results) + 1 :]:
+                    build.close()
+                for _, exit_stack in results:
+                    if exit_stack is not None:
+                        await exit_stack.aclose()
+                raise
+            return results
+
+        semaphore = asyncio.Semaphore(settings.AGENT_BUILD_CONCURRENCY)
+
+        async def limited(build):
+            async with semaphore:
+                return await build
+
+        results = await asyncio.gather(
+            *(limited(build) for build in builds), return_exceptions=True
+        )
+
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            for result in results:
+                if not isinstance(result, BaseException) and result[1] is not None:
+                    await result[1].aclose()
+            raise errors[0]
 
-    async def _agent_tools_builder(self, agent) -> List[AgentTool]:
+        return results
+
+    async def _agent_tools_builder(
+        self, agent
+    ) -> Tuple[List[AgentTool], Optional[AsyncExitStack]]:
         """Build the tools for an agent."""
         agent_tools_ids = agent.config.get("agent_tools")
-        agent_tools = []
-        if agent_tools_ids and isinstance(agent_tools_ids, list):
-            for agent_tool_id in agent_tools_ids:
-                sub_agent = get_agent(self.db, agent_tool_id)
-                llm_agent, _ = await self.build_llm_agent(sub_agent)
-                if llm_agent:
-                    agent_tools.append(AgentTool(agent=llm_agent))
-        return agent_tools
+        if not agent_tools_ids or not isinstance(agent_tools_ids, list):
+            return [], None
+
+        agent_tools_ids = [str(agent_tool_id) for agent_tool_id in agent_tools_ids]
+        self.dependencies.update(agent_tools_ids)
+
+        agents = self._get_agents(agent_tools_ids)
+        for agent_tool_id in agent_tools_ids:
+            if agent_tool_id not in agents:
+                logger.error(f"Agent tool not found: {agent_tool_id}")
+                raise AgentNotFoundError(f"Agent with ID {agent_tool_id} not found")
+
+        built_tools = await self._build_concurrently(
+            [
+                self.build_llm_agent(agents[agent_tool_id])
+                for agent_tool_id in agent_tools_ids
+            ]
+        )
+
+        agent_tools = [
+            AgentTool(agent=llm_agent) for llm_agent, _ in built_tools if llm_agent
+        ]
+        return agent_tools, self._merge_exit_stacks(
+            *(exit_stack for _, exit_stack in built_tools)
+        )
 
     async def _create_llm_agent(
         self, agent, enabled_tools: List[str] = []
@@ -84,12 +195,32 @@ class AgentBuilder:
         mcp_tools = []
         mcp_exit_stack = None
         if agent.config.get("mcp_servers") or agent.config.get("custom_mcp_servers"):
-            mcp_tools, mcp_exit_stack = await self.mcp_service.build_tools(
+            # Without the pool, MCP sessions are closed at the end of the run,
+            # so the tree can't be reused
+            if not mcp_pool.enabled:
+                self.cacheable = False
+            # A service per agent: sibling agents connect concurrently
+            mcp_service = MCPService()
+            mcp_tools, mcp_exit_stack = await mcp_service.build_tools(
                 agent.config, self.db
             )
+            # Don't cache a tree that lacks the tools of an unreachable server
+            if mcp_service.failed_servers:
+                self.cacheable = False
+            for server in agent.config.get("mcp_servers") or []:
+                if server.get("id"):
+                    self.dependencies.add(mcp_server_dependency(server["id"]))
 
         # Get agent tools
-        agent_tools = await self._agent_tools_builder(agent)
+        try:
+            agent_tools, agent_tools_exit_stack = await self._agent_tools_builder(
+                agent
+            )
+        except BaseException:
+            if mcp_exit_stack:
+                await mcp_exit_stack.aclose()
+            raise
+        mcp_exit_stack = self._merge_exit_stacks(mcp_exit_stack, agent_tools_exit_stack)
 
         # Combine all tools
         all_tools = custom_tools + mcp_tools + agent_tools
@@ -98,6 +229,12 @@ class AgentBuilder:
             all_tools = [tool for tool in all_tools if tool.name in enabled_tools]
             logger.info(f"Enabled tools enabled. Total tools: {len(all_tools)}")
 
+        if any(
+            placeholder in (agent.instruction or "")
+            for placeholder in DATETIME_PLACEHOLDERS
+        ):
+            self.time_sensitive = True
+
         now = datetime.now()
         current_datetime = now.strftime("%d/%m/%Y %H:%M")
         current_day_of_week = now.strftime("%A")
@@ -137,6 +274,8 @@ class AgentBuilder:
 
         # Get API key from api_key_id
         if hasattr(agent, "api_key_id") and agent.api_key_id:
+            # Cached trees are dropped when this key changes
+            self.dependencies.add(api_key_dependency(agent.api_key_id))
             decrypted_key = get_decrypted_api_key(self.db, agent.api_key_id)
             if decrypted_key:
                 logger.info(f"Using stored API key for agent {agent.name}")
@@ -154,6 +293,7 @@ class AgentBuilder:
                 # Check if it is a UUID of a stored key
                 try:
                     key_id = uuid.UUID(config_api_key)
+                    self.dependencies.add(api_key_dependency(key_id))
                     decrypted_key = get_decrypted_api_key(self.db, key_id)
                     if decrypted_key:
                         logger.info("Config API key is a valid reference")
@@ -181,44 +321,58 @@ class AgentBuilder:
             mcp_exit_stack,
         )
 
+    async def _build_sub_agent(
+        self, agent
+    ) -> Tuple[BaseAgent, Optional[AsyncExitStack]]:
+        """Build a sub-agent according to its type."""
+        logger.info(f"Sub-agent found: {agent.name} (type: {agent.type})")
+
+        if agent.type == "llm":
+            sub_agent, exit_stack = await self._create_llm_agent(agent)
+        elif agent.type == "a2a":
+            sub_agent, exit_stack = await self.build_a2a_agent(agent)
+        elif agent.type == "workflow":
+            sub_agent, exit_stack = await self.build_workflow_agent(agent)
+        elif agent.type == "task":
+            sub_agent, exit_stack = await self.build_task_agent(agent)
+        elif agent.type == "sequential":
+            sub_agent, exit_stack = await self.build_composite_agent(agent)
+        elif agent.type == "parallel":
+            sub_agent, exit_stack = await self.build_composite_agent(agent)
+        elif agent.type == "loop":
+            sub_agent, exit_stack = await self.build_composite_agent(agent)
+        else:
+            raise ValueError(f"Invalid agent type: {agent.type}")
+
+        logger.info(f"Sub-agent added: {agent.name}")
+        return sub_agent, exit_stack
+
     async def _get_sub_agents(
         self, sub_agent_ids: List[str]
     ) -> List[Tuple[LlmAgent, Optional[AsyncExitStack]]]:
-        """Get and create LLM sub-agents."""
-        sub_agents = []
-        for sub_agent_id in sub_agent_ids:
-            sub_agent_id_str = str(sub_agent_id)
+        """Get and create LLM sub-agents.
 
-            agent = get_agent(self.db, sub_agent_id_str)
+        Sub-agents come from the prefetched agent map and are built
+        concurrently; the caller owns the returned exit stacks.
+        """
+        sub_agent_ids = [str(sub_agent_id) for sub_agent_id in sub_agent_ids]
+        self.dependencies.update(sub_agent_ids)
 
-            if agent is None:
+        agents = self._get_agents(sub_agent_ids)
+        for sub_agent_id_str in sub_agent_ids:
+            if sub_agent_id_str not in agents:
                 logger.error(f"Sub-agent not found: {sub_agent_id_str}")
                 raise AgentNotFoundError(f"Agent with ID {sub_agent_id_str} not found")
 
-            logger.info(f"Sub-agent found: {agent.name} (type: {agent.type})")
-
-            if agent.type == "llm":
-                sub_agent, exit_stack = await self._create_llm_agent(agent)
-            elif agent.type == "a2a":
-                sub_agent, exit_stack = await self.build_a2a_agent(agent)
-            elif agent.type == "workflow":
-                sub_agent, exit_stack = await self.build_workflow_agent(agent)
-            elif agent.type == "task":
-                sub_agent, exit_stack = await self.build_task_agent(agent)
-            elif agent.type == "sequential":
-                sub_agent, exit_stack = await self.build_composite_agent(agent)
-            elif agent.type == "parallel":
-                sub_agent, exit_stack = await self.build_composite_agent(agent)
-            elif agent.type == "loop":
-                sub_agent, exit_stack = await self.build_composite_agent(agent)
-            else:
-                raise ValueError(f"Invalid agent type: {agent.type}")
-
-            sub_agents.append(sub_agent)
-            logger.info(f"Sub-agent added: {agent.name}")
+        sub_agents = await self._build_concurrently(
+            [
+                self._build_sub_agent(agents[sub_agent_id_str])
+                for sub_agent_id_str in sub_agent_ids
+            ]
+        )
 
         logger.info(f"Sub-agents created: {len(sub_agents)}")
-        logger.info(f"Sub-agents: {str(sub_agents)}")
+        logger.info(f"Sub-agents: {str([agent for agent, _ in sub_agents])}")
 
         return sub_agents
 
@@ -229,19 +383,30 @@ class AgentBuilder:
         logger.info("Creating LLM agent")
 
         sub_agents = []
+        sub_agents_exit_stack = None
         if root_agent.config.get("sub_agents"):
             sub_agents_with_stacks = await self._get_sub_agents(
                 root_agent.config.get("sub_agents")
             )
             sub_agents = [agent for agent, _ in sub_agents_with_stacks]
+            sub_agents_exit_stack = self._merge_exit_stacks(
+                *(stack for _, stack in sub_agents_with_stacks)
+            )
 
-        root_llm_agent, exit_stack = await self._create_llm_agent(
-            root_agent, enabled_tools
-        )
+        try:
+            root_llm_agent, exit_stack = await self._create_llm_agent(
+                root_agent, enabled_tools
+            )
+        except BaseException:
+            if sub_agents_exit_stack:
+                await sub_agents_exit_stack.aclose()
+            raise
         if sub_agents:
             root_llm_agent.sub_agents = sub_agents
 
-        return root_llm_agent, exit_stack
+        return root_llm_agent, self._merge_exit_stacks(
+            exit_stack, sub_agents_exit_stack
+        )
 
     async def build_a2a_agent(
         self, root_agent
@@ -254,11 +419,15 @@ class AgentBuilder:
 
         try:
             sub_agents = []
+            exit_stack = None
             if root_agent.config.get("sub_agents"):
                 sub_agents_with_stacks = await self._get_sub_agents(
                     root_agent.config.get("sub_agents")
                 )
                 sub_agents = [agent for agent, _ in sub_agents_with_stacks]
+                exit_stack = self._merge_exit_stacks(
+                    *(stack for _, stack in sub_agents_with_stacks)
+                )
 
             config = root_agent.config or {}
             timeout = config.get("timeout", 300)
@@ -276,10 +445,12 @@ class AgentBuilder:
                 f"A2A agent created successfully: {root_agent.name} ({root_agent.agent_card_url})"
             )
 
-            return a2a_agent, None
+            return a2a_agent, exit_stack
 
         except Exception as e:
             logger.error(f"Error building A2A agent: {str(e)}")
+            if exit_stack:
+                await exit_stack.aclose()
             raise ValueError(f"Error building A2A agent: {str(e)}")
 
     async def build_workflow_agent(
@@ -293,13 +464,25 @@ class AgentBuilder:
         if not agent_config.get("workflow"):
             raise ValueError("workflow is required for workflow agents")
 
+        # Workflow agents hold the request database session
+        self.cacheable = False
+        for node in agent_config.get("workflow", {}).get("nodes", []):
+            if node.get("type") == "agent-node":
+                node_agent_id = node.get("data", {}).get("agent", {}).get("id")
+                if node_agent_id:
+                    self.dependencies.add(str(node_agent_id))
+
         try:
             sub_agents = []
+            exit_stack = None
             if root_agent.config.get("sub_agents"):
                 sub_agents_with_stacks = await self._get_sub_agents(
                     root_agent.config.get("sub_agents")
                 )
                 sub_agents = [agent for agent, _ in sub_agents_with_stacks]
+                exit_stack = self._merge_exit_stacks(
+                    *(stack for _, stack in sub_agents_with_stacks)
+                )
 
             config = root_agent.config or {}
             timeout = config.get("timeout", 300)
@@ -312,14 +495,18 @@ class AgentBuilder:
                 or f"Workflow Agent for {root_agent.name}",
                 sub_agents=sub_agents,
                 db=self.db,
+                agent_id=str(root_agent.id),
+                agent_map=self.agent_map,
             )
 
             logger.info(f"Workflow agent created successfully: {root_agent.name}")
 
-            return workflow_agent, None
+            return workflow_agent, exit_stack
 
         except Exception as e:
             logger.error(f"Error building Workflow agent: {str(e)}")
+            if exit_stack:
+                await exit_stack.aclose()
             raise ValueError(f"Error building Workflow agent: {str(e)}")
 
     async def build_task_agent(
@@ -333,14 +520,24 @@ class AgentBuilder:
         if not agent_config.get("tasks"):
             raise ValueError("tasks are required for Task agents")
 
+        # Task agents hold the request database session and mutate their tasks
+        self.cacheable = False
+        for task_config in agent_config.get("tasks", []):
+            if task_config.get("agent_id"):
+                self.dependencies.add(str(task_config.get("agent_id")))
+
         try:
             # Get sub-agents if there are any
             sub_agents = []
+            exit_stack = None
             if root_agent.config.get("sub_agents"):
                 sub_agents_with_stacks = await self._get_sub_agents(
                     root_agent.config.get("sub_agents")
                 )
                 sub_agents = [agent for agent, _ in sub_agents_with_stacks]
+                exit_stack = self._merge_exit_stacks(
+                    *(stack for _, stack in sub_agents_with_stacks)
+                )
 
             # Additional configurations
             config = root_agent.config or {}
@@ -362,14 +559,17 @@ class AgentBuilder:
                 tasks=tasks,
                 db=self.db,
                 sub_agents=sub_agents,
+                agent_map=self.agent_map,
             )
 
             logger.info(f"Task agent created successfully: {root_agent.name}")
 
-            return task_agent, None
+            return task_agent, exit_stack
 
         except Exception as e:
             logger.error(f"Error building Task agent: {str(e)}")
+            if exit_stack:
+                await exit_stack.aclose()
             raise ValueError(f"Error building Task agent: {str(e)}")
 
     async def build_composite_agent(
@@ -400,6 +600,9 @@ class AgentBuilder:
 
         sub_agents = [agent for agent, _ in sub_agents_with_stacks]
         logger.info(f"Extracted sub-agents: {[agent.name for agent in sub_agents]}")
+        exit_stack = self._merge_exit_stacks(
+            *(stack for _, stack in sub_agents_with_stacks)
+        )
 
         if root_agent.type == "sequential":
             logger.info(f"Creating SequentialAgent with {len(sub_agents)} sub-agents")
@@ -409,7 +612,7 @@ class AgentBuilder:
                     sub_agents=sub_agents,
                     description=root_agent.config.get("description", ""),
                 ),
-                None,
+                exit_stack,
             )
         elif root_agent.type == "parallel":
             logger.info(f"Creating ParallelAgent with {len(sub_agents)} sub-agents")
@@ -419,7 +622,7 @@ class AgentBuilder:
                     sub_agents=sub_agents,
                     description=root_agent.config.get("description", ""),
                 ),
-                None,
+                exit_stack,
             )
         elif root_agent.type == "loop":
             logger.info(f"Creating LoopAgent with {len(sub_agents)} sub-agents")
@@ -430,7 +633,7 @@ class AgentBuilder:
                     description=root_agent.config.get("description", ""),
                     max_iterations=root_agent.config.get("max_iterations", 5),
                 ),
-                None,
+                exit_stack,
             )
         else:
             raise ValueError(f"Invalid agent type: {root_agent.type}")
@@ -456,3 +659,36 @@ class AgentBuilder:
             return await self.build_task_agent(root_agent)
         else:
             return await self.build_composite_agent(root_agent)
+
+    async def get_or_build_agent(
+        self, root_agent, enabled_tools: List[str] = []
+    ) -> Tuple[BaseAgent, Optional[AsyncExitStack]]:
+        """Return the cached agent tree for the root agent, building it on a miss."""
+        cached_agent = agent_cache.get(root_agent, enabled_tools)
+        if cached_agent is not None:
+            logger.info(f"Using cached agent tree for {root_agent.name}")
+            return cached_agent, None
+
+        self.dependencies = {str(root_agent.id)}
+        self.cacheable = True
+        self.time_sensitive = False
+
+        # Load the whole dependency tree up front, one query per level
+        self.agent_map = get_agent_graph(self.db, root_agent, known=self.agent_map)
+
+        built_agent, exit_stack = await self.build_agent(root_agent, enabled_tools)
+
+        if self.cacheable and exit_stack is None:
+            expires_at = None
+            if self.time_sensitive:
+                # Prompt carries the current minute; expire at the next one
+                expires_at = time.monotonic() + (60 - datetime.now().second)
+            agent_cache.put(
+                root_agent,
+                built_agent,
+                self.dependencies,
+                enabled_tools=enabled_tools,
+                expires_at=expires_at,
+            )
+
+        return built_agent, exit_stack
@@ -0,0 +1,211 @@
+"""
+┌──────────────────────────────────────────────────────────────────────────────┐
+│ @author: Davidson Gomes                                                      │
+│ @file: agent_cache.py                                                        │
+│ Developed by: Davidson Gomes                                                 │
+│ Creation date: October 17, 2026                                              │
+│ Contact: contato@evolution-api.com                                           │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @copyright © Evolution API 2025. All rights reserved.                        │
+│ Licensed under the Apache License, Version 2.0                               │
+│                                                                              │
+│ You may not use this file except in compliance with the License.             │
+│ You may obtain a copy of the License at                                      │
+│                                                                              │
+│    http://www.apache.org/licenses/LICENSE-2.0                                │
+│                                                                              │
+│ Unless required by applicable law or agreed to in writing, software          │
+│ distributed under the License is distributed on an "AS IS" BASIS,            │
+│ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.     │
+│ See the License for the specific language governing permissions and          │
+│ limitations under the License.                                               │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @important                                                                   │
+│ For any future changes to the code in this file, it is recommended to        │
+│ include, together with the modification, the information of the developer    │
+│ who changed it and the date of modification.                                 │
+└──────────────────────────────────────────────────────────────────────────────┘
+"""
+
+"""
+Process-wide cache of built ADK agent trees.
+
+Building an agent tree re-reads every agent row, decrypts provider API keys
+and instantiates every sub-agent, HTTP tool and LiteLlm model. The result only
+changes when one of the agents in the tree is edited, so the built tree is kept
+here, keyed by the root agent id and its configuration version, and dropped when
+any agent the tree depends on is updated or deleted.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from src.config.settings import settings
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+CacheKey = Tuple[str, str, Tuple[str, ...]]
+
+
+@dataclass
+class _CacheEntry:
+    """A built agent tree and the agents it was built from."""
+
+    agent: Any
+    dependencies: FrozenSet[str]
+    expires_at: float
+    created_at: float = field(default_factory=time.monotonic)
+
+
+class AgentCache:
+    """LRU cache with TTL for built agent trees."""
+
+    def __init__(self, max_size: int = 256, ttl: int = 300, enabled: bool = True):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.enabled = enabled
+        self._entries: "OrderedDict[CacheKey, _CacheEntry]" = OrderedDict()
+        # Reverse index: agent id -> keys of the cached trees that include it
+        self._dependents: Dict[str, Set[CacheKey]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(agent, enabled_tools: Optional[List[str]] = None) -> CacheKey:
+        """Build the cache key from the agent id and its configuration version."""
+        version = agent.updated_at or agent.created_at
+        return (
+            str(agent.id),
+            version.isoformat() if version else "",
+            tuple(sorted(enabled_tools or [])),
+        )
+
+    def get(self, agent, enabled_tools: Optional[List[str]] = None) -> Optional[Any]:
+        """Return the cached tree for the agent, or None on a miss."""
+        if not self.enabled:
+            return None
+
+        key = self.make_key(agent, enabled_tools)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            if entry.expires_at <= time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.agent
+
+    def put(
+        self,
+        agent,
+        built_agent: Any,
+        dependencies: Iterable[str],
+        enabled_tools: Optional[List[str]] = None,
+        expires_at: Optional[float] = None,
+    ) -> None:
+        """Store a built tree.
+
+        Args:
+            agent: Root agent row the tree was built from
+            built_agent: The built ADK agent
+            dependencies: Ids of every agent the tree was built from
+            enabled_tools: Tool filter used for the build
+            expires_at: Optional monotonic deadline earlier than the default TTL
+        """
+        if not self.enabled or self.max_size <= 0:
+            return
+
+        key = self.make_key(agent, enabled_tools)
+        deadline = time.monotonic() + self.ttl
+        if expires_at is not None:
+            deadline = min(deadline, expires_at)
+
+        deps = frozenset(str(dep) for dep in dependencies) | {key[0]}
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = _CacheEntry(
+                agent=built_agent, dependencies=deps, expires_at=deadline
+            )
+            for dep in deps:
+                self._dependents.setdefault(dep, set()).add(key)
+
+            while len(self._entries) > self.max_size:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def invalidate(self, agent_id) -> int:
+        """Drop every cached tree that includes the given agent.
+
+        Returns:
+            int: Number of entries removed
+        """
+        agent_id = str(agent_id)
+        with self._lock:
+            keys = list(self._dependents.get(agent_id, ()))
+            for key in keys:
+                self._remove(key)
+            self.invalidations += len(keys)
+
+        if keys:
+            logger.info(f"Agent cache: invalidated {len(keys)} entries for {agent_id}")
+        return len(keys)
+
+    def clear(self) -> None:
+        """Drop every cached tree."""
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._dependents.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the cache counters."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def _remove(self, key: CacheKey) -> None:
+        """Remove an entry and its reverse-index references. Caller holds the lock."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for dep in entry.dependencies:
+            keys = self._dependents.get(dep)
+            if keys is None:
+                continue
+            keys.discard(key)
+            if not keys:
+                del self._dependents[dep]
+
+
+agent_cache = AgentCache(
+    max_size=settings.AGENT_CACHE_MAX_SIZE,
+    ttl=settings.AGENT_CACHE_TTL,
+    enabled=settings.AGENT_CACHE_ENABLED,
+)
@@ -30,30 +30,104 @@
 from google.adk.runners import Runner
 from google.genai.types import Content, Part, Blob
 from google.adk.sessions import DatabaseSessionService
+from google.adk.sessions import Session as AdkSession
 from google.adk.memory import InMemoryMemoryService
-from google.adk.artifacts.in_memory_artifact_service import InMemoryArtifactService
+from google.adk.memory.base_memory_service import BaseMemoryService
+from google.adk.artifacts.base_artifact_service import BaseArtifactService
 from src.utils.logger import setup_logger
-from src.core.exceptions import AgentNotFoundError, InternalServerError
+from src.core.exceptions import (
+    AgentNotFoundError,
+    ArtifactQuotaExceededError,
+    InternalServerError,
+)
 from src.services.agent_service import get_agent
 from src.services.adk.agent_builder import AgentBuilder
+from src.services.session_compaction_service import session_compactor
+from src.services.session_service import (
+    get_session_events_since,
+    get_session_record,
+)
+from src.config.database import SessionLocal
 from sqlalchemy.orm import Session
 from typing import Optional, AsyncGenerator
 import asyncio
 import json
+import time
 from src.utils.otel import get_tracer
 from opentelemetry import trace
 import base64
 
 logger = setup_logger(__name__)
 
+# Background memory ingestions, kept referenced until they finish
+_memory_tasks: set = set()
+
+
+def _ingest_session_memory(
+    session_service: DatabaseSessionService,
+    memory_service: BaseMemoryService,
+    agent_id: str,
+    external_id: str,
+    session_id: str,
+    since: float,
+):
+    if isinstance(memory_service, InMemoryMemoryService):
+        # The in-memory service replaces the stored events of a session
+        session = session_service.get_session(
+            app_name=agent_id, user_id=external_id, session_id=session_id
+        )
+    else:
+        db = SessionLocal()
+        try:
+            events = get_session_events_since(db, session_id, since)
+        finally:
+            db.close()
+        session = AdkSession(
+            id=session_id, app_name=agent_id, user_id=external_id, events=events
+        )
+
+    if session and session.events:
+        memory_service.add_session_to_memory(session)
+
+
+def _memory_task_done(task: asyncio.Task):
+    _memory_tasks.discard(task)
+    if not task.cancelled() and task.exception():
+        logger.error(f"Error adding session to memory: {task.exception()}")
+
+
+def schedule_memory_ingestion(
+    session_service: DatabaseSessionService,
+    memory_service: BaseMemoryService,
+    agent_id: str,
+    external_id: str,
+    session_id: str,
+    run_started_at: float,
+):
+    """Add the events of the finished turn to memory in a background thread"""
+    task = asyncio.create_task(
+        asyncio.to_thread(
+            _ingest_session_memory,
+            session_service,
+            memory_service,
+            agent_id,
+            external_id,
+            session_id,
+            # Small margin for timestamp rounding; ingestion is idempotent
+            run_started_at - 0.001,
+        )
+    )
+    _memory_tasks.add(task)
+    task.add_done_callback(_memory_task_done)
+
 
 async def run_agent(
     agent_id: str,
     external_id: str,
     message: str,
     session_service: DatabaseSessionService,
-    artifacts_service: InMemoryArtifactService,
-    memory_service: InMemoryMemoryService,
+    artifacts_service: BaseArtifactService,
+    memory_service: BaseMemoryService,
     db: Session,
     session_id: Optional[str] = None,
     timeout: float = 60.0,
@@ -90,7 +164,9 @@ async def run_agent(
 
             # Using the AgentBuilder to create the agent
             agent_builder = AgentBuilder(db)
-            root_agent, exit_stack = await agent_builder.build_agent(get_root_agent)
+            root_agent, exit_stack = await agent_builder.get_or_build_agent(
+                get_root_agent
+            )
 
             logger.info("Configuring Runner")
             agent_runner = Runner(
@@ -105,11 +181,8 @@ async def run_agent(
                 session_id = adk_session_id
 
             logger.info(f"Searching session for external_id {external_id}")
-            session = session_service.get_session(
-                app_name=agent_id,
-                user_id=external_id,
-                session_id=adk_session_id,
-            )
+            # Only check that the session exists; the Runner loads its events
+            session = get_session_record(db, adk_session_id)
 
             if session is None:
                 logger.info(f"Creating new session for external_id {external_id}")
@@ -165,6 +238,9 @@ async def run_agent(
 
                         # Add the Part to the list of parts for the message content
                         file_parts.append(file_part)
+                    except ArtifactQuotaExceededError:
+                        # Oversized uploads are rejected, not silently dropped
+                        raise
                     except Exception as e:
                         logger.error(
                             f"Error processing file {file_data.filename}: {str(e)}"
@@ -181,6 +257,7 @@ async def run_agent(
             final_response_text = "No final response captured."
             message_history = []
 
+            run_started_at = time.time()
             try:
                 response_queue = asyncio.Queue()
                 execution_completed = asyncio.Event()
@@ -253,14 +330,16 @@ async def run_agent(
                     logger.error(f"Error waiting for response: {str(e)}")
                     final_response_text = f"Error processing response: {str(e)}"
 
-                # Add the session to memory after completion
-                completed_session = session_service.get_session(
-                    app_name=agent_id,
-                    user_id=external_id,
-                    session_id=adk_session_id,
+                # Feed only this turn's events to memory, off the request path
+                schedule_memory_ingestion(
+                    session_service,
+                    memory_service,
+                    agent_id,
+                    external_id,
+                    adk_session_id,
+                    run_started_at,
                 )
-
-                memory_service.add_session_to_memory(completed_session)
+                session_compactor.schedule(get_root_agent, adk_session_id)
 
                 # Cancel the processing task if it is still running
                 if not task.done():
@@ -281,7 +360,7 @@ async def run_agent(
                 "final_response": final_response_text,
                 "message_history": message_history,
             }
-        except AgentNotFoundError as e:
+        except (AgentNotFoundError, ArtifactQuotaExceededError) as e:
             logger.error(f"Error processing request: {str(e)}")
             raise e
         except Exception as e:
@@ -314,8 +393,8 @@ async def run_agent_stream(
     external_id: str,
     message: str,
     session_service: DatabaseSessionService,
-    artifacts_service: InMemoryArtifactService,
-    memory_service: InMemoryMemoryService,
+    artifacts_service: BaseArtifactService,
+    memory_service: BaseMemoryService,
     db: Session,
     session_id: Optional[str] = None,
     files: Optional[list] = None,
@@ -352,7 +431,9 @@ async def run_agent_stream(
 
                 # Using the AgentBuilder to create the agent
                 agent_builder = AgentBuilder(db)
-                root_agent, exit_stack = await agent_builder.build_agent(get_root_agent)
+                root_agent, exit_stack = await agent_builder.get_or_build_agent(
+                    get_root_agent
+                )
 
                 logger.info("Configuring Runner")
                 agent_runner = Runner(
@@ -367,11 +448,8 @@ async def run_agent_stream(
                     session_id = adk_session_id
 
                 logger.info(f"Searching session for external_id {external_id}")
-                session = session_service.get_session(
-                    app_name=agent_id,
-                    user_id=external_id,
-                    session_id=adk_session_id,
-                )
+                # Only check that the session exists; the Runner loads its events
+                session = get_session_record(db, adk_session_id)
 
                 if session is None:
                     logger.info(f"Creating new session for external_id {external_id}")
@@ -436,6 +514,9 @@ async def run_agent_stream(
 
                             # Add the Part to the list of parts for the message content
                             file_parts.append(file_part)
+                        except ArtifactQuotaExceededError:
+                            # Oversized uploads are rejected, not silently dropped
+                            raise
                         except Exception as e:
                             logger.error(
                                 f"Error processing file {file_data.filename}: {str(e)}"
@@ -450,6 +531,7 @@ async def run_agent_stream(
                 logger.info("Starting agent streaming execution")
 
                 try:
+                    run_started_at = time.time()
                     events_async = agent_runner.run_async(
                         user_id=external_id,
                         session_id=adk_session_id,
@@ -503,13 +585,16 @@ async def run_agent_stream(
                             logger.error(f"Error processing event: {e}")
                             continue
 
-                    completed_session = session_service.get_session(
-                        app_name=agent_id,
-                        user_id=external_id,
-                        session_id=adk_session_id,
+                    # Feed only this turn's events to memory, off the request path
+                    schedule_memory_ingestion(
+                        session_service,
+                        memory_service,
+                        agent_id,
+                        external_id,
+                        adk_session_id,
+                        run_started_at,
                     )
-
-                    memory_service.add_session_to_memory(completed_session)
+                    session_compactor.schedule(get_root_agent, adk_session_id)
                 except Exception as e:
                     logger.error(f"Error processing request: {str(e)}")
                     raise InternalServerError(str(e)) from e
@@ -523,6 +608,9 @@ async def run_agent_stream(
                             logger.error(f"Error closing MCP connection: {e}")
 
                 logger.info("Agent streaming execution completed successfully")
+            except ArtifactQuotaExceededError as e:
+                logger.error(f"Error processing request: {str(e)}")
+                raise
             except AgentNotFoundError as e:
                 logger.error(f"Error processing request: {str(e)}")
                 raise InternalServerError(str(e)) from e
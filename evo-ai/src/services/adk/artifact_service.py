@@ -0,0 +1,585 @@
+"""
+┌──────────────────────────────────────────────────────────────────────────────┐
+│ @author: Davidson Gomes                                                      │
+│ @file: artifact_service.py                                                   │
+│ Developed by: Davidson Gomes                                                 │
+│ Creation date: October 17, 2026                                              │
+│ Contact: contato@evolution-api.com                                           │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @copyright © Evolution API 2025. All rights reserved.                        │
+│ Licensed under the Apache License, Version 2.0                               │
+│                                                                              │
+│ You may not use this file except in compliance with the License.             │
+│ You may obtain a copy of the License at                                      │
+│                                                                              │
+│    http://www.apache.org/licenses/LICENSE-2.0                                │
+│                                                                              │
+│ Unless required by applicable law or agreed to in writing, software          │
+│ distributed under the License is distributed on an "AS IS" BASIS,            │
+│ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.     │
+│ See the License for the specific language governing permissions and          │
+│ limitations under the License.                                               │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @important                                                                   │
+│ For any future changes to the code in this file, it is recommended to        │
+│ include, together with the modification, the information of the developer    │
+│ who changed it and the date of modification.                                 │
+└──────────────────────────────────────────────────────────────────────────────┘
+"""
+
+"""
+Persistent, content-addressed artifact storage.
+
+Artifact versions are recorded in the artifact_versions table and point at
+blobs keyed by their SHA-256, so identical uploads are stored once. Blob
+bytes live in one of the pluggable stores below: a local directory, Postgres
+large objects, or any S3-compatible bucket (MinIO works for local setups).
+Uploads are checked against a per-artifact size limit and a per-session
+quota, versions expire after ARTIFACT_TTL, and a background janitor drops
+expired versions and unreferenced blobs. Reads can be streamed in chunks
+with open_artifact() instead of materializing the whole file.
+"""
+
+import asyncio
+import hashlib
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from google.adk.artifacts.base_artifact_service import BaseArtifactService
+from google.adk.artifacts.in_memory_artifact_service import InMemoryArtifactService
+from google.genai import types
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from src.config.database import SessionLocal, engine
+from src.config.settings import settings
+from src.core.exceptions import ArtifactQuotaExceededError
+from src.models.models import ArtifactBlob, ArtifactVersion
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Size of the chunks yielded by streamed reads
+CHUNK_SIZE = 64 * 1024
+
+# Session key of "user:" artifacts, which are shared by all sessions of a user
+USER_NAMESPACE = "user"
+
+# Unreferenced blobs younger than this are kept; a concurrent upload may reuse them
+ORPHAN_GRACE_PERIOD = timedelta(hours=1)
+
+
+class LocalDiskBlobStore:
+    """Blobs stored as files under a directory, sharded by hash prefix."""
+
+    name = "local"
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def _path(self, storage_key: str) -> str:
+        return os.path.join(self.root, storage_key[:2], storage_key[2:4], storage_key)
+
+    def put(self, sha256: str, data: bytes) -> str:
+        path = self._path(sha256)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+            try:
+                with os.fdopen(fd, "wb") as tmp_file:
+                    tmp_file.write(data)
+                os.replace(tmp_path, path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                raise
+        return sha256
+
+    def iter_chunks(self, storage_key: str) -> Iterator[bytes]:
+        with open(self._path(storage_key), "rb") as blob_file:
+            while chunk := blob_file.read(CHUNK_SIZE):
+                yield chunk
+
+    def delete(self, storage_key: str):
+        try:
+            os.unlink(self._path(storage_key))
+        except FileNotFoundError:
+            pass
+
+
+class PostgresBlobStore:
+    """Blobs stored as Postgres large objects; the storage key is the OID."""
+
+    name = "postgres"
+
+    def put(self, sha256: str, data: bytes) -> str:
+        connection = engine.raw_connection()
+        try:
+            large_object = connection.lobject(0, "wb")
+            for offset in range(0, len(data), CHUNK_SIZE):
+                large_object.write(data[offset : offset + CHUNK_SIZE])
+            oid = large_object.oid
+            large_object.close()
+            connection.commit()
+            return str(oid)
+        except BaseException:
+            connection.rollback()
+            raise
+        finally:
+            connection.close()
+
+    def iter_chunks(self, storage_key: str) -> Iterator[bytes]:
+        connection = engine.raw_connection()
+        try:
+            large_object = connection.lobject(int(storage_key), "rb")
+            while chunk := large_object.read(CHUNK_SIZE):
+                yield chunk
+            large_object.close()
+            connection.commit()
+        finally:
+            connection.close()
+
+    def delete(self, storage_key: str):
+        connection = engine.raw_connection()
+        try:
+            connection.lobject(int(storage_key), "rb").unlink()
+            connection.commit()
+        except Exception as e:
+            connection.rollback()
+            logger.warning(f"Could not unlink large object {storage_key}: {e}")
+        finally:
+            connection.close()
+
+
+class S3BlobStore:
+    """Blobs stored in an S3-compatible bucket (requires boto3)."""
+
+    name = "s3"
+
+    def __init__(
+        self,
+        bucket: str,
+        endpoint_url: Optional[str] = None,
+        access_key: Optional[str] = None,
+        secret_key: Optional[str] = None,
+        region: Optional[str] = None,
+    ):
+        try:
+            import boto3
+        except ImportError as e:
+            raise RuntimeError(
+                "ARTIFACT_BACKEND=s3 requires boto3 (pip install boto3)"
+            ) from e
+
+        self.bucket = bucket
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url,
+            aws_access_key_id=access_key,
+            aws_secret_access_key=secret_key,
+            region_name=region,
+        )
+
+    def put(self, sha256: str, data: bytes) -> str:
+        storage_key = f"artifacts/{sha256[:2]}/{sha256}"
+        self.client.put_object(Bucket=self.bucket, Key=storage_key, Body=data)
+        return storage_key
+
+    def iter_chunks(self, storage_key: str) -> Iterator[bytes]:
+        body = self.client.get_object(Bucket=self.bucket, Key=storage_key)["Body"]
+        try:
+            yield from body.iter_chunks(CHUNK_SIZE)
+        finally:
+            body.close()
+
+    def delete(self, storage_key: str):
+        self.client.delete_object(Bucket=self.bucket, Key=storage_key)
+
+
+class PersistentArtifactService(BaseArtifactService):
+    """ADK artifact service backed by artifact_versions and a blob store."""
+
+    def __init__(
+        self,
+        blob_store,
+        max_size: int,
+        session_quota: int,
+        ttl: int,
+        cleanup_interval: int,
+    ):
+        self.blob_store = blob_store
+        self.max_size = max_size
+        self.session_quota = session_quota
+        self.ttl = ttl
+        self.cleanup_interval = cleanup_interval
+        self._task: Optional[asyncio.Task] = None
+        self.saved = 0
+        self.deduplicated = 0
+        self.rejected = 0
+        self.expired_versions = 0
+        self.deleted_blobs = 0
+
+    @staticmethod
+    def _scope(session_id: str, filename: str) -> str:
+        return USER_NAMESPACE if filename.startswith("user:") else session_id
+
+    def _version_query(self, db, app_name, user_id, session_id, filename):
+        now = datetime.now(timezone.utc)
+        return db.query(ArtifactVersion).filter(
+            ArtifactVersion.app_name == app_name,
+            ArtifactVersion.user_id == user_id,
+            ArtifactVersion.session_id == self._scope(session_id, filename),
+            ArtifactVersion.filename == filename,
+            (ArtifactVersion.expires_at.is_(None))
+            | (ArtifactVersion.expires_at > now),
+        )
+
+    def save_artifact(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        filename: str,
+        artifact: types.Part,
+    ) -> int:
+        if artifact.inline_data is not None:
+            data = artifact.inline_data.data or b""
+            mime_type = artifact.inline_data.mime_type
+        elif artifact.text is not None:
+            data = artifact.text.encode("utf-8")
+            mime_type = "text/plain"
+        else:
+            raise ValueError("Artifact must carry inline data or text")
+
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        size = len(data)
+        if self.max_size and size > self.max_size:
+            self.rejected += 1
+            raise ArtifactQuotaExceededError(
+                f"Artifact {filename} exceeds the maximum size",
+                details={"size": size, "max_size": self.max_size},
+            )
+
+        scope = self._scope(session_id, filename)
+        sha256 = hashlib.sha256(data).hexdigest()
+        now = datetime.now(timezone.utc)
+
+        db = SessionLocal()
+        try:
+            if self.session_quota:
+                used = (
+                    db.query(func.coalesce(func.sum(ArtifactVersion.size), 0))
+                    .filter(
+                        ArtifactVersion.app_name == app_name,
+                        ArtifactVersion.user_id == user_id,
+                        ArtifactVersion.session_id == scope,
+                        # Expired versions no longer count, even before cleanup
+                        (ArtifactVersion.expires_at.is_(None))
+                        | (ArtifactVersion.expires_at > now),
+                    )
+                    .scalar()
+                )
+                if used + size > self.session_quota:
+                    self.rejected += 1
+                    raise ArtifactQuotaExceededError(
+                        "Artifact quota exceeded for this session",
+                        details={"used": used, "quota": self.session_quota},
+                    )
+
+            blob = db.get(ArtifactBlob, sha256)
+            if blob is None:
+                storage_key = self.blob_store.put(sha256, data)
+                db.add(ArtifactBlob(sha256=sha256, size=size, storage_key=storage_key))
+                try:
+                    db.commit()
+                except IntegrityError:
+                    # Another worker stored the same content first; reuse its blob
+                    db.rollback()
+                    winner = db.get(ArtifactBlob, sha256)
+                    if winner.storage_key != storage_key:
+                        self.blob_store.delete(storage_key)
+                    self.deduplicated += 1
+            else:
+                blob.last_referenced_at = now
+                db.commit()
+                self.deduplicated += 1
+
+            for attempt in range(3):
+                latest = (
+                    db.query(func.max(ArtifactVersion.version))
+                    .filter(
+                        ArtifactVersion.app_name == app_name,
+                        ArtifactVersion.user_id == user_id,
+                        ArtifactVersion.session_id == scope,
+                        ArtifactVersion.filename == filename,
+                    )
+                    .scalar()
+                )
+                version = 0 if latest is None else latest + 1
+                db.add(
+                    ArtifactVersion(
+                        app_name=app_name,
+                        user_id=user_id,
+                        session_id=scope,
+                        filename=filename,
+                        version=version,
+                        sha256=sha256,
+                        mime_type=mime_type,
+                        size=size,
+                        expires_at=(
+                            now + timedelta(seconds=self.ttl) if self.ttl else None
+                        ),
+                    )
+                )
+                try:
+                    db.commit()
+                    self.saved += 1
+                    return version
+                except IntegrityError:
+                    # A concurrent save took this version number
+                    db.rollback()
+                    if attempt == 2:
+                        raise
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.error(f"Error saving artifact {filename}: {str(e)}")
+            raise
+        finally:
+            db.close()
+
+    def _find_version(
+        self,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        filename: str,
+        version: Optional[int] = None,
+    ) -> Optional[Tuple[ArtifactVersion, ArtifactBlob]]:
+        db = SessionLocal()
+        try:
+            query = self._version_query(db, app_name, user_id, session_id, filename)
+            if version is not None:
+                query = query.filter(ArtifactVersion.version == version)
+            row = query.order_by(ArtifactVersion.version.desc()).first()
+            if row is None:
+                return None
+            return row, db.get(ArtifactBlob, row.sha256)
+        finally:
+            db.close()
+
+    def open_artifact(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        filename: str,
+        version: Optional[int] = None,
+    ) -> Optional[Tuple[Dict[str, Any], Iterator[bytes]]]:
+        """Return the metadata of an artifact and an iterator over its bytes"""
+        found = self._find_version(app_name, user_id, session_id, filename, version)
+        if found is None:
+            return None
+
+        row, blob = found
+        metadata = {
+            "filename": row.filename,
+            "version": row.version,
+            "mime_type": row.mime_type,
+            "size": row.size,
+            "sha256": row.sha256,
+        }
+        return metadata, self.blob_store.iter_chunks(blob.storage_key)
+
+    def load_artifact(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        filename: str,
+        version: Optional[int] = None,
+    ) -> Optional[types.Part]:
+        opened = self.open_artifact(
+            app_name=app_name,
+            user_id=user_id,
+            session_id=session_id,
+            filename=filename,
+            version=version,
+        )
+        if opened is None:
+            return None
+
+        metadata, chunks = opened
+        return types.Part(
+            inline_data=types.Blob(
+                mime_type=metadata["mime_type"], data=b"".join(chunks)
+            )
+        )
+
+    def list_artifact_keys(
+        self, *, app_name: str, user_id: str, session_id: str
+    ) -> List[str]:
+        now = datetime.now(timezone.utc)
+        db = SessionLocal()
+        try:
+            rows = (
+                db.query(ArtifactVersion.filename)
+                .filter(
+                    ArtifactVersion.app_name == app_name,
+                    ArtifactVersion.user_id == user_id,
+                    ArtifactVersion.session_id.in_([session_id, USER_NAMESPACE]),
+                    (ArtifactVersion.expires_at.is_(None))
+                    | (ArtifactVersion.expires_at > now),
+                )
+                .distinct()
+                .all()
+            )
+            return sorted(row.filename for row in rows)
+        finally:
+            db.close()
+
+    def delete_artifact(
+        self, *, app_name: str, user_id: str, session_id: str, filename: str
+    ) -> None:
+        db = SessionLocal()
+        try:
+            # Blobs are released by the janitor once nothing references them
+            db.query(ArtifactVersion).filter(
+                ArtifactVersion.app_name == app_name,
+                ArtifactVersion.user_id == user_id,
+                ArtifactVersion.session_id == self._scope(session_id, filename),
+                ArtifactVersion.filename == filename,
+            ).delete(synchronize_session=False)
+            db.commit()
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.error(f"Error deleting artifact {filename}: {str(e)}")
+            raise
+        finally:
+            db.close()
+
+    def list_versions(
+        self, *, app_name: str, user_id: str, session_id: str, filename: str
+    ) -> List[int]:
+        db = SessionLocal()
+        try:
+            rows = (
+                self._version_query(db, app_name, user_id, session_id, filename)
+                .with_entities(ArtifactVersion.version)
+                .order_by(ArtifactVersion.version)
+                .all()
+            )
+            return [row.version for row in rows]
+        finally:
+            db.close()
+
+    def purge(self) -> Tuple[int, int]:
+        """Delete expired versions and unreferenced blobs; return both counts"""
+        now = datetime.now(timezone.utc)
+        db = SessionLocal()
+        try:
+            expired = (
+                db.query(ArtifactVersion)
+                .filter(ArtifactVersion.expires_at <= now)
+                .delete(synchronize_session=False)
+            )
+            db.commit()
+
+            referenced = db.query(ArtifactVersion.sha256).filter(
+                ArtifactVersion.sha256 == ArtifactBlob.sha256
+            )
+            orphans = (
+                db.query(ArtifactBlob)
+                .filter(
+                    ~referenced.exists(),
+                    ArtifactBlob.last_referenced_at < now - ORPHAN_GRACE_PERIOD,
+                )
+                .with_for_update(skip_locked=True)
+                .all()
+            )
+            for blob in orphans:
+                self.blob_store.delete(blob.storage_key)
+                db.delete(blob)
+            db.commit()
+
+            self.expired_versions += expired
+            self.deleted_blobs += len(orphans)
+            return expired, len(orphans)
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.error(f"Error purging artifacts: {str(e)}")
+            return 0, 0
+        finally:
+            db.close()
+
+    def start(self):
+        if self.cleanup_interval > 0 and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"Artifact janitor started ({self.blob_store.name} store)")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                expired, deleted = await asyncio.to_thread(self.purge)
+                if expired or deleted:
+                    logger.info(
+                        f"Artifact janitor removed {expired} versions and {deleted} blobs"
+                    )
+            except Exception as e:
+                logger.error(f"Artifact janitor error: {e}")
+            await asyncio.sleep(self.cleanup_interval)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self.blob_store.name,
+            "janitor_running": self._task is not None and not self._task.done(),
+            "saved": self.saved,
+            "deduplicated": self.deduplicated,
+            "rejected": self.rejected,
+            "expired_versions": self.expired_versions,
+            "deleted_blobs": self.deleted_blobs,
+        }
+
+
+def create_artifact_service() -> BaseArtifactService:
+    """Build the artifact service selected by ARTIFACT_BACKEND"""
+    backend = settings.ARTIFACT_BACKEND.lower()
+    if backend == "memory":
+        return InMemoryArtifactService()
+
+    if backend == "local":
+        blob_store = LocalDiskBlobStore(settings.ARTIFACT_LOCAL_PATH)
+    elif backend == "postgres":
+        blob_store = PostgresBlobStore()
+    elif backend == "s3":
+        blob_store = S3BlobStore(
+            bucket=settings.ARTIFACT_S3_BUCKET,
+            endpoint_url=settings.ARTIFACT_S3_ENDPOINT_URL,
+            access_key=settings.ARTIFACT_S3_ACCESS_KEY,
+            secret_key=settings.ARTIFACT_S3_SECRET_KEY,
+            region=settings.ARTIFACT_S3_REGION,
+        )
+    else:
+        raise ValueError(f"Unknown ARTIFACT_BACKEND: {settings.ARTIFACT_BACKEND}")
+
+    return PersistentArtifactService(
+        blob_store,
+        max_size=settings.ARTIFACT_MAX_SIZE,
+        session_quota=settings.ARTIFACT_SESSION_QUOTA,
+        ttl=settings.ARTIFACT_TTL,
+        cleanup_interval=settings.ARTIFACT_CLEANUP_INTERVAL,
+    )
@@ -42,6 +42,7 @@ from src.utils.a2a_enhanced_client import (
     A2AClientConfig,
     A2AImplementation,
     A2AResponse,
+    a2a_client_registry,
 )
 
 from uuid import uuid4
@@ -120,10 +121,11 @@ class A2ACustomAgent(BaseAgent):
         )
 
     async def fetch_agent_card(self) -> AgentCard:
-        """Fetch the agent card using the enhanced client."""
-        if self.agent_card:
-            return self.agent_card
+        """Fetch the agent card using the enhanced client.
 
+        Built agents are shared across concurrent runs by the agent cache, so the
+        card is not stored on the instance; the shared client caches it instead.
+        """
         print(f"Fetching agent card from: {self.agent_card_url}")
 
         try:
@@ -138,22 +140,21 @@ class A2ACustomAgent(BaseAgent):
                 timeout=self.timeout,
             )
 
-            async with EnhancedA2AClient(config) as client:
-                response = await client.get_agent_card(agent_id)
+            client = await a2a_client_registry.get_client(config)
+            response = await client.get_agent_card(agent_id)
 
-                if response.success:
-                    print(
-                        f"Agent card fetched using {response.implementation_used.value} implementation"
-                    )
-                    self.agent_card = AgentCard(**response.data)
-                    return self.agent_card
-                else:
-                    raise ValueError(f"Failed to fetch agent card: {response.error}")
+            if response.success:
+                print(
+                    f"Agent card fetched using {response.implementation_used.value} implementation"
+                )
+                return AgentCard(**response.data)
+            else:
+                raise ValueError(f"Failed to fetch agent card: {response.error}")
 
         except Exception as e:
             print(f"Error fetching agent card: {e}")
             # Fallback to basic agent card
-            self.agent_card = AgentCard(
+            return AgentCard(
                 name="A2A Agent",
                 description="External A2A Agent",
                 url=self.agent_card_url,
@@ -163,7 +164,6 @@ class A2ACustomAgent(BaseAgent):
                 defaultOutputModes=["text"],
                 skills=[],
             )
-            return self.agent_card
 
     def _extract_agent_id_from_url(self, url: str) -> str:
         """Extract agent ID from the agent card URL."""
@@ -245,27 +245,28 @@ class A2ACustomAgent(BaseAgent):
             print(f"Sending message to A2A agent {agent_id}: {user_message[:100]}...")
 
             # 4. Use enhanced client to communicate with the agent
-            async with EnhancedA2AClient(config) as client:
-                # Use session ID as a stable identifier
-                session_id = (
-                    str(ctx.session.id)
-                    if ctx.session and hasattr(ctx.session, "id")
-                    else str(uuid4())
-                )
+            client = await a2a_client_registry.get_client(config)
 
-                # Check if the agent supports streaming
-                supports_streaming = self._agent_supports_streaming(agent_card)
+            # Use session ID as a stable identifier
+            session_id = (
+                str(ctx.session.id)
+                if ctx.session and hasattr(ctx.session, "id")
+                else str(uuid4())
+            )
 
-                if supports_streaming:
-                    print("Agent supports streaming, using streaming API")
-                    await self._process_streaming_response(
-                        client, agent_id, user_message, session_id
-                    )
-                else:
-                    print("Agent does not support streaming, using regular API")
-                    await self._process_regular_response(
-                        client, agent_id, user_message, session_id
-                    )
+            # Check if the agent supports streaming
+            supports_streaming = self._agent_supports_streaming(agent_card)
+
+            if supports_streaming:
+                print("Agent supports streaming, using streaming API")
+                await self._process_streaming_response(
+                    client, agent_id, user_message, session_id
+                )
+            else:
+                print("Agent does not support streaming, using regular API")
+                await self._process_regular_response(
+                    client, agent_id, user_message, session_id
+                )
 
             # 5. Run sub-agents
             for sub_agent in self.sub_agents:
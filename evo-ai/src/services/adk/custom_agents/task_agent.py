@@ -36,7 +36,7 @@ from src.services.agent_service import get_agent
 
 from sqlalchemy.orm import Session
 
-from typing import AsyncGenerator, List
+from typing import Any, AsyncGenerator, Dict, List, Optional
 
 from src.schemas.agent_config import AgentTask
 
@@ -51,6 +51,7 @@ class TaskAgent(BaseAgent):
     # Field declarations for Pydantic
     tasks: List[AgentTask]
     db: Session
+    agent_map: Dict[str, Any] = {}
 
     def __init__(
         self,
@@ -58,6 +59,7 @@ class TaskAgent(BaseAgent):
         tasks: List[AgentTask],
         db: Session,
         sub_agents: List[BaseAgent] = [],
+        agent_map: Optional[Dict[str, Any]] = None,
         **kwargs,
     ):
         """
@@ -68,6 +70,7 @@ class TaskAgent(BaseAgent):
             tasks: List of tasks to be executed
             db: Database session
             sub_agents: List of sub-agents to be executed after the Task agent
+            agent_map: Agents prefetched by the builder, keyed by ID
         """
         # Initialize base class
         super().__init__(
@@ -75,6 +78,7 @@ class TaskAgent(BaseAgent):
             tasks=tasks,
             db=db,
             sub_agents=sub_agents,
+            agent_map=agent_map or {},
             **kwargs,
         )
 
@@ -133,7 +137,9 @@ class TaskAgent(BaseAgent):
                 task.description = task.description.replace("{content}", user_message)
                 task.enabled_tools = task.enabled_tools or []
 
-                agent = get_agent(self.db, task.agent_id)
+                agent = self.agent_map.get(str(task.agent_id)) or get_agent(
+                    self.db, task.agent_id
+                )
 
                 if not agent:
                     yield Event(
@@ -165,8 +171,8 @@ class TaskAgent(BaseAgent):
                 from src.services.adk.agent_builder import AgentBuilder
 
                 print(f"Building agent in Task agent: {agent.name}")
-                agent_builder = AgentBuilder(self.db)
-                root_agent, exit_stack = await agent_builder.build_agent(
+                agent_builder = AgentBuilder(self.db, agent_map=self.agent_map)
+                root_agent, exit_stack = await agent_builder.get_or_build_agent(
                     agent, task.enabled_tools
                 )
 
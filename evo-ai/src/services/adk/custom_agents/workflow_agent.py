@@ -36,25 +36,200 @@ from google.adk.agents.invocation_context import InvocationContext
 from google.adk.events import Event
 from google.genai.types import Content, Part
 
-from typing import AsyncGenerator, Dict, Any, List, TypedDict
+from collections import OrderedDict
+from typing import (
+    Annotated,
+    AsyncGenerator,
+    Dict,
+    Any,
+    List,
+    Optional,
+    Tuple,
+    TypedDict,
+)
+import asyncio
+import hashlib
+import json
 import uuid
 
 from src.services.agent_service import get_agent
+from src.services.adk.custom_agents.workflow_conditions import (
+    ConditionInput,
+    compile_conditions,
+)
+
+from src.config.settings import settings
 
 from sqlalchemy.orm import Session
 
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import StateGraph, END
+from langgraph.graph.state import CompiledStateGraph
+
+# Compiled graphs keyed by (agent id, flow hash); editing a flow changes its key
+_graph_cache: "OrderedDict[Tuple[str, str], CompiledStateGraph]" = OrderedDict()
+_graph_cache_stats = {"hits": 0, "misses": 0}
+
+
+def get_workflow_graph_cache_stats() -> Dict[str, Any]:
+    """Return hit/miss counters and size of the compiled workflow graph cache"""
+    return {
+        **_graph_cache_stats,
+        "size": len(_graph_cache),
+        "max_size": settings.WORKFLOW_GRAPH_CACHE_SIZE,
+    }
+
+
+def _event_key(event: Event) -> Any:
+    return getattr(event, "id", None) or id(event)
+
+
+def _merge_content(left: List[Event], right: List[Event]) -> List[Event]:
+    """Joins the content of parallel branches, keeping each event once"""
+    if not left:
+        return right
+    seen = {_event_key(event) for event in left}
+    return left + [event for event in right if _event_key(event) not in seen]
+
+
+def _merge_outputs(left: Dict[str, Any], right: Dict[str, Any]) -> Dict[str, Any]:
+    """Joins the node outputs of parallel branches"""
+    return {**(left or {}), **(right or {})}
+
+
+def _last_value(left: Any, right: Any) -> Any:
+    return right
+
+
+def _max_value(left: int, right: int) -> int:
+    return max(left or 0, right or 0)
+
+
+def _find_fan_in(edges: List[Dict[str, Any]], nodes: set) -> Dict[str, List[str]]:
+    """Finds the nodes that several fanned-out branches lead to.
+
+    Returns each join node with its predecessors on those branches. Branches
+    of uneven length reach a join in different steps, so the join is wired
+    with a barrier edge that waits for all of these predecessors.
+    """
+    handles: Dict[Tuple[str, str], List[str]] = {}
+    successors: Dict[str, set] = {}
+    predecessors: Dict[str, set] = {}
+    for edge in edges:
+        source, target = edge.get("source"), edge.get("target")
+        if source not in nodes or target not in nodes:
+            continue
+        targets = handles.setdefault((source, edge.get("sourceHandle", "default")), [])
+        if target not in targets:
+            targets.append(target)
+        successors.setdefault(source, set()).add(target)
+        predecessors.setdefault(target, set()).add(source)
+
+    fan_in: Dict[str, set] = {}
+    for (source, _), targets in handles.items():
+        if len(targets) < 2:
+            continue
+
+        # Nodes each branch reaches before coming back to the fan-out
+        reach = {}
+        for branch in targets:
+            seen, stack = set(), [branch]
+            while stack:
+                node = stack.pop()
+                if node in seen or node == source:
+                    continue
+                seen.add(node)
+                stack.extend(successors.get(node, ()))
+            reach[branch] = seen
+
+        for node in set().union(*reach.values()):
+            preds, branches = set(), set()
+            for pred in predecessors.get(node, ()):
+                if pred == source and node in targets:
+                    pred_branches = {node}
+                else:
+                    pred_branches = {b for b in targets if pred in reach[b]}
+                if pred_branches:
+                    preds.add(pred)
+                    branches |= pred_branches
+            if len(preds) > 1 and len(branches) > 1:
+                fan_in.setdefault(node, set()).update(preds)
+
+    return {node: sorted(preds) for node, preds in fan_in.items()}
+
+
+def _without_barrier_targets(router, targets: set):
+    """Drops from a node's route the joins it reaches through a barrier edge"""
+
+    def barrier_router(state: "State", config: RunnableConfig):
+        route = router(state, config)
+        if isinstance(route, list):
+            route = [node for node in route if node not in targets]
+            if not route:
+                return END
+            return route[0] if len(route) == 1 else route
+        return END if route in targets else route
+
+    return barrier_router
 
 
 class State(TypedDict):
-    content: List[Event]
-    status: str
-    session_id: str
+    # Parallel branches update the state in the same step, so every field has
+    # a reducer that joins their updates
+    content: Annotated[List[Event], _merge_content]
+    status: Annotated[str, _last_value]
+    session_id: Annotated[str, _last_value]
     # Additional fields to store any node outputs
-    node_outputs: Dict[str, Any]
+    node_outputs: Annotated[Dict[str, Any], _merge_outputs]
     # Cycle counter to prevent infinite loops
-    cycle_count: int
-    conversation_history: List[Event]
+    cycle_count: Annotated[int, _max_value]
+    conversation_history: Annotated[List[Event], _last_value]
+    # Node a resumed run starts from (set when a durable delay timer fires)
+    resume_node: Annotated[Optional[str], _last_value]
+
+
+def _dump_value(value: Any) -> Any:
+    """Converts state values into JSON-serializable data for a checkpoint"""
+    if isinstance(value, Event):
+        return {"__event__": value.model_dump(mode="json", exclude_none=True)}
+    if isinstance(value, dict):
+        return {key: _dump_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_dump_value(item) for item in value]
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+def _load_value(value: Any) -> Any:
+    """Restores state values dumped by _dump_value"""
+    if isinstance(value, dict):
+        if "__event__" in value:
+            return Event.model_validate(value["__event__"])
+        return {key: _load_value(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_load_value(item) for item in value]
+    return value
+
+
+def dump_checkpoint(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Serializes the resumable part of a workflow state"""
+    return {
+        "content": _dump_value(state.get("content", [])),
+        "node_outputs": _dump_value(state.get("node_outputs", {})),
+        "cycle_count": state.get("cycle_count", 0),
+        "session_id": state.get("session_id", ""),
+    }
+
+
+def load_checkpoint(checkpoint: Dict[str, Any]) -> Dict[str, Any]:
+    """Deserializes a checkpoint created by dump_checkpoint"""
+    return {
+        "content": _load_value(checkpoint.get("content", [])),
+        "node_outputs": _load_value(checkpoint.get("node_outputs", {})),
+        "cycle_count": checkpoint.get("cycle_count", 0),
+        "session_id": checkpoint.get("session_id", ""),
+    }
 
 
 class WorkflowAgent(BaseAgent):
@@ -69,6 +244,8 @@ class WorkflowAgent(BaseAgent):
     flow_json: Dict[str, Any]
     timeout: int
     db: Session
+    agent_id: Optional[str] = None
+    agent_map: Dict[str, Any] = {}
 
     def __init__(
         self,
@@ -77,6 +254,8 @@ class WorkflowAgent(BaseAgent):
         timeout: int = 300,
         sub_agents: List[BaseAgent] = [],
         db: Session = None,
+        agent_id: Optional[str] = None,
+        agent_map: Optional[Dict[str, Any]] = None,
         **kwargs,
     ):
         """
@@ -88,6 +267,8 @@ class WorkflowAgent(BaseAgent):
             timeout: Maximum execution time (seconds)
             sub_agents: List of sub-agents to be executed after the workflow agent
             db: Session
+            agent_id: ID of the agent, used to key the compiled graph cache
+            agent_map: Agents prefetched by the builder, keyed by ID
         """
         # Initialize base class
         super().__init__(
@@ -96,6 +277,8 @@ class WorkflowAgent(BaseAgent):
             timeout=timeout,
             sub_agents=sub_agents,
             db=db,
+            agent_id=agent_id,
+            agent_map=agent_map or {},
             **kwargs,
         )
 
@@ -103,14 +286,21 @@ class WorkflowAgent(BaseAgent):
             f"Workflow agent initialized with {len(flow_json.get('nodes', []))} nodes"
         )
 
-    async def _create_node_functions(self, ctx: InvocationContext):
-        """Creates functions for each type of node in the flow."""
+    @staticmethod
+    def _create_node_functions():
+        """Creates functions for each type of node in the flow.
+
+        Node functions receive the invocation context and the running workflow
+        agent as arguments, so compiled graphs can be shared between runs.
+        """
 
         # Function for the initial node
         async def start_node_function(
             state: State,
             node_id: str,
             node_data: Dict[str, Any],
+            ctx: InvocationContext,
+            workflow: "WorkflowAgent",
         ) -> AsyncGenerator[State, None]:
             print("\n🏁 INITIAL NODE")
 
@@ -154,7 +344,11 @@ class WorkflowAgent(BaseAgent):
 
         # Generic function for agent nodes
         async def agent_node_function(
-            state: State, node_id: str, node_data: Dict[str, Any]
+            state: State,
+            node_id: str,
+            node_data: Dict[str, Any],
+            ctx: InvocationContext,
+            workflow: "WorkflowAgent",
         ) -> AsyncGenerator[State, None]:
 
             agent_config = node_data.get("agent", {})
@@ -171,7 +365,9 @@ class WorkflowAgent(BaseAgent):
             # Get conversation history
             conversation_history = state.get("conversation_history", [])
 
-            agent = get_agent(self.db, agent_id)
+            agent = workflow.agent_map.get(str(agent_id)) or get_agent(
+                workflow.db, agent_id
+            )
 
             if not agent:
                 yield {
@@ -192,8 +388,8 @@ class WorkflowAgent(BaseAgent):
             # Import moved to inside the function to avoid circular import
             from src.services.adk.agent_builder import AgentBuilder
 
-            agent_builder = AgentBuilder(self.db)
-            root_agent, exit_stack = await agent_builder.build_agent(agent)
+            agent_builder = AgentBuilder(workflow.db, agent_map=workflow.agent_map)
+            root_agent, exit_stack = await agent_builder.get_or_build_agent(agent)
 
             new_content = []
             async for event in root_agent.run_async(ctx):
@@ -230,7 +426,11 @@ class WorkflowAgent(BaseAgent):
 
         # Function for condition nodes
         async def condition_node_function(
-            state: State, node_id: str, node_data: Dict[str, Any]
+            state: State,
+            node_id: str,
+            node_data: Dict[str, Any],
+            ctx: InvocationContext,
+            workflow: "WorkflowAgent",
         ) -> AsyncGenerator[State, None]:
             label = node_data.get("label", "No name condition")
             conditions = node_data.get("conditions", [])
@@ -263,10 +463,17 @@ class WorkflowAgent(BaseAgent):
 
             session_id = state.get("session_id", "")
 
+            # Conditions are compiled when the graph is built; field values are
+            # extracted once for all of them
+            compiled_conditions = node_data.get(
+                "compiled_conditions"
+            ) or compile_conditions(conditions)
+            condition_input = ConditionInput(evaluation_state)
+
             # Check all conditions
             conditions_met = []
             condition_details = []
-            for condition in conditions:
+            for condition, predicate in compiled_conditions:
                 condition_id = condition.get("id")
                 condition_data = condition.get("data", {})
                 field = condition_data.get("field")
@@ -274,9 +481,9 @@ class WorkflowAgent(BaseAgent):
                 expected_value = condition_data.get("value")
 
                 print(
-                    f"  Checking if {field} {operator} '{expected_value}' (current value: '{evaluation_state.get(field, '')}')"
+                    f"  Checking if {field} {operator} '{expected_value}' (current value: '{condition_input.value(field)[1][:100]}')"
                 )
-                if self._evaluate_condition(condition, evaluation_state):
+                if predicate(condition_input):
                     conditions_met.append(condition_id)
                     condition_details.append(
                         f"{field} {operator} '{expected_value}' ✅"
@@ -347,7 +554,11 @@ class WorkflowAgent(BaseAgent):
             }
             
         async def message_node_function(
-            state: State, node_id: str, node_data: Dict[str, Any]
+            state: State,
+            node_id: str,
+            node_data: Dict[str, Any],
+            ctx: InvocationContext,
+            workflow: "WorkflowAgent",
         ) -> AsyncGenerator[State, None]:
             message_data = node_data.get("message", {})
             message_type = message_data.get("type", "text")
@@ -382,7 +593,11 @@ class WorkflowAgent(BaseAgent):
             }
             
         async def delay_node_function(
-            state: State, node_id: str, node_data: Dict[str, Any]
+            state: State,
+            node_id: str,
+            node_data: Dict[str, Any],
+            ctx: InvocationContext,
+            workflow: "WorkflowAgent",
         ) -> AsyncGenerator[State, None]:
             delay_data = node_data.get("delay", {})
             delay_value = delay_data.get("value", 0)
@@ -402,18 +617,91 @@ class WorkflowAgent(BaseAgent):
             content = state.get("content", [])
             session_id = state.get("session_id", "")
             conversation_history = state.get("conversation_history", [])
+            node_outputs = state.get("node_outputs", {})
+
+            # Resumed by a durable timer: the delay has already elapsed
+            if state.get("resume_node") == node_id:
+                node_outputs.setdefault(node_id, {})
+                node_outputs[node_id]["delay_end_time"] = datetime.now().isoformat()
+                node_outputs[node_id]["delay_completed"] = True
+                yield {
+                    "content": content,
+                    "status": "delay_completed",
+                    "node_outputs": node_outputs,
+                    "cycle_count": state.get("cycle_count", 0),
+                    "conversation_history": conversation_history,
+                    "session_id": session_id,
+                    "resume_node": None,
+                }
+                return
 
             # Store node output information
-            node_outputs = state.get("node_outputs", {})
             node_outputs[node_id] = {
                 "delay_value": delay_value,
                 "delay_unit": delay_unit,
                 "delay_seconds": delay_seconds,
                 "delay_start_time": datetime.now().isoformat(),
             }
-            
+
+            # Import moved to inside the function to avoid circular import
+            from src.services.workflow_timer_service import (
+                get_delivery_task,
+                schedule_workflow_timer,
+            )
+
+            # Long delays are handed to a durable timer instead of holding the
+            # request open when the run has an A2A task to deliver the rest of
+            # the output to; the run stops here and resumes from this node
+            delivery_task_id = get_delivery_task()
+            if (
+                delay_seconds > settings.WORKFLOW_DELAY_INLINE_MAX
+                and workflow.agent_id
+                and delivery_task_id
+            ):
+
+                checkpoint = dump_checkpoint(
+                    {
+                        "content": content,
+                        "node_outputs": node_outputs,
+                        "cycle_count": state.get("cycle_count", 0),
+                        "session_id": session_id,
+                    }
+                )
+                timer = schedule_workflow_timer(
+                    workflow.db,
+                    agent_id=workflow.agent_id,
+                    app_name=ctx.session.app_name,
+                    user_id=ctx.session.user_id,
+                    session_id=ctx.session.id,
+                    node_id=node_id,
+                    checkpoint=checkpoint,
+                    delay_seconds=delay_seconds,
+                    delivery_task_id=delivery_task_id,
+                )
+                node_outputs[node_id]["timer_id"] = str(timer.id)
+                node_outputs[node_id]["fire_at"] = timer.fire_at.isoformat()
+
+                paused_event = Event(
+                    author=f"workflow-node:{node_id}",
+                    content=Content(
+                        parts=[
+                            Part(
+                                text=f"Workflow paused for {delay_value} {delay_unit}"
+                            )
+                        ]
+                    ),
+                )
+                yield {
+                    "content": content + [paused_event],
+                    "status": "delay_scheduled",
+                    "node_outputs": node_outputs,
+                    "cycle_count": state.get("cycle_count", 0),
+                    "conversation_history": conversation_history,
+                    "session_id": session_id,
+                }
+                return
+
             # Actually perform the delay
-            import asyncio
             await asyncio.sleep(delay_seconds)
             
             
@@ -437,171 +725,15 @@ class WorkflowAgent(BaseAgent):
             "delay-node": delay_node_function,
         }
 
-    def _evaluate_condition(self, condition: Dict[str, Any], state: State) -> bool:
-        """Evaluates a condition against the current state."""
-        condition_type = condition.get("type")
-        condition_data = condition.get("data", {})
-
-        if condition_type == "previous-output":
-            field, operator, expected_value, actual_value = (
-                self._extract_condition_values(condition_data, state)
-            )
-
-            if field == "content" and isinstance(actual_value, list) and actual_value:
-                actual_value = self._extract_text_from_events(actual_value)
-
-            result = self._process_condition(operator, actual_value, expected_value)
-
-            print(f"  Check '{operator}': {result}")
-            return result
-
-        return False
-
-    def _process_condition(self, operator, actual_value, expected_value):
-        """Converts values to strings and processes the condition using the appropriate operator."""
-        actual_str = str(actual_value) if actual_value is not None else ""
-        expected_str = str(expected_value) if expected_value is not None else ""
-
-        return self._process_operator(operator, actual_value, actual_str, expected_str)
-
-    def _extract_condition_values(self, condition_data, state):
-        """Extracts field, operator, expected value and actual value from condition data."""
-        field = condition_data.get("field")
-        operator = condition_data.get("operator")
-        expected_value = condition_data.get("value")
-        actual_value = state.get(field, "")
-
-        return field, operator, expected_value, actual_value
-
-    def _extract_text_from_events(self, events):
-        """Extracts text content from a list of events for comparison."""
-        extracted_texts = []
-        for event in events:
-            if hasattr(event, "content") and hasattr(event.content, "parts"):
-                extracted_texts.extend(
-                    [
-                        part.text
-                        for part in event.content.parts
-                        if hasattr(part, "text") and part.text
-                    ]
-                )
-
-        if extracted_texts:
-            joined_text = " ".join(extracted_texts)
-            print(f"  Extracted text from events: '{joined_text[:100]}...'")
-            return joined_text
-
-        return ""
-
-    def _process_operator(self, operator, actual_value, actual_str, expected_str):
-        """Process the operator and return the result of the comparison."""
-        # Definition checks
-        if operator in ["is_defined", "is_not_defined"]:
-            return self._check_definition(operator, actual_value)
-
-        # Equality checks
-        elif operator in ["equals", "not_equals"]:
-            return self._check_equality(operator, actual_str, expected_str)
-
-        # Content checks
-        elif operator in ["contains", "not_contains"]:
-            return self._case_insensitive_comparison(expected_str, actual_str, operator)
-
-        # String pattern checks
-        elif operator in ["starts_with", "ends_with"]:
-            return self._check_string_pattern(operator, actual_str, expected_str)
-
-        # Numeric checks
-        elif operator in [
-            "greater_than",
-            "greater_than_or_equal",
-            "less_than",
-            "less_than_or_equal",
-        ]:
-            return self._check_numeric(operator, actual_str, expected_str)
-
-        # Regex checks
-        elif operator in ["matches", "not_matches"]:
-            return self._check_regex(operator, actual_str, expected_str)
-
-        return False
-
-    def _check_definition(self, operator, actual_value):
-        """Check if a value is defined or not."""
-        if operator == "is_defined":
-            return actual_value is not None and actual_value != ""
-        else:  # is_not_defined
-            return actual_value is None or actual_value == ""
-
-    def _check_equality(self, operator, actual_str, expected_str):
-        """Check if two strings are equal or not."""
-        return (
-            (actual_str == expected_str)
-            if operator == "equals"
-            else (actual_str != expected_str)
-        )
-
-    def _check_string_pattern(self, operator, actual_str, expected_str):
-        """Check if a string starts or ends with another string."""
-        if operator == "starts_with":
-            return actual_str.lower().startswith(expected_str.lower())
-        else:  # ends_with
-            return actual_str.lower().endswith(expected_str.lower())
-
-    def _check_numeric(self, operator, actual_str, expected_str):
-        """Compare numeric values."""
-        try:
-            actual_num = float(actual_str) if actual_str else 0
-            expected_num = float(expected_str) if expected_str else 0
-
-            if operator == "greater_than":
-                return actual_num > expected_num
-            elif operator == "greater_than_or_equal":
-                return actual_num >= expected_num
-            elif operator == "less_than":
-                return actual_num < expected_num
-            else:  # less_than_or_equal
-                return actual_num <= expected_num
-        except (ValueError, TypeError):
-            print(
-                f"  Error converting values for numeric comparison: '{actual_str[:100]}...' and '{expected_str}'"
-            )
-            return False
-
-    def _check_regex(self, operator, actual_str, expected_str):
-        """Check if a string matches a regex pattern."""
-        import re
-
-        try:
-            pattern = re.compile(expected_str, re.IGNORECASE)
-            if operator == "matches":
-                return bool(pattern.search(actual_str))
-            else:  # not_matches
-                return not bool(pattern.search(actual_str))
-        except re.error:
-            print(f"  Error in regular expression: '{expected_str}'")
-            return (
-                operator == "not_matches"
-            )  # Return True for not_matches, False for matches
-
-    def _case_insensitive_comparison(self, expected_str, actual_str, operator):
-        """Performs case-insensitive string comparison based on the specified operator."""
-        expected_lower = expected_str.lower()
-        actual_lower = actual_str.lower()
-
-        print(
-            f"  Comparison '{operator}' without case distinction: '{expected_lower}' in '{actual_lower[:100]}...'"
-        )
-
-        if operator == "contains":
-            return expected_lower in actual_lower
-        elif operator == "not_contains":
-            return expected_lower not in actual_lower
-
-        return False
+    @staticmethod
+    def _create_flow_router(flow_data: Dict[str, Any]):
+        """Creates a router based on the connections in flow.json.
 
-    def _create_flow_router(self, flow_data: Dict[str, Any]):
-        """Creates a router based on the connections in flow.json."""
+        A handle connected to several nodes fans out: the router returns all
+        of them and LangGraph runs those branches concurrently. A node the
+        branches lead to is joined by a barrier edge (see _find_fan_in), so it
+        runs once with their combined output; every branch must reach it.
+        """
         # Map connections to understand how nodes are connected
         edges_map = {}
 
@@ -613,8 +745,14 @@ class WorkflowAgent(BaseAgent):
             if source not in edges_map:
                 edges_map[source] = {}
 
-            # Store the destination for each specific handle
-            edges_map[source][source_handle] = target
+            # Store the destinations for each specific handle
+            targets = edges_map[source].setdefault(source_handle, [])
+            if target not in targets:
+                targets.append(target)
+
+        def destinations(targets: List[str]):
+            # A single target keeps the plain sequential route
+            return targets[0] if len(targets) == 1 else list(targets)
 
         # Map condition nodes and their conditions
         condition_nodes = {}
@@ -622,13 +760,18 @@ class WorkflowAgent(BaseAgent):
             if node.get("type") == "condition-node":
                 node_id = node.get("id")
                 conditions = node.get("data", {}).get("conditions", [])
-                condition_nodes[node_id] = conditions
+                condition_nodes[node_id] = compile_conditions(conditions)
 
         # Routing function for each specific node
         def create_router_for_node(node_id: str):
-            def router(state: State) -> str:
+            def router(state: State, config: RunnableConfig) -> str:
                 print(f"Routing from node: {node_id}")
 
+                # A delay handed to a durable timer ends this run
+                if state.get("status") == "delay_scheduled":
+                    print(f"Delay scheduled at node {node_id}. Pausing the flow.")
+                    return END
+
                 # Check if the cycle limit has been reached
                 cycle_count = state.get("cycle_count", 0)
                 if cycle_count >= 10:
@@ -655,37 +798,34 @@ class WorkflowAgent(BaseAgent):
                                 node_id in edges_map
                                 and condition_id in edges_map[node_id]
                             ):
-                                return edges_map[node_id][condition_id]
+                                return destinations(edges_map[node_id][condition_id])
                         else:
                             print(
                                 "Using stored condition evaluation result: No conditions met."
                             )
                     else:
-                        for condition in conditions:
-                            condition_id = condition.get("id")
-
-                            # Get latest event for evaluation, ignoring condition node informational events
-                            content = state.get("content", [])
+                        # Get latest event for evaluation, ignoring condition node informational events
+                        content = state.get("content", [])
+
+                        # Filter out events generated by condition nodes or informational messages
+                        filtered_content = []
+                        for event in content:
+                            # Ignore events from condition nodes or that contain evaluation results
+                            if not hasattr(event, "author") or not (
+                                event.author.startswith("Condition")
+                                or "Condition evaluated:" in str(event)
+                            ):
+                                filtered_content.append(event)
 
-                            # Filter out events generated by condition nodes or informational messages
-                            filtered_content = []
-                            for event in content:
-                                # Ignore events from condition nodes or that contain evaluation results
-                                if not hasattr(event, "author") or not (
-                                    event.author.startswith("Condition")
-                                    or "Condition evaluated:" in str(event)
-                                ):
-                                    filtered_content.append(event)
+                        evaluation_state = state.copy()
+                        evaluation_state["content"] = filtered_content
+                        condition_input = ConditionInput(evaluation_state)
 
-                            evaluation_state = state.copy()
-                            evaluation_state["content"] = filtered_content
+                        for condition, predicate in conditions:
+                            condition_id = condition.get("id")
 
                             # Check if the condition is met
-                            is_condition_met = self._evaluate_condition(
-                                condition, evaluation_state
-                            )
-
-                            if is_condition_met:
+                            if predicate(condition_input):
                                 any_condition_met = True
                                 print(
                                     f"Condition {condition_id} met. Moving to the next node."
@@ -696,7 +836,9 @@ class WorkflowAgent(BaseAgent):
                                     node_id in edges_map
                                     and condition_id in edges_map[node_id]
                                 ):
-                                    return edges_map[node_id][condition_id]
+                                    return destinations(
+                                        edges_map[node_id][condition_id]
+                                    )
                             else:
                                 print(
                                     f"Condition {condition_id} not met. Continuing evaluation or using default path."
@@ -711,7 +853,7 @@ class WorkflowAgent(BaseAgent):
                             print(
                                 "No condition met. Using default path (bottom-handle)."
                             )
-                            return edges_map[node_id]["bottom-handle"]
+                            return destinations(edges_map[node_id]["bottom-handle"])
                         else:
                             print(
                                 "No condition met and no default path. Closing the flow."
@@ -723,12 +865,12 @@ class WorkflowAgent(BaseAgent):
                     # Try to use the default handle or bottom-handle first
                     for handle in ["default", "bottom-handle"]:
                         if handle in edges_map[node_id]:
-                            return edges_map[node_id][handle]
+                            return destinations(edges_map[node_id][handle])
 
                     # If no specific handle is found, use the first available
                     if edges_map[node_id]:
                         first_handle = list(edges_map[node_id].keys())[0]
-                        return edges_map[node_id][first_handle]
+                        return destinations(edges_map[node_id][first_handle])
 
                 # If there is no output connection, close the flow
                 print(f"No output connection from node {node_id}. Closing the flow.")
@@ -738,10 +880,13 @@ class WorkflowAgent(BaseAgent):
 
         return create_router_for_node
 
-    async def _create_graph(
-        self, ctx: InvocationContext, flow_data: Dict[str, Any]
-    ) -> StateGraph:
-        """Creates a StateGraph from the flow data."""
+    @classmethod
+    def _create_graph(cls, flow_data: Dict[str, Any]) -> CompiledStateGraph:
+        """Creates a compiled StateGraph from the flow data.
+
+        The graph holds no per-invocation state: the invocation context and
+        the running agent are passed through the run config.
+        """
         # Extract nodes from the flow
         nodes = flow_data.get("nodes", [])
 
@@ -749,7 +894,7 @@ class WorkflowAgent(BaseAgent):
         graph_builder = StateGraph(State)
 
         # Create functions for each node type
-        node_functions = await self._create_node_functions(ctx)
+        node_functions = cls._create_node_functions()
 
         # Dictionary to store specific functions for each node
         node_specific_functions = {}
@@ -760,14 +905,24 @@ class WorkflowAgent(BaseAgent):
             node_type = node.get("type")
             node_data = node.get("data", {})
 
+            if node_type == "condition-node":
+                # Compile the conditions once for every run of this graph
+                node_data = {
+                    **node_data,
+                    "compiled_conditions": compile_conditions(
+                        node_data.get("conditions", [])
+                    ),
+                }
+
             if node_type in node_functions:
                 # Create a specific function for this node
                 def create_node_function(node_type, node_id, node_data):
-                    async def node_function(state):
+                    async def node_function(state, config: RunnableConfig):
+                        run = config["configurable"]
                         # Consume the asynchronous generator and return the last result
                         result = None
                         async for item in node_functions[node_type](
-                            state, node_id, node_data
+                            state, node_id, node_data, run["ctx"], run["workflow_agent"]
                         ):
                             result = item
                         return result
@@ -784,7 +939,15 @@ class WorkflowAgent(BaseAgent):
                 graph_builder.add_node(node_id, node_specific_functions[node_id])
 
         # Create function to generate specific routers
-        create_router = self._create_flow_router(flow_data)
+        create_router = cls._create_flow_router(flow_data)
+
+        # Joins of fanned-out branches run once, after all of their branches
+        fan_in = _find_fan_in(
+            flow_data.get("edges", []), set(node_specific_functions)
+        )
+        for join, preds in fan_in.items():
+            print(f"Adding join for node {join} after {preds}")
+            graph_builder.add_edge(preds, join)
 
         # Add conditional connections for each node
         for node in nodes:
@@ -804,8 +967,14 @@ class WorkflowAgent(BaseAgent):
                 # Add END as a possible destination
                 edge_destinations[END] = END
 
-                # Create specific router for this node
+                # Create specific router for this node; joins it feeds are
+                # reached through their barrier edge instead
                 node_router = create_router(node_id)
+                barrier_targets = {
+                    join for join, preds in fan_in.items() if node_id in preds
+                }
+                if barrier_targets:
+                    node_router = _without_barrier_targets(node_router, barrier_targets)
 
                 # Add conditional connections
                 print(f"Adding conditional connections for node {node_id}")
@@ -826,14 +995,44 @@ class WorkflowAgent(BaseAgent):
         if not entry_point and nodes:
             entry_point = nodes[0].get("id")
 
-        # Define the entry point
+        # Define the entry point; resumed runs start at the node they paused on
         if entry_point:
             print(f"Defining entry point: {entry_point}")
-            graph_builder.set_entry_point(entry_point)
+
+            def entry_router(state: State) -> str:
+                resume_node = state.get("resume_node")
+                if resume_node in node_specific_functions:
+                    return resume_node
+                return entry_point
+
+            graph_builder.set_conditional_entry_point(
+                entry_router,
+                {node_id: node_id for node_id in node_specific_functions},
+            )
 
         # Compile the graph
         return graph_builder.compile()
 
+    def _get_compiled_graph(self) -> CompiledStateGraph:
+        """Returns the compiled graph for this flow, compiling it on a cache miss."""
+        flow_hash = hashlib.sha256(
+            json.dumps(self.flow_json, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+        key = (self.agent_id or self.name, flow_hash)
+
+        graph = _graph_cache.get(key)
+        if graph is not None:
+            _graph_cache.move_to_end(key)
+            _graph_cache_stats["hits"] += 1
+            return graph
+
+        _graph_cache_stats["misses"] += 1
+        graph = self._create_graph(self.flow_json)
+        _graph_cache[key] = graph
+        while len(_graph_cache) > settings.WORKFLOW_GRAPH_CACHE_SIZE:
+            _graph_cache.popitem(last=False)
+        return graph
+
     async def _run_async_impl(
         self, ctx: InvocationContext
     ) -> AsyncGenerator[Event, None]:
@@ -841,7 +1040,7 @@ class WorkflowAgent(BaseAgent):
         try:
             user_message = await self._extract_user_message(ctx)
             session_id = self._get_session_id(ctx)
-            graph = await self._create_graph(ctx, self.flow_json)
+            graph = self._get_compiled_graph()
             initial_state = await self._prepare_initial_state(
                 ctx, user_message, session_id
             )
@@ -856,6 +1055,31 @@ class WorkflowAgent(BaseAgent):
         except Exception as e:
             yield await self._handle_workflow_error(e)
 
+    async def resume_async(
+        self, ctx: InvocationContext, node_id: str, checkpoint: Dict[str, Any]
+    ) -> AsyncGenerator[Event, None]:
+        """Resumes a workflow paused at a delay node from its checkpoint.
+
+        Unlike a normal run, errors are raised rather than turned into an error
+        event, so the timer scheduler can retry or fail the timer.
+        """
+        graph = self._get_compiled_graph()
+        restored = load_checkpoint(checkpoint)
+        initial_state = State(
+            content=restored["content"],
+            status="resumed",
+            session_id=restored["session_id"] or self._get_session_id(ctx),
+            cycle_count=restored["cycle_count"],
+            node_outputs=restored["node_outputs"],
+            conversation_history=ctx.session.events or [],
+            resume_node=node_id,
+        )
+
+        print(f"\n⏰ Resuming workflow from node {node_id}")
+
+        async for event in self._execute_workflow(ctx, graph, initial_state):
+            yield event
+
     async def _extract_user_message(self, ctx: InvocationContext) -> str:
         """Extracts the user message from context session events or state."""
         # Try to find message in session events
@@ -901,18 +1125,40 @@ class WorkflowAgent(BaseAgent):
         )
 
     async def _execute_workflow(
-        self, ctx: InvocationContext, graph: StateGraph, initial_state: State
+        self, ctx: InvocationContext, graph: CompiledStateGraph, initial_state: State
     ) -> AsyncGenerator[Event, None]:
         """Executes the workflow graph and yields events."""
-        sent_events = 0
+        # Events restored from a checkpoint were already delivered. Parallel
+        # branches each return their own view of the content, so sent events
+        # are tracked by id rather than by position
+        sent_events = {
+            _event_key(event) for event in initial_state.get("content", [])
+        }
+        paused = False
 
-        async for state in graph.astream(initial_state, {"recursion_limit": 100}):
+        run_config = {
+            "recursion_limit": 100,
+            # Cap on nodes LangGraph runs at once when a flow fans out
+            "max_concurrency": settings.WORKFLOW_MAX_PARALLEL_BRANCHES,
+            "configurable": {"ctx": ctx, "workflow_agent": self},
+        }
+        async for state in graph.astream(initial_state, run_config):
             for node_state in state.values():
-                content = node_state.get("content", [])
-                for event in content[sent_events:]:
+                if not node_state:
+                    continue
+                for event in node_state.get("content", []):
+                    key = _event_key(event)
+                    if key in sent_events:
+                        continue
+                    sent_events.add(key)
                     if event.author != "user":
                         yield event
-                sent_events = len(content)
+                if node_state.get("status") == "delay_scheduled":
+                    paused = True
+
+        # Sub-agents run once the workflow completes, not when it pauses
+        if paused:
+            return
 
         # Execute sub-agents if any
         for sub_agent in self.sub_agents:
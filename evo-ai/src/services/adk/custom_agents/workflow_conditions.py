@@ -0,0 +1,171 @@
+"""
+┌──────────────────────────────────────────────────────────────────────────────┐
+│ @author: Davidson Gomes                                                      │
+│ @file: workflow_conditions.py                                                │
+│ Developed by: Davidson Gomes                                                 │
+│ Creation date: October 17, 2026                                              │
+│ Contact: contato@evolution-api.com                                           │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @copyright © Evolution API 2025. All rights reserved.                        │
+│ Licensed under the Apache License, Version 2.0                               │
+│                                                                              │
+│ You may not use this file except in compliance with the License.             │
+│ You may obtain a copy of the License at                                      │
+│                                                                              │
+│    http://www.apache.org/licenses/LICENSE-2.0                                │
+│                                                                              │
+│ Unless required by applicable law or agreed to in writing, software          │
+│ distributed under the License is distributed on an "AS IS" BASIS,            │
+│ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.     │
+│ See the License for the specific language governing permissions and          │
+│ limitations under the License.                                               │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @important                                                                   │
+│ For any future changes to the code in this file, it is recommended to        │
+│ include, together with the modification, the information of the developer    │
+│ who changed it and the date of modification.                                 │
+└──────────────────────────────────────────────────────────────────────────────┘
+"""
+
+"""
+Compiled conditions for workflow condition nodes.
+
+Each condition of a flow is compiled once, when the workflow graph is built,
+into a predicate with its operator resolved, its regex compiled and its
+expected number parsed. Predicates read field values through a
+ConditionInput, which extracts and lowercases the text of a state once no
+matter how many conditions look at it.
+"""
+
+import re
+from typing import Any, Callable, Dict, List, Tuple
+
+
+class ConditionInput:
+    """Field values of one workflow state, computed once per field."""
+
+    def __init__(self, state: Dict[str, Any]):
+        self.state = state
+        self._values: Dict[str, Tuple[Any, str]] = {}
+        self._lowered: Dict[str, str] = {}
+
+    def value(self, field: str) -> Tuple[Any, str]:
+        """Returns the raw value of a field and its string form"""
+        if field not in self._values:
+            actual_value = self.state.get(field, "")
+            if field == "content" and isinstance(actual_value, list) and actual_value:
+                actual_value = extract_text_from_events(actual_value)
+            actual_str = str(actual_value) if actual_value is not None else ""
+            self._values[field] = (actual_value, actual_str)
+        return self._values[field]
+
+    def lowered(self, field: str) -> str:
+        """Returns the lowercased string form of a field"""
+        if field not in self._lowered:
+            self._lowered[field] = self.value(field)[1].lower()
+        return self._lowered[field]
+
+
+Predicate = Callable[[ConditionInput], bool]
+
+
+def extract_text_from_events(events: List[Any]) -> str:
+    """Extracts text content from a list of events for comparison."""
+    extracted_texts = []
+    for event in events:
+        if hasattr(event, "content") and hasattr(event.content, "parts"):
+            extracted_texts.extend(
+                [
+                    part.text
+                    for part in event.content.parts
+                    if hasattr(part, "text") and part.text
+                ]
+            )
+    return " ".join(extracted_texts)
+
+
+def _parse_number(value: str):
+    return float(value) if value else 0
+
+
+def compile_condition(condition: Dict[str, Any]) -> Predicate:
+    """Compiles a condition of a condition node into a predicate."""
+    if condition.get("type") != "previous-output":
+        return lambda data: False
+
+    condition_data = condition.get("data", {})
+    field = condition_data.get("field")
+    operator = condition_data.get("operator")
+    expected_value = condition_data.get("value")
+    expected_str = str(expected_value) if expected_value is not None else ""
+    expected_lower = expected_str.lower()
+
+    # Definition checks
+    if operator == "is_defined":
+        return lambda data: data.value(field)[0] not in (None, "")
+    if operator == "is_not_defined":
+        return lambda data: data.value(field)[0] in (None, "")
+
+    # Equality checks
+    if operator == "equals":
+        return lambda data: data.value(field)[1] == expected_str
+    if operator == "not_equals":
+        return lambda data: data.value(field)[1] != expected_str
+
+    # Content checks
+    if operator == "contains":
+        return lambda data: expected_lower in data.lowered(field)
+    if operator == "not_contains":
+        return lambda data: expected_lower not in data.lowered(field)
+
+    # String pattern checks
+    if operator == "starts_with":
+        return lambda data: data.lowered(field).startswith(expected_lower)
+    if operator == "ends_with":
+        return lambda data: data.lowered(field).endswith(expected_lower)
+
+    # Numeric checks
+    comparisons = {
+        "greater_than": lambda actual, expected: actual > expected,
+        "greater_than_or_equal": lambda actual, expected: actual >= expected,
+        "less_than": lambda actual, expected: actual < expected,
+        "less_than_or_equal": lambda actual, expected: actual <= expected,
+    }
+    if operator in comparisons:
+        try:
+            expected_num = _parse_number(expected_str)
+        except ValueError:
+            print(f"  Invalid number in condition: '{expected_str}'")
+            return lambda data: False
+        compare = comparisons[operator]
+
+        def numeric_predicate(data: ConditionInput) -> bool:
+            try:
+                actual_num = _parse_number(data.value(field)[1])
+            except ValueError:
+                return False
+            return compare(actual_num, expected_num)
+
+        return numeric_predicate
+
+    # Regex checks
+    if operator in ("matches", "not_matches"):
+        try:
+            pattern = re.compile(expected_str, re.IGNORECASE)
+        except re.error:
+            print(f"  Error in regular expression: '{expected_str}'")
+            # An invalid pattern never matches
+            result = operator == "not_matches"
+            return lambda data: result
+        if operator == "matches":
+            return lambda data: pattern.search(data.value(field)[1]) is not None
+        return lambda data: pattern.search(data.value(field)[1]) is None
+
+    return lambda data: False
+
+
+def compile_conditions(
+    conditions: List[Dict[str, Any]],
+) -> List[Tuple[Dict[str, Any], Predicate]]:
+    """Compiles the conditions of a node, keeping each next to its predicate."""
+    return [(condition, compile_condition(condition)) for condition in conditions]
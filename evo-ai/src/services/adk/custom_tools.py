@@ -27,15 +27,37 @@
 └──────────────────────────────────────────────────────────────────────────────┘
 """
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 from google.adk.tools import FunctionTool
-import requests
+import asyncio
+import httpx
 import json
 import urllib.parse
+from src.config.settings import settings
+from src.services.adk.tool_cache import HTTPToolCache, get_tool_cache
+from src.utils.http_client import get_http_client
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# In-flight limits shared by every build of the same tool in this worker
+_tool_semaphores: Dict[Tuple[str, str, str, int], asyncio.Semaphore] = {}
+
+
+def get_tool_semaphore(tool_config: Dict[str, Any]) -> asyncio.Semaphore:
+    """Return the semaphore limiting the in-flight requests of an HTTP tool."""
+    limit = tool_config.get("max_concurrency") or settings.HTTP_TOOL_MAX_CONCURRENCY
+    key = (
+        str(tool_config.get("id") or tool_config["name"]),
+        tool_config["method"].upper(),
+        tool_config["endpoint"],
+        limit,
+    )
+    semaphore = _tool_semaphores.get(key)
+    if semaphore is None:
+        semaphore = _tool_semaphores[key] = asyncio.Semaphore(limit)
+    return semaphore
+
 
 class CustomToolBuilder:
     def __init__(self):
@@ -56,7 +78,14 @@ class CustomToolBuilder:
         query_params = parameters.get("query_params") or {}
         body_params = parameters.get("body_params") or {}
 
-        def http_tool(**kwargs):
+        timeout = error_handling.get("timeout", 30)
+        # Limits in-flight requests of this tool across all concurrent runs
+        semaphore = get_tool_semaphore(tool_config)
+
+        # Opt-in response cache for idempotent endpoints
+        response_cache = get_tool_cache(tool_config)
+
+        async def http_tool(**kwargs):
             try:
                 # Combines default values with provided values
                 all_values = {**values, **kwargs}
@@ -107,27 +136,51 @@ class CustomToolBuilder:
                     ):
                         body_data[param] = value
 
-                # Makes the HTTP request
-                response = requests.request(
-                    method=method,
-                    url=url,
-                    headers=processed_headers,
-                    params=query_params_dict,
-                    json=body_data if body_data else None,
-                    timeout=error_handling.get("timeout", 30),
-                )
+                cache_key = None
+                if response_cache is not None:
+                    cache_key = HTTPToolCache.make_key(
+                        method,
+                        url,
+                        query_params_dict,
+                        body_data or None,
+                        processed_headers,
+                    )
+                    cached_response = await response_cache.get(cache_key)
+                    if cached_response is not None:
+                        return cached_response
+
+                # Makes the HTTP request on the shared pooled client
+                await asyncio.wait_for(semaphore.acquire(), timeout)
+                try:
+                    response = await get_http_client().request(
+                        method=method,
+                        url=url,
+                        headers=processed_headers,
+                        params=query_params_dict,
+                        json=body_data if body_data else None,
+                        timeout=timeout,
+                    )
+                finally:
+                    semaphore.release()
 
                 if response.status_code >= 400:
-                    raise requests.exceptions.HTTPError(
-                        f"Error in the request: {response.status_code} - {response.text}"
+                    raise httpx.HTTPStatusError(
+                        f"Error in the request: {response.status_code} - {response.text}",
+                        request=response.request,
+                        response=response,
                     )
 
                 # Try to parse the response as JSON, if it fails, return the text content
                 try:
-                    return json.dumps(response.json())
+                    result = json.dumps(response.json())
                 except ValueError:
                     # Response is not JSON, return the text content
-                    return json.dumps({"content": response.text})
+                    result = json.dumps({"content": response.text})
+
+                if response_cache is not None:
+                    await response_cache.set(cache_key, result)
+
+                return result
 
             except Exception as e:
                 logger.error(f"Error executing tool {name}: {str(e)}")
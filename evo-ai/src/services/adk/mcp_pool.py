@@ -0,0 +1,454 @@
+"""
+┌──────────────────────────────────────────────────────────────────────────────┐
+│ @author: Davidson Gomes                                                      │
+│ @file: mcp_pool.py                                                           │
+│ Developed by: Davidson Gomes                                                 │
+│ Creation date: October 17, 2026                                              │
+│ Contact: contato@evolution-api.com                                           │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @copyright © Evolution API 2025. All rights reserved.                        │
+│ Licensed under the Apache License, Version 2.0                               │
+│                                                                              │
+│ You may not use this file except in compliance with the License.             │
+│ You may obtain a copy of the License at                                      │
+│                                                                              │
+│    http://www.apache.org/licenses/LICENSE-2.0                                │
+│                                                                              │
+│ Unless required by applicable law or agreed to in writing, software          │
+│ distributed under the License is distributed on an "AS IS" BASIS,            │
+│ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.     │
+│ See the License for the specific language governing permissions and          │
+│ limitations under the License.                                               │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @important                                                                   │
+│ For any future changes to the code in this file, it is recommended to        │
+│ include, together with the modification, the information of the developer    │
+│ who changed it and the date of modification.                                 │
+└──────────────────────────────────────────────────────────────────────────────┘
+"""
+
+"""
+Long-lived pool of MCP server sessions shared across agent runs.
+
+Connecting to an MCP server means launching a stdio subprocess (often through
+npx) or opening an SSE stream, which takes seconds. Sessions are kept here,
+keyed by the server id and its resolved configuration, and agent runs borrow
+them per tool call through PooledMCPTool instead of reconnecting every turn.
+
+Each session is owned by a dedicated asyncio task that opens and closes the
+underlying MCP context, since the stdio/SSE clients must be exited from the
+task that entered them.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.mcp_tool.mcp_toolset import (
+    MCPToolset,
+    StdioServerParameters,
+    SseServerParams,
+)
+from google.adk.tools.tool_context import ToolContext
+
+from src.config.settings import settings
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class MCPPoolTimeoutError(Exception):
+    """Raised when no MCP session could be borrowed within the acquire timeout."""
+
+
+def build_connection_params(server_config: Dict[str, Any]):
+    """Build the ADK connection parameters for an MCP server configuration."""
+    if "url" in server_config:
+        # Remote server (SSE)
+        return SseServerParams(
+            url=server_config["url"], headers=server_config.get("headers", {})
+        )
+
+    # Local server (Stdio)
+    command = server_config.get("command", "npx")
+    args = server_config.get("args", [])
+
+    # Adds environment variables if specified
+    env = server_config.get("env", {})
+    if env:
+        for key, value in env.items():
+            os.environ[key] = value
+
+    return StdioServerParameters(command=command, args=args, env=env)
+
+
+class _PooledSession:
+    """A single MCP connection, opened and closed by its own task."""
+
+    def __init__(self, server_config: Dict[str, Any]):
+        self.server_config = server_config
+        self.tools: List[Any] = []
+        self.in_use = False
+        self.broken = False
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.last_checked = self.created_at
+        self._ready = asyncio.Event()
+        self._closing = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._error: Optional[BaseException] = None
+
+    @property
+    def alive(self) -> bool:
+        return (
+            self._task is not None
+            and not self._task.done()
+            and not self._closing.is_set()
+            and not self.broken
+        )
+
+    async def open(self, timeout: float) -> None:
+        self._task = asyncio.create_task(self._run())
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            await self.close()
+            raise
+        if self._error is not None:
+            raise self._error
+
+    async def _run(self) -> None:
+        try:
+            tools, exit_stack = await MCPToolset.from_server(
+                connection_params=build_connection_params(self.server_config)
+            )
+        except Exception as e:
+            self._error = e
+            self._ready.set()
+            return
+
+        try:
+            self.tools = tools
+            self._ready.set()
+            await self._closing.wait()
+        finally:
+            try:
+                await exit_stack.aclose()
+            except Exception as e:
+                logger.warning(f"Error closing MCP session: {e}")
+
+    def get_tool(self, name: str) -> Any:
+        for tool in self.tools:
+            if tool.name == name:
+                return tool
+        raise ValueError(f"Tool '{name}' is not exposed by the MCP server anymore")
+
+    async def ping(self, timeout: float) -> bool:
+        """Check the connection with an MCP ping when the session exposes one."""
+        if not self.alive:
+            return False
+        mcp_session = next(
+            (
+                getattr(tool, "mcp_session", None)
+                for tool in self.tools
+                if getattr(tool, "mcp_session", None) is not None
+            ),
+            None,
+        )
+        if mcp_session is None or not hasattr(mcp_session, "send_ping"):
+            return True
+        try:
+            await asyncio.wait_for(mcp_session.send_ping(), timeout)
+            self.last_checked = time.monotonic()
+            return True
+        except Exception as e:
+            logger.warning(f"MCP session health check failed: {e}")
+            return False
+
+    async def close(self) -> None:
+        self._closing.set()
+        if self._task is not None and not self._task.done():
+            done, _ = await asyncio.wait({self._task}, timeout=10)
+            if not done:
+                self._task.cancel()
+
+
+class _ServerPool:
+    """Sessions and discovered tools for one server configuration."""
+
+    def __init__(self, label: str, server_config: Dict[str, Any]):
+        self.label = label
+        self.server_config = server_config
+        self.sessions: List[_PooledSession] = []
+        self.condition = asyncio.Condition()
+        self.tools: Optional[List["PooledMCPTool"]] = None
+        self.last_used = time.monotonic()
+
+
+class MCPConnectionPool:
+    """Pool of MCP sessions keyed by server id and resolved configuration."""
+
+    def __init__(
+        self,
+        max_sessions_per_server: int = 4,
+        idle_timeout: int = 600,
+        health_check_interval: int = 30,
+        acquire_timeout: int = 30,
+        connect_timeout: int = 60,
+        enabled: bool = True,
+    ):
+        self.max_sessions_per_server = max_sessions_per_server
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.acquire_timeout = acquire_timeout
+        self.connect_timeout = connect_timeout
+        self.enabled = enabled
+        self._pools: Dict[str, _ServerPool] = {}
+        self._reaper_task: Optional[asyncio.Task] = None
+        self.connects = 0
+        self.reuses = 0
+        self.reconnects = 0
+        self.health_check_failures = 0
+        self.evictions = 0
+        self.acquire_timeouts = 0
+
+    @staticmethod
+    def make_key(server_id: Optional[Any], server_config: Dict[str, Any]) -> str:
+        """Key a server by its id and the configuration after env resolution."""
+        raw = json.dumps(
+            {"id": str(server_id) if server_id else None, "config": server_config},
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _get_pool(
+        self, key: str, server_config: Dict[str, Any], label: Optional[str] = None
+    ) -> _ServerPool:
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = _ServerPool(
+                label or server_config.get("url") or server_config.get("command", ""),
+                server_config,
+            )
+            self._pools[key] = pool
+        pool.last_used = time.monotonic()
+        return pool
+
+    async def get_tools(
+        self, key: str, server_config: Dict[str, Any], label: Optional[str] = None
+    ) -> List["PooledMCPTool"]:
+        """Return the server's tools, connecting once to discover them."""
+        pool = self._get_pool(key, server_config, label)
+        if pool.tools is None:
+            async with self.lease(key, server_config, label) as session:
+                pool.tools = [
+                    PooledMCPTool(self, key, server_config, tool, label)
+                    for tool in session.tools
+                ]
+        return pool.tools
+
+    @asynccontextmanager
+    async def lease(
+        self, key: str, server_config: Dict[str, Any], label: Optional[str] = None
+    ) -> AsyncIterator[_PooledSession]:
+        """Borrow a healthy session for the duration of the block."""
+        pool = self._get_pool(key, server_config, label)
+        session = await self._acquire(pool)
+        try:
+            yield session
+        finally:
+            await self._release(pool, session)
+
+    async def _acquire(self, pool: _ServerPool) -> _PooledSession:
+        self._ensure_reaper()
+        deadline = time.monotonic() + self.acquire_timeout
+
+        while True:
+            session = None
+            is_new = False
+            async with pool.condition:
+                for candidate in pool.sessions:
+                    if not candidate.in_use:
+                        candidate.in_use = True
+                        session = candidate
+                        break
+
+                if session is None:
+                    if len(pool.sessions) < self.max_sessions_per_server:
+                        # Reserve the slot before connecting outside the lock
+                        session = _PooledSession(pool.server_config)
+                        session.in_use = True
+                        pool.sessions.append(session)
+                        is_new = True
+                    else:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self.acquire_timeouts += 1
+                            raise MCPPoolTimeoutError(
+                                f"No MCP session available for {pool.label} "
+                                f"after {self.acquire_timeout}s"
+                            )
+                        try:
+                            await asyncio.wait_for(pool.condition.wait(), remaining)
+                        except asyncio.TimeoutError:
+                            pass
+                        continue
+
+            if is_new:
+                try:
+                    logger.info(f"Opening pooled MCP session: {pool.label}")
+                    await session.open(self.connect_timeout)
+                except BaseException:
+                    await self._discard(pool, session)
+                    raise
+                self.connects += 1
+                return session
+
+            if await self._is_healthy(session):
+                self.reuses += 1
+                return session
+
+            self.health_check_failures += 1
+            self.reconnects += 1
+            logger.warning(f"Reconnecting unhealthy MCP session: {pool.label}")
+            await self._discard(pool, session)
+
+    async def _is_healthy(self, session: _PooledSession) -> bool:
+        if not session.alive:
+            return False
+        if time.monotonic() - session.last_checked < self.health_check_interval:
+            return True
+        return await session.ping(timeout=min(self.health_check_interval, 10))
+
+    async def _release(self, pool: _ServerPool, session: _PooledSession) -> None:
+        session.last_used = time.monotonic()
+        if not session.alive:
+            await self._discard(pool, session)
+            return
+        async with pool.condition:
+            session.in_use = False
+            pool.condition.notify()
+
+    async def _discard(self, pool: _ServerPool, session: _PooledSession) -> None:
+        async with pool.condition:
+            if session in pool.sessions:
+                pool.sessions.remove(session)
+            pool.condition.notify()
+        await session.close()
+
+    def _ensure_reaper(self) -> None:
+        if self._reaper_task is None or self._reaper_task.done():
+            self._reaper_task = asyncio.create_task(self._reap_idle_sessions())
+
+    async def _reap_idle_sessions(self) -> None:
+        """Close sessions that have been idle longer than the idle timeout."""
+        interval = max(min(self.idle_timeout / 2, 60), 1)
+        while True:
+            await asyncio.sleep(interval)
+            now = time.monotonic()
+            for key, pool in list(self._pools.items()):
+                expired = []
+                async with pool.condition:
+                    for session in list(pool.sessions):
+                        if (
+                            not session.in_use
+                            and now - session.last_used > self.idle_timeout
+                        ):
+                            pool.sessions.remove(session)
+                            expired.append(session)
+                    if not pool.sessions and now - pool.last_used > self.idle_timeout:
+                        # Tools already handed out recreate the pool on demand
+                        self._pools.pop(key, None)
+
+                for session in expired:
+                    self.evictions += 1
+                    logger.info(f"Closing idle MCP session: {pool.label}")
+                    await session.close()
+
+    async def close(self) -> None:
+        """Close every pooled session (application shutdown)."""
+        if self._reaper_task is not None:
+            self._reaper_task.cancel()
+            self._reaper_task = None
+        pools = list(self._pools.values())
+        self._pools.clear()
+        for pool in pools:
+            for session in list(pool.sessions):
+                await session.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "max_sessions_per_server": self.max_sessions_per_server,
+            "idle_timeout": self.idle_timeout,
+            "connects": self.connects,
+            "reuses": self.reuses,
+            "reconnects": self.reconnects,
+            "health_check_failures": self.health_check_failures,
+            "evictions": self.evictions,
+            "acquire_timeouts": self.acquire_timeouts,
+            "servers": [
+                {
+                    "server": pool.label,
+                    "sessions": len(pool.sessions),
+                    "in_use": sum(1 for s in pool.sessions if s.in_use),
+                }
+                for pool in self._pools.values()
+            ],
+        }
+
+
+class PooledMCPTool(BaseTool):
+    """MCP tool that borrows a pooled session for each call."""
+
+    def __init__(
+        self,
+        pool: MCPConnectionPool,
+        key: str,
+        server_config: Dict[str, Any],
+        tool: Any,
+        label: Optional[str] = None,
+    ):
+        super().__init__(name=tool.name, description=tool.description)
+        self._pool = pool
+        self._key = key
+        self._server_config = server_config
+        self._template = tool
+        self._label = label
+
+    def _get_declaration(self):
+        return self._template._get_declaration()
+
+    async def run_async(self, *, args: Dict[str, Any], tool_context: ToolContext):
+        for attempt in range(2):
+            async with self._pool.lease(
+                self._key, self._server_config, self._label
+            ) as session:
+                tool = session.get_tool(self.name)
+                try:
+                    return await tool.run_async(args=args, tool_context=tool_context)
+                except Exception as e:
+                    # Retry once on a fresh session if the connection dropped
+                    if attempt > 0 or await session.ping(timeout=5):
+                        raise
+                    logger.warning(
+                        f"MCP session lost while calling {self.name}, reconnecting: {e}"
+                    )
+                    session.broken = True
+                    self._pool.reconnects += 1
+
+
+mcp_pool = MCPConnectionPool(
+    max_sessions_per_server=settings.MCP_POOL_MAX_SESSIONS_PER_SERVER,
+    idle_timeout=settings.MCP_POOL_IDLE_TIMEOUT,
+    health_check_interval=settings.MCP_POOL_HEALTH_CHECK_INTERVAL,
+    acquire_timeout=settings.MCP_POOL_ACQUIRE_TIMEOUT,
+    connect_timeout=settings.MCP_POOL_CONNECT_TIMEOUT,
+    enabled=settings.MCP_POOL_ENABLED,
+)
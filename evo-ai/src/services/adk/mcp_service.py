@@ -28,14 +28,10 @@
 """
 
 from typing import Any, Dict, List, Optional, Tuple
-from google.adk.tools.mcp_tool.mcp_toolset import (
-    MCPToolset,
-    StdioServerParameters,
-    SseServerParams,
-)
+from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset
 from contextlib import AsyncExitStack
-import os
 from src.utils.logger import setup_logger
+from src.services.adk.mcp_pool import build_connection_params, mcp_pool
 from src.services.mcp_server_service import get_mcp_server
 from sqlalchemy.orm import Session
 
@@ -46,32 +42,15 @@ class MCPService:
     def __init__(self):
         self.tools = []
         self.exit_stack = AsyncExitStack()
+        # Servers whose tools are missing from the last build
+        self.failed_servers = 0
 
     async def _connect_to_mcp_server(
         self, server_config: Dict[str, Any]
     ) -> Tuple[List[Any], Optional[AsyncExitStack]]:
         """Connect to a specific MCP server and return its tools."""
         try:
-            # Determines the type of server (local or remote)
-            if "url" in server_config:
-                # Remote server (SSE)
-                connection_params = SseServerParams(
-                    url=server_config["url"], headers=server_config.get("headers", {})
-                )
-            else:
-                # Local server (Stdio)
-                command = server_config.get("command", "npx")
-                args = server_config.get("args", [])
-
-                # Adds environment variables if specified
-                env = server_config.get("env", {})
-                if env:
-                    for key, value in env.items():
-                        os.environ[key] = value
-
-                connection_params = StdioServerParameters(
-                    command=command, args=args, env=env
-                )
+            connection_params = build_connection_params(server_config)
 
             tools, exit_stack = await MCPToolset.from_server(
                 connection_params=connection_params
@@ -118,10 +97,97 @@ class MCPService:
                 filtered_tools.append(tool)
         return filtered_tools
 
+    def _resolve_server_config(
+        self, mcp_server: Any, server: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Copies the server config_json replacing env@@ references with the agent envs."""
+        server_config = mcp_server.config_json.copy()
+
+        if "env" in server_config and server_config["env"] is not None:
+            server_config["env"] = dict(server_config["env"])
+            for key, value in server_config["env"].items():
+                if value and value.startswith("env@@"):
+                    env_key = value.replace("env@@", "")
+                    if server.get("envs") and env_key in server.get("envs", {}):
+                        server_config["env"][key] = server["envs"][env_key]
+                    else:
+                        logger.warning(
+                            f"Environment variable '{env_key}' not provided for the MCP server {mcp_server.name}"
+                        )
+
+        return server_config
+
+    async def _build_pooled_tools(
+        self, mcp_config: Dict[str, Any], db: Session
+    ) -> List[Any]:
+        """Builds the tools from the shared MCP connection pool."""
+        tools = []
+
+        for server in mcp_config.get("mcp_servers") or []:
+            try:
+                mcp_server = get_mcp_server(db, server["id"])
+                if not mcp_server:
+                    logger.warning(f"MCP Server not found: {server['id']}")
+                    continue
+
+                server_config = self._resolve_server_config(mcp_server, server)
+                key = mcp_pool.make_key(server["id"], server_config)
+                server_tools = await mcp_pool.get_tools(
+                    key, server_config, label=mcp_server.name
+                )
+
+                filtered_tools = self._filter_incompatible_tools(server_tools)
+                agent_tools = server.get("tools", [])
+                if agent_tools:
+                    filtered_tools = self._filter_tools_by_agent(
+                        filtered_tools, agent_tools
+                    )
+                tools.extend(filtered_tools)
+                logger.info(
+                    f"MCP Server {mcp_server.name} ready from pool. Added {len(filtered_tools)} tools."
+                )
+            except Exception as e:
+                self.failed_servers += 1
+                logger.error(
+                    f"Error connecting to MCP server {server.get('id', 'unknown')}: {e}"
+                )
+                continue
+
+        for server in mcp_config.get("custom_mcp_servers") or []:
+            if not server:
+                logger.warning("Empty server configuration found in custom_mcp_servers")
+                continue
+
+            try:
+                key = mcp_pool.make_key(None, server)
+                server_tools = await mcp_pool.get_tools(key, server)
+                tools.extend(server_tools)
+                logger.info(
+                    f"Custom MCP server ready from pool. Added {len(server_tools)} tools."
+                )
+            except Exception as e:
+                self.failed_servers += 1
+                logger.error(
+                    f"Error connecting to custom MCP server {server.get('url', 'unknown')}: {e}"
+                )
+                continue
+
+        logger.info(f"MCP Toolset created successfully. Total of {len(tools)} tools.")
+        return tools
+
     async def build_tools(
         self, mcp_config: Dict[str, Any], db: Session
-    ) -> Tuple[List[Any], AsyncExitStack]:
-        """Builds a list of tools from multiple MCP servers."""
+    ) -> Tuple[List[Any], Optional[AsyncExitStack]]:
+        """Builds a list of tools from multiple MCP servers.
+
+        With the connection pool enabled the tools borrow pooled sessions per
+        call and no exit stack is returned; otherwise every server is connected
+        for this run and the returned exit stack must be closed afterwards.
+        """
+        if mcp_pool.enabled:
+            self.tools = await self._build_pooled_tools(mcp_config, db)
+            return self.tools, None
+
         self.tools = []
         self.exit_stack = AsyncExitStack()
 
@@ -138,24 +204,9 @@ class MCPService:
                             continue
 
                         # Prepares the server configuration
-                        server_config = mcp_server.config_json.copy()
-
-                        # Replaces the environment variables in the config_json
-                        if "env" in server_config and server_config["env"] is not None:
-                            for key, value in server_config["env"].items():
-                                if value and value.startswith("env@@"):
-                                    env_key = value.replace("env@@", "")
-                                    if server.get("envs") and env_key in server.get(
-                                        "envs", {}
-                                    ):
-                                        server_config["env"][key] = server["envs"][
-                                            env_key
-                                        ]
-                                    else:
-                                        logger.warning(
-                                            f"Environment variable '{env_key}' not provided for the MCP server {mcp_server.name}"
-                                        )
-                                        continue
+                        server_config = self._resolve_server_config(
+                            mcp_server, server
+                        )
 
                         logger.info(f"Connecting to MCP server: {mcp_server.name}")
                         tools, exit_stack = await self._connect_to_mcp_server(
@@ -0,0 +1,319 @@
+"""
+┌──────────────────────────────────────────────────────────────────────────────┐
+│ @author: Davidson Gomes                                                      │
+│ @file: memory_service.py                                                     │
+│ Developed by: Davidson Gomes                                                 │
+│ Creation date: October 17, 2026                                              │
+│ Contact: contato@evolution-api.com                                           │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @copyright © Evolution API 2025. All rights reserved.                        │
+│ Licensed under the Apache License, Version 2.0                               │
+│                                                                              │
+│ You may not use this file except in compliance with the License.             │
+│ You may obtain a copy of the License at                                      │
+│                                                                              │
+│    http://www.apache.org/licenses/LICENSE-2.0                                │
+│                                                                              │
+│ Unless required by applicable law or agreed to in writing, software          │
+│ distributed under the License is distributed on an "AS IS" BASIS,            │
+│ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.     │
+│ See the License for the specific language governing permissions and          │
+│ limitations under the License.                                               │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @important                                                                   │
+│ For any future changes to the code in this file, it is recommended to        │
+│ include, together with the modification, the information of the developer    │
+│ who changed it and the date of modification.                                 │
+└──────────────────────────────────────────────────────────────────────────────┘
+"""
+
+"""
+Persistent memory service for the load_memory tool.
+
+Session events are stored in the memory_entries table, namespaced by agent
+(app_name) and user, so memory survives restarts and is shared by every
+worker. Ingestion is incremental: only events newer than the last one stored
+for the session are written. Searches use the GIN full-text index, or the
+pgvector HNSW index when MEMORY_EMBEDDING_MODEL is set and the embedding
+column exists, so top-k retrieval does not scan the whole namespace.
+Namespaces are trimmed to MEMORY_MAX_ENTRIES_PER_USER entries and entries
+older than MEMORY_RETENTION_DAYS are dropped on ingestion.
+"""
+
+import re
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from google.adk.events import Event
+from google.adk.memory import InMemoryMemoryService
+from google.adk.memory.base_memory_service import (
+    BaseMemoryService,
+    MemoryResult,
+    SearchMemoryResponse,
+)
+from google.adk.sessions import Session as SessionADK
+from google.genai import types
+from sqlalchemy import func, inspect, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.config.database import SessionLocal, engine
+from src.config.settings import settings
+from src.models.models import MemoryEntry
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Authors whose events are not worth remembering
+SKIPPED_AUTHORS = {"session_summary"}
+
+# Words of the query, OR-ed together for the full-text search
+WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def _event_text(event: Event) -> str:
+    if not event.content or not event.content.parts:
+        return ""
+    return " ".join(part.text.strip() for part in event.content.parts if part.text)
+
+
+class PostgresMemoryService(BaseMemoryService):
+    """Memory service backed by Postgres full-text and optional vector search."""
+
+    def __init__(
+        self,
+        search_limit: int,
+        max_entries_per_user: int,
+        retention_days: int,
+        embedding_model: Optional[str] = None,
+    ):
+        self.search_limit = search_limit
+        self.max_entries_per_user = max_entries_per_user
+        self.retention_days = retention_days
+        self.embedding_model = embedding_model or None
+        self._vector_enabled: Optional[bool] = None
+        self.ingested = 0
+        self.searches = 0
+        self.vector_searches = 0
+
+    @property
+    def vector_enabled(self) -> bool:
+        """Whether embeddings are configured and the embedding column exists"""
+        if self._vector_enabled is None:
+            columns = set()
+            if self.embedding_model:
+                columns = {
+                    column["name"]
+                    for column in inspect(engine).get_columns("memory_entries")
+                }
+            self._vector_enabled = "embedding" in columns
+            if self.embedding_model and not self._vector_enabled:
+                logger.warning(
+                    "MEMORY_EMBEDDING_MODEL is set but memory_entries has no embedding "
+                    "column (pgvector missing); using full-text search"
+                )
+        return self._vector_enabled
+
+    def _embed(self, texts: List[str]) -> List[List[float]]:
+        import litellm
+
+        response = litellm.embedding(model=self.embedding_model, input=texts)
+        return [item["embedding"] for item in response.data]
+
+    def add_session_to_memory(self, session: SessionADK):
+        if not session or not session.events:
+            return
+
+        db = SessionLocal()
+        try:
+            watermark = (
+                db.query(func.max(MemoryEntry.event_timestamp))
+                .filter(
+                    MemoryEntry.app_name == session.app_name,
+                    MemoryEntry.user_id == session.user_id,
+                    MemoryEntry.session_id == session.id,
+                )
+                .scalar()
+            )
+
+            rows = []
+            for event in session.events:
+                if event.author in SKIPPED_AUTHORS:
+                    continue
+                event_time = datetime.fromtimestamp(event.timestamp, tz=timezone.utc)
+                if watermark is not None and event_time <= watermark:
+                    continue
+                content = _event_text(event)
+                if content:
+                    rows.append(
+                        {
+                            "app_name": session.app_name,
+                            "user_id": session.user_id,
+                            "session_id": session.id,
+                            "event_id": event.id,
+                            "author": event.author,
+                            "content": content,
+                            "event_timestamp": event_time,
+                        }
+                    )
+            if not rows:
+                return
+
+            statement = (
+                insert(MemoryEntry)
+                .values(rows)
+                .on_conflict_do_nothing(constraint="uq_memory_entries_event")
+                .returning(MemoryEntry.id, MemoryEntry.content)
+            )
+            inserted = db.execute(statement).all()
+
+            if inserted and self.vector_enabled:
+                try:
+                    embeddings = self._embed([row.content for row in inserted])
+                    for row, embedding in zip(inserted, embeddings):
+                        db.execute(
+                            text(
+                                "UPDATE memory_entries SET embedding = CAST(:embedding AS vector) "
+                                "WHERE id = :id"
+                            ),
+                            {"embedding": str(embedding), "id": row.id},
+                        )
+                except Exception as e:
+                    logger.warning(f"Could not embed memory entries: {e}")
+
+            self._apply_retention(db, session.app_name, session.user_id)
+            db.commit()
+            self.ingested += len(inserted)
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.error(f"Error adding session {session.id} to memory: {str(e)}")
+        finally:
+            db.close()
+
+    def _apply_retention(self, db, app_name: str, user_id: str):
+        namespace = db.query(MemoryEntry).filter(
+            MemoryEntry.app_name == app_name, MemoryEntry.user_id == user_id
+        )
+        if self.retention_days:
+            cutoff = datetime.now(timezone.utc) - timedelta(days=self.retention_days)
+            namespace.filter(MemoryEntry.event_timestamp < cutoff).delete(
+                synchronize_session=False
+            )
+        if self.max_entries_per_user:
+            overflow = (
+                select(MemoryEntry.id)
+                .where(
+                    MemoryEntry.app_name == app_name, MemoryEntry.user_id == user_id
+                )
+                .order_by(MemoryEntry.event_timestamp.desc())
+                .offset(self.max_entries_per_user)
+            )
+            namespace.filter(MemoryEntry.id.in_(overflow)).delete(
+                synchronize_session=False
+            )
+
+    def search_memory(
+        self, *, app_name: str, user_id: str, query: str
+    ) -> SearchMemoryResponse:
+        self.searches += 1
+        db = SessionLocal()
+        try:
+            params: Dict[str, Any] = {
+                "app_name": app_name,
+                "user_id": user_id,
+                "limit": self.search_limit,
+            }
+            rows = []
+            if self.vector_enabled:
+                try:
+                    params["embedding"] = str(self._embed([query])[0])
+                    rows = db.execute(
+                        text(
+                            "SELECT session_id, event_id, author, content, event_timestamp "
+                            "FROM memory_entries "
+                            "WHERE app_name = :app_name AND user_id = :user_id "
+                            "AND embedding IS NOT NULL "
+                            "ORDER BY embedding <=> CAST(:embedding AS vector) "
+                            "LIMIT :limit"
+                        ),
+                        params,
+                    ).all()
+                    self.vector_searches += 1
+                except Exception as e:
+                    db.rollback()
+                    logger.warning(f"Vector memory search failed, using full-text: {e}")
+
+            if not rows:
+                words = WORD_PATTERN.findall(query.lower())
+                if not words:
+                    return SearchMemoryResponse(memories=[])
+                params["query"] = " | ".join(dict.fromkeys(words))
+                rows = db.execute(
+                    text(
+                        "SELECT session_id, event_id, author, content, event_timestamp "
+                        "FROM memory_entries, to_tsquery('simple', :query) AS q "
+                        "WHERE app_name = :app_name AND user_id = :user_id "
+                        "AND search_vector @@ q "
+                        "ORDER BY ts_rank(search_vector, q) DESC, event_timestamp DESC "
+                        "LIMIT :limit"
+                    ),
+                    params,
+                ).all()
+
+            # Group hits by session, keeping each session's events in order
+            by_session: "OrderedDict[str, List[Any]]" = OrderedDict()
+            for row in rows:
+                by_session.setdefault(row.session_id, []).append(row)
+
+            memories = []
+            for session_id, hits in by_session.items():
+                hits.sort(key=lambda row: row.event_timestamp)
+                memories.append(
+                    MemoryResult(
+                        session_id=session_id,
+                        events=[
+                            Event(
+                                id=row.event_id,
+                                author=row.author or "user",
+                                timestamp=row.event_timestamp.timestamp(),
+                                content=types.Content(
+                                    role="user" if row.author == "user" else "model",
+                                    parts=[types.Part(text=row.content)],
+                                ),
+                            )
+                            for row in hits
+                        ],
+                    )
+                )
+            return SearchMemoryResponse(memories=memories)
+        except SQLAlchemyError as e:
+            logger.error(f"Error searching memory of {app_name}/{user_id}: {str(e)}")
+            return SearchMemoryResponse(memories=[])
+        finally:
+            db.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "postgres",
+            "vector_search": bool(self._vector_enabled),
+            "ingested": self.ingested,
+            "searches": self.searches,
+            "vector_searches": self.vector_searches,
+        }
+
+
+def create_memory_service() -> BaseMemoryService:
+    """Build the memory service selected by MEMORY_BACKEND"""
+    backend = settings.MEMORY_BACKEND.lower()
+    if backend == "memory":
+        return InMemoryMemoryService()
+    if backend != "postgres":
+        raise ValueError(f"Unknown MEMORY_BACKEND: {settings.MEMORY_BACKEND}")
+
+    return PostgresMemoryService(
+        search_limit=settings.MEMORY_SEARCH_LIMIT,
+        max_entries_per_user=settings.MEMORY_MAX_ENTRIES_PER_USER,
+        retention_days=settings.MEMORY_RETENTION_DAYS,
+        embedding_model=settings.MEMORY_EMBEDDING_MODEL,
+    )
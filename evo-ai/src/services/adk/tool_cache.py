@@ -0,0 +1,190 @@
+"""
+┌──────────────────────────────────────────────────────────────────────────────┐
+│ @author: Davidson Gomes                                                      │
+│ @file: tool_cache.py                                                         │
+│ Developed by: Davidson Gomes                                                 │
+│ Creation date: October 17, 2026                                              │
+│ Contact: contato@evolution-api.com                                           │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @copyright © Evolution API 2025. All rights reserved.                        │
+│ Licensed under the Apache License, Version 2.0                               │
+│                                                                              │
+│ You may not use this file except in compliance with the License.             │
+│ You may obtain a copy of the License at                                      │
+│                                                                              │
+│    http://www.apache.org/licenses/LICENSE-2.0                                │
+│                                                                              │
+│ Unless required by applicable law or agreed to in writing, software          │
+│ distributed under the License is distributed on an "AS IS" BASIS,            │
+│ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.     │
+│ See the License for the specific language governing permissions and          │
+│ limitations under the License.                                               │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @important                                                                   │
+│ For any future changes to the code in this file, it is recommended to        │
+│ include, together with the modification, the information of the developer    │
+│ who changed it and the date of modification.                                 │
+└──────────────────────────────────────────────────────────────────────────────┘
+"""
+
+"""
+Opt-in response cache for idempotent HTTP tools.
+
+Tools that declare a `cache: {ttl, max_entries}` block keep successful
+responses in an in-process LRU keyed on method, URL, query, body and headers.
+When HTTP_TOOL_CACHE_REDIS is enabled, responses are also shared across
+workers through Redis.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from src.config.redis import get_redis_client, get_redis_config
+from src.config.settings import settings
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Caches shared by every build of the same tool in this worker
+_caches: "Dict[Tuple[str, str, str, int, int], HTTPToolCache]" = {}
+
+
+class HTTPToolCache:
+    """LRU cache with TTL for the responses of one HTTP tool."""
+
+    def __init__(self, tool_name: str, ttl: int, max_entries: int = 1000):
+        self.tool_name = tool_name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.use_redis = settings.HTTP_TOOL_CACHE_REDIS
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self.hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(
+        method: str,
+        url: str,
+        params: Dict[str, Any],
+        body: Optional[Dict[str, Any]],
+        headers: Dict[str, Any],
+    ) -> str:
+        # Headers are part of the key since they may carry per-user credentials
+        raw = json.dumps(
+            [method.upper(), url, params, body, headers], sort_keys=True, default=str
+        )
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _redis_key(self, key: str) -> str:
+        return f"{get_redis_config()['key_prefix']}tool_cache:{self.tool_name}:{key}"
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+
+        if self.use_redis:
+            value = await self._redis_get(key)
+            if value is not None:
+                self.redis_hits += 1
+                self._store_local(key, value)
+                return value
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: str) -> None:
+        self._store_local(key, value)
+        if self.use_redis:
+            await self._redis_set(key, value)
+
+    def _store_local(self, key: str, value: str) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def _redis_get(self, key: str) -> Optional[str]:
+        # Connecting may block, so the client is looked up off the event loop too
+        try:
+            return await asyncio.to_thread(self._redis_get_sync, key)
+        except Exception as e:
+            logger.warning(f"Redis read failed for tool cache {self.tool_name}: {e}")
+            return None
+
+    def _redis_get_sync(self, key: str) -> Optional[str]:
+        client = get_redis_client()
+        if client is None:
+            return None
+        return client.get(self._redis_key(key))
+
+    async def _redis_set(self, key: str, value: str) -> None:
+        try:
+            await asyncio.to_thread(self._redis_set_sync, key, value)
+        except Exception as e:
+            logger.warning(f"Redis write failed for tool cache {self.tool_name}: {e}")
+
+    def _redis_set_sync(self, key: str, value: str) -> None:
+        client = get_redis_client()
+        if client is not None:
+            client.set(self._redis_key(key), value, ex=self.ttl)
+
+
+def get_tool_cache(tool_config: Dict[str, Any]) -> Optional[HTTPToolCache]:
+    """Return the shared response cache of an HTTP tool, or None if it has none."""
+    cache_config = tool_config.get("cache") or {}
+    if not cache_config.get("ttl"):
+        return None
+
+    ttl = cache_config["ttl"]
+    max_entries = cache_config.get("max_entries", 1000)
+    key = (
+        str(tool_config.get("id") or tool_config["name"]),
+        tool_config["method"].upper(),
+        tool_config["endpoint"],
+        ttl,
+        max_entries,
+    )
+    cache = _caches.get(key)
+    if cache is None:
+        cache = _caches[key] = HTTPToolCache(
+            tool_config["name"], ttl=ttl, max_entries=max_entries
+        )
+    return cache
+
+
+def get_tool_cache_stats() -> Dict[str, Any]:
+    """Aggregate hit-rate metrics of the live tool caches, grouped by tool name."""
+    tools: Dict[str, Dict[str, int]] = {}
+    for cache in list(_caches.values()):
+        stats = tools.setdefault(
+            cache.tool_name,
+            {"size": 0, "hits": 0, "redis_hits": 0, "misses": 0, "evictions": 0},
+        )
+        stats["size"] += len(cache._entries)
+        stats["hits"] += cache.hits
+        stats["redis_hits"] += cache.redis_hits
+        stats["misses"] += cache.misses
+        stats["evictions"] += cache.evictions
+
+    for stats in tools.values():
+        lookups = stats["hits"] + stats["redis_hits"] + stats["misses"]
+        stats["hit_rate"] = (
+            round((stats["hits"] + stats["redis_hits"]) / lookups, 4)
+            if lookups
+            else 0.0
+        )
+
+    return {"redis_enabled": settings.HTTP_TOOL_CACHE_REDIS, "tools": tools}
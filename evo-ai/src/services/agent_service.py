@@ -27,6 +27,8 @@
 └──────────────────────────────────────────────────────────────────────────────┘
 """
 
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from fastapi import HTTPException, status
@@ -34,6 +36,7 @@ from src.models.models import Agent, AgentFolder, ApiKey
 from src.schemas.schemas import AgentCreate
 from typing import List, Optional, Dict, Any, Union
 from src.services.mcp_server_service import get_mcp_server
+from src.services.adk.agent_cache import agent_cache
 import uuid
 import logging
 import httpx
@@ -64,6 +67,70 @@ def _convert_uuid_to_str(obj):
         return obj
 
 
+def get_agent_dependency_ids(agent: Agent) -> List[str]:
+    """IDs of the agents referenced by an agent's config
+
+    Covers sub-agents, agent tools, task agents and workflow agent-nodes.
+    """
+    config = agent.config or {}
+    dependency_ids = list(config.get("sub_agents") or [])
+
+    agent_tools = config.get("agent_tools")
+    if isinstance(agent_tools, list):
+        dependency_ids.extend(agent_tools)
+
+    for task in config.get("tasks") or []:
+        if isinstance(task, dict) and task.get("agent_id"):
+            dependency_ids.append(task["agent_id"])
+
+    for node in (config.get("workflow") or {}).get("nodes", []):
+        if node.get("type") == "agent-node":
+            node_agent_id = node.get("data", {}).get("agent", {}).get("id")
+            if node_agent_id:
+                dependency_ids.append(node_agent_id)
+
+    return [str(dependency_id) for dependency_id in dependency_ids]
+
+
+def get_agent_graph(
+    db: Session, root_agent: Agent, known: Optional[Dict[str, Agent]] = None
+) -> Dict[str, Agent]:
+    """Load every agent reachable from root_agent, keyed by their string ID
+
+    The config graph is walked breadth-first and each level is fetched with a
+    single IN query, skipping agents already in known. Every ID is visited
+    once, so cycles between agents end the walk instead of looping.
+    """
+    agents = dict(known or {})
+    agents[str(root_agent.id)] = root_agent
+    visited = {str(root_agent.id)}
+    level = [root_agent]
+
+    while level:
+        level_ids = []
+        for agent in level:
+            for dependency_id in get_agent_dependency_ids(agent):
+                if dependency_id not in visited:
+                    visited.add(dependency_id)
+                    level_ids.append(dependency_id)
+
+        missing_ids = [agent_id for agent_id in level_ids if agent_id not in agents]
+        if missing_ids:
+            agents.update(get_agents_by_ids(db, missing_ids))
+
+        level = [agents[agent_id] for agent_id in level_ids if agent_id in agents]
+
+    return agents
+
+
+def _sanitize_agent_name(agent: Agent) -> bool:
+    """Replace characters not allowed in ADK agent names; returns True if renamed"""
+    if agent.name and any(c for c in agent.name if not (c.isalnum() or c == "_")):
+        agent.name = "".join(c if c.isalnum() or c == "_" else "_" for c in agent.name)
+        return True
+    return False
+
+
 def validate_sub_agents(db: Session, sub_agents: List[Union[uuid.UUID, str]]) -> bool:
     """Validate if all sub-agents exist"""
     logger.info(f"Validating sub-agents: {sub_agents}")
@@ -104,10 +171,7 @@ def get_agent(db: Session, agent_id: Union[uuid.UUID, str]) -> Optional[Agent]:
             return None
 
         # Sanitize agent name if it contains spaces or special characters
-        if agent.name and any(c for c in agent.name if not (c.isalnum() or c == "_")):
-            agent.name = "".join(
-                c if c.isalnum() or c == "_" else "_" for c in agent.name
-            )
+        if _sanitize_agent_name(agent):
             # Update in database
             db.commit()
 
@@ -120,6 +184,73 @@ def get_agent(db: Session, agent_id: Union[uuid.UUID, str]) -> Optional[Agent]:
         )
 
 
+async def get_agent_async(
+    db: AsyncSession, agent_id: Union[uuid.UUID, str]
+) -> Optional[Agent]:
+    """Search for an agent by ID without blocking the event loop"""
+    try:
+        # Convert to UUID if it's a string
+        if isinstance(agent_id, str):
+            try:
+                agent_id = uuid.UUID(agent_id)
+            except ValueError:
+                logger.warning(f"Invalid agent ID: {agent_id}")
+                return None
+
+        result = await db.execute(select(Agent).where(Agent.id == agent_id))
+        agent = result.scalars().first()
+        if not agent:
+            logger.warning(f"Agent not found: {agent_id}")
+            return None
+
+        # Sanitize agent name if it contains spaces or special characters
+        if _sanitize_agent_name(agent):
+            # Update in database
+            await db.commit()
+
+        return agent
+    except SQLAlchemyError as e:
+        logger.error(f"Error searching for agent {agent_id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error searching for agent",
+        )
+
+
+def get_agents_by_ids(
+    db: Session, agent_ids: List[Union[uuid.UUID, str]]
+) -> Dict[str, Agent]:
+    """Search for several agents with a single query, keyed by their string ID"""
+    ids = []
+    for agent_id in agent_ids:
+        try:
+            ids.append(
+                agent_id if isinstance(agent_id, uuid.UUID) else uuid.UUID(str(agent_id))
+            )
+        except ValueError:
+            logger.warning(f"Invalid agent ID: {agent_id}")
+
+    if not ids:
+        return {}
+
+    try:
+        agents = db.query(Agent).filter(Agent.id.in_(ids)).all()
+
+        # Sanitize agent names if they contain spaces or special characters
+        renamed = [agent for agent in agents if _sanitize_agent_name(agent)]
+        if renamed:
+            # Update in database
+            db.commit()
+
+        return {str(agent.id): agent for agent in agents}
+    except SQLAlchemyError as e:
+        logger.error(f"Error searching for agents {agent_ids}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error searching for agents",
+        )
+
+
 def get_agents_by_client(
     db: Session,
     client_id: uuid.UUID,
@@ -775,6 +906,9 @@ async def update_agent(
 
         db.commit()
         db.refresh(agent)
+
+        # Drop cached agent trees built from the previous configuration
+        agent_cache.invalidate(agent_id)
         return agent
     except Exception as e:
         db.rollback()
@@ -791,6 +925,7 @@ def delete_agent(db: Session, agent_id: uuid.UUID) -> bool:
         # Actually delete the agent from the database
         db.delete(db_agent)
         db.commit()
+        agent_cache.invalidate(agent_id)
         logger.info(f"Agent deleted successfully: {agent_id}")
         return True
     except SQLAlchemyError as e:
@@ -0,0 +1,247 @@
+"""
+┌──────────────────────────────────────────────────────────────────────────────┐
+│ @author: Davidson Gomes                                                      │
+│ @file: apikey_cache.py                                                       │
+│ Developed by: Davidson Gomes                                                 │
+│ Creation date: October 17, 2026                                              │
+│ Contact: contato@evolution-api.com                                           │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @copyright © Evolution API 2025. All rights reserved.                        │
+│ Licensed under the Apache License, Version 2.0                               │
+│                                                                              │
+│ You may not use this file except in compliance with the License.             │
+│ You may obtain a copy of the License at                                      │
+│                                                                              │
+│    http://www.apache.org/licenses/LICENSE-2.0                                │
+│                                                                              │
+│ Unless required by applicable law or agreed to in writing, software          │
+│ distributed under the License is distributed on an "AS IS" BASIS,            │
+│ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.     │
+│ See the License for the specific language governing permissions and          │
+│ limitations under the License.                                               │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @important                                                                   │
+│ For any future changes to the code in this file, it is recommended to        │
+│ include, together with the modification, the information of the developer    │
+│ who changed it and the date of modification.                                 │
+└──────────────────────────────────────────────────────────────────────────────┘
+"""
+
+"""
+Process-wide cache of decrypted provider API keys.
+
+Every agent build looks up its provider key, which costs a query and a Fernet
+decrypt. Decrypted keys are kept here for a short TTL, keyed by the API key
+id, and dropped as soon as the key is updated or deleted. With
+API_KEY_CACHE_REDIS enabled, invalidations are broadcast to the other workers
+over Redis pub/sub.
+
+Secrets are held in bytearrays and overwritten with zeros when they leave the
+cache. The str handed to callers is a copy that Python may keep until it is
+garbage collected; zeroing only bounds the lifetime of the cache's own copy.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import redis
+
+from src.config.redis import get_redis_client, get_redis_config
+from src.config.settings import settings
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+def api_key_dependency(key_id) -> str:
+    """Dependency tag recorded in the agent cache for trees using this key."""
+    return f"api_key:{key_id}"
+
+
+@dataclass
+class _SecretEntry:
+    """A decrypted key and its deadline."""
+
+    secret: bytearray
+    expires_at: float
+
+    def wipe(self) -> None:
+        self.secret[:] = bytes(len(self.secret))
+
+
+class ApiKeyCache:
+    """LRU cache with TTL for decrypted API keys."""
+
+    def __init__(
+        self,
+        max_size: int = 512,
+        ttl: int = 60,
+        enabled: bool = True,
+        use_redis: bool = False,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.enabled = enabled
+        self.use_redis = use_redis
+        self._entries: "OrderedDict[str, _SecretEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._listener: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.remote_invalidations = 0
+
+    @staticmethod
+    def _channel() -> str:
+        return f"{get_redis_config()['key_prefix']}api_key_invalidations"
+
+    def get(self, key_id) -> Optional[str]:
+        """Return the decrypted key, or None on a miss."""
+        if not self.enabled:
+            return None
+
+        key = str(key_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            if entry.expires_at <= time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.secret.decode("utf-8")
+
+    def put(self, key_id, value: str) -> None:
+        """Store a decrypted key."""
+        if not self.enabled or self.max_size <= 0:
+            return
+
+        key = str(key_id)
+        entry = _SecretEntry(
+            secret=bytearray(value.encode("utf-8")),
+            expires_at=time.monotonic() + self.ttl,
+        )
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = entry
+
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, key_id, broadcast: bool = True) -> None:
+        """Drop a key here and, optionally, in every other worker.
+
+        Agent trees built with the key are dropped from the agent cache too,
+        since their models hold the old value.
+        """
+        self._invalidate_local(str(key_id))
+
+        if broadcast and self.use_redis:
+            client = get_redis_client()
+            if client is None:
+                return
+            try:
+                client.publish(self._channel(), str(key_id))
+            except redis.RedisError as e:
+                logger.warning(f"Could not broadcast API key invalidation: {e}")
+
+    def _invalidate_local(self, key: str) -> None:
+        # Import moved to inside the function to avoid circular import
+        from src.services.adk.agent_cache import agent_cache
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+                self.invalidations += 1
+        agent_cache.invalidate(api_key_dependency(key))
+
+    def clear(self) -> None:
+        """Drop every cached key."""
+        with self._lock:
+            for key in list(self._entries):
+                self._remove(key)
+
+    def start(self) -> None:
+        """Start listening for invalidations from other workers."""
+        if not self.enabled or not self.use_redis:
+            return
+        if self._listener is None or not self._listener.is_alive():
+            self._stop_event.clear()
+            self._listener = threading.Thread(
+                target=self._listen, name="api-key-cache-listener", daemon=True
+            )
+            self._listener.start()
+            logger.info("API key cache invalidation listener started")
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._listener is not None:
+            self._listener.join(timeout=5)
+            self._listener = None
+        self.clear()
+
+    def _listen(self) -> None:
+        while not self._stop_event.is_set():
+            client = get_redis_client()
+            if client is None:
+                self._stop_event.wait(5)
+                continue
+
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.subscribe(self._channel())
+                while not self._stop_event.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message and message.get("type") == "message":
+                        self.remote_invalidations += 1
+                        self._invalidate_local(str(message["data"]))
+            except redis.RedisError as e:
+                logger.warning(f"API key cache listener error, resubscribing: {e}")
+                # Keys may have changed while disconnected
+                self.clear()
+                self._stop_event.wait(5)
+            finally:
+                pubsub.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the cache counters."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "redis": self.use_redis,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "remote_invalidations": self.remote_invalidations,
+            }
+
+    def _remove(self, key: str) -> None:
+        """Remove an entry and zero its secret. Caller holds the lock."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            entry.wipe()
+
+
+api_key_cache = ApiKeyCache(
+    max_size=settings.API_KEY_CACHE_MAX_SIZE,
+    ttl=settings.API_KEY_CACHE_TTL,
+    enabled=settings.API_KEY_CACHE_ENABLED,
+    use_redis=settings.API_KEY_CACHE_REDIS,
+)
@@ -29,6 +29,7 @@
 
 from src.models.models import ApiKey
 from src.utils.crypto import encrypt_api_key, decrypt_api_key
+from src.services.apikey_cache import api_key_cache
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from fastapi import HTTPException, status
@@ -127,12 +128,18 @@ def get_api_keys_by_client(
 
 def get_decrypted_api_key(db: Session, key_id: uuid.UUID) -> Optional[str]:
     """Get the decrypted value of an API key"""
+    cached_key = api_key_cache.get(key_id)
+    if cached_key is not None:
+        return cached_key
+
     try:
         key = get_api_key(db, key_id)
         if not key or not key.is_active:
             logger.warning(f"API key {key_id} not found or inactive")
             return None
-        return decrypt_api_key(key.encrypted_key)
+        decrypted_key = decrypt_api_key(key.encrypted_key)
+        api_key_cache.put(key_id, decrypted_key)
+        return decrypted_key
     except Exception as e:
         logger.error(f"Error decrypting API key {key_id}: {str(e)}")
         return None
@@ -163,6 +170,7 @@ def update_api_key(
 
         db.commit()
         db.refresh(key)
+        api_key_cache.invalidate(key_id)
         logger.info(f"API key {key_id} updated")
         return key
     except SQLAlchemyError as e:
@@ -184,6 +192,7 @@ def delete_api_key(db: Session, key_id: uuid.UUID) -> bool:
         # Soft delete - only marks as inactive
         key.is_active = False
         db.commit()
+        api_key_cache.invalidate(key_id)
         logger.info(f"API key {key_id} deactivated")
         return True
     except SQLAlchemyError as e:
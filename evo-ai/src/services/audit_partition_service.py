@@ -0,0 +1,303 @@
+"""
+┌──────────────────────────────────────────────────────────────────────────────┐
+│ @author: Davidson Gomes                                                      │
+│ @file: audit_partition_service.py                                            │
+│ Developed by: Davidson Gomes                                                 │
+│ Creation date: October 17, 2026                                              │
+│ Contact: contato@evolution-api.com                                           │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @copyright © Evolution API 2025. All rights reserved.                        │
+│ Licensed under the Apache License, Version 2.0                               │
+│                                                                              │
+│ You may not use this file except in compliance with the License.             │
+│ You may obtain a copy of the License at                                      │
+│                                                                              │
+│    http://www.apache.org/licenses/LICENSE-2.0                                │
+│                                                                              │
+│ Unless required by applicable law or agreed to in writing, software          │
+│ distributed under the License is distributed on an "AS IS" BASIS,            │
+│ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.     │
+│ See the License for the specific language governing permissions and          │
+│ limitations under the License.                                               │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @important                                                                   │
+│ For any future changes to the code in this file, it is recommended to        │
+│ include, together with the modification, the information of the developer    │
+│ who changed it and the date of modification.                                 │
+└──────────────────────────────────────────────────────────────────────────────┘
+"""
+
+"""
+Monthly partitions of the audit_logs table.
+
+audit_logs is range partitioned on created_at with one partition per month,
+named audit_logs_pYYYYMM, plus audit_logs_default for rows outside every
+range. The maintainer creates the partitions of the coming months ahead of
+time and drops whole partitions once they leave the retention window, which
+is far cheaper than deleting rows. Rows that landed in the default partition
+move into their month's partition when it is created. A transaction-level
+advisory lock keeps several workers from running the maintenance at once.
+"""
+
+import asyncio
+import logging
+import re
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from src.config.database import SessionLocal
+from src.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "audit_logs"
+DEFAULT_PARTITION = "audit_logs_default"
+PARTITION_NAME = re.compile(r"^audit_logs_p(\d{4})(\d{2})$")
+
+# Advisory lock held while a worker maintains the partitions
+MAINTENANCE_LOCK_KEY = 7310251
+
+
+def month_start(value: datetime) -> datetime:
+    """First instant (UTC) of the month containing value"""
+    value = value.astimezone(timezone.utc) if value.tzinfo else value
+    return datetime(value.year, value.month, 1, tzinfo=timezone.utc)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def partition_name(month: datetime) -> str:
+    return f"{PARENT_TABLE}_p{month:%Y%m}"
+
+
+def is_partitioned(db: Session) -> bool:
+    """Whether audit_logs is a partitioned table (it is not before the migration)"""
+    return (
+        db.execute(
+            text(
+                "SELECT 1 FROM pg_partitioned_table pt "
+                "JOIN pg_class c ON c.oid = pt.partrelid "
+                "WHERE c.relname = :table AND c.relkind = 'p'"
+            ),
+            {"table": PARENT_TABLE},
+        ).first()
+        is not None
+    )
+
+
+def list_partitions(db: Session) -> List[str]:
+    rows = db.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits i "
+            "JOIN pg_class child ON child.oid = i.inhrelid "
+            "JOIN pg_class parent ON parent.oid = i.inhparent "
+            "WHERE parent.relname = :table"
+        ),
+        {"table": PARENT_TABLE},
+    ).all()
+    return [row.relname for row in rows]
+
+
+def _create_month_partition(db: Session, month: datetime, has_default: bool):
+    """Create the partition of one month, moving its rows out of the default one"""
+    name = partition_name(month)
+    # Bounds come from datetimes built here, never from user input
+    start, end = month.isoformat(), add_months(month, 1).isoformat()
+    bounds = {"start": start, "end": end}
+    in_range = "created_at >= :start AND created_at < :end"
+
+    # Postgres refuses the new partition while the default one holds rows of
+    # its range, so those rows move across with the default detached
+    stranded = has_default and (
+        db.execute(
+            text(f"SELECT 1 FROM {DEFAULT_PARTITION} WHERE {in_range} LIMIT 1"),
+            bounds,
+        ).first()
+        is not None
+    )
+    if stranded:
+        db.execute(
+            text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {DEFAULT_PARTITION}")
+        )
+
+    db.execute(
+        text(
+            f"CREATE TABLE {name} PARTITION OF {PARENT_TABLE} "
+            f"FOR VALUES FROM ('{start}') TO ('{end}')"
+        )
+    )
+
+    if stranded:
+        moved = db.execute(
+            text(
+                f"INSERT INTO {name} SELECT * FROM {DEFAULT_PARTITION} "
+                f"WHERE {in_range}"
+            ),
+            bounds,
+        ).rowcount
+        db.execute(text(f"DELETE FROM {DEFAULT_PARTITION} WHERE {in_range}"), bounds)
+        db.execute(
+            text(
+                f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {DEFAULT_PARTITION} "
+                "DEFAULT"
+            )
+        )
+        logger.info(f"Moved {moved} audit logs from {DEFAULT_PARTITION} to {name}")
+
+
+def ensure_partitions(db: Session, first_month: datetime, months: int) -> List[str]:
+    """
+    Create the default partition and the monthly ones from first_month on.
+
+    Each partition is created in its own savepoint, so one failure is logged
+    and skipped without rolling back the others.
+    """
+    existing = set(list_partitions(db))
+    created = []
+
+    if DEFAULT_PARTITION not in existing:
+        try:
+            with db.begin_nested():
+                db.execute(
+                    text(
+                        f"CREATE TABLE {DEFAULT_PARTITION} "
+                        f"PARTITION OF {PARENT_TABLE} DEFAULT"
+                    )
+                )
+            created.append(DEFAULT_PARTITION)
+        except SQLAlchemyError as e:
+            logger.error(f"Error creating {DEFAULT_PARTITION}: {e}")
+
+    has_default = DEFAULT_PARTITION in existing or DEFAULT_PARTITION in created
+    month = month_start(first_month)
+    for _ in range(months):
+        name = partition_name(month)
+        if name not in existing:
+            try:
+                with db.begin_nested():
+                    _create_month_partition(db, month, has_default)
+                created.append(name)
+            except SQLAlchemyError as e:
+                logger.error(f"Error creating audit partition {name}: {e}")
+        month = add_months(month, 1)
+
+    return created
+
+
+def drop_expired_partitions(
+    db: Session, retention_months: int, now: Optional[datetime] = None
+) -> List[str]:
+    """Drop the monthly partitions that ended before the retention window"""
+    if retention_months <= 0:
+        return []
+
+    now = now or datetime.now(timezone.utc)
+    cutoff = add_months(month_start(now), -retention_months)
+    dropped = []
+    for name in sorted(list_partitions(db)):
+        match = PARTITION_NAME.match(name)
+        if not match:
+            continue
+        month = datetime(
+            int(match.group(1)), int(match.group(2)), 1, tzinfo=timezone.utc
+        )
+        if add_months(month, 1) <= cutoff:
+            try:
+                with db.begin_nested():
+                    db.execute(text(f"DROP TABLE {name}"))
+                dropped.append(name)
+            except SQLAlchemyError as e:
+                logger.error(f"Error dropping audit partition {name}: {e}")
+    return dropped
+
+
+class AuditPartitionManager:
+    """Keeps the audit_logs partitions ahead of time and within retention."""
+
+    def __init__(self, interval: float, months_ahead: int, retention_months: int):
+        self.interval = interval
+        self.months_ahead = months_ahead
+        self.retention_months = retention_months
+        self._task: Optional[asyncio.Task] = None
+        self.created = 0
+        self.dropped = 0
+        self.failures = 0
+        self.last_run: Optional[datetime] = None
+
+    def start(self):
+        if self.interval > 0 and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._run())
+            logger.info("Audit partition manager started")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.to_thread(self.maintain)
+            except Exception as e:
+                self.failures += 1
+                logger.error(f"Audit partition maintenance error: {e}")
+            await asyncio.sleep(self.interval)
+
+    def maintain(self):
+        db = SessionLocal()
+        try:
+            locked = db.execute(
+                text("SELECT pg_try_advisory_xact_lock(:key)"),
+                {"key": MAINTENANCE_LOCK_KEY},
+            ).scalar()
+            if not locked or not is_partitioned(db):
+                db.rollback()
+                return
+
+            now = datetime.now(timezone.utc)
+            # The current month plus the ones ahead
+            created = ensure_partitions(db, now, self.months_ahead + 1)
+            dropped = drop_expired_partitions(db, self.retention_months, now)
+            db.commit()
+
+            self.created += len(created)
+            self.dropped += len(dropped)
+            self.last_run = now
+            if created or dropped:
+                logger.info(
+                    f"Audit partitions created: {created or 'none'}, "
+                    f"dropped: {dropped or 'none'}"
+                )
+        except SQLAlchemyError:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "created": self.created,
+            "dropped": self.dropped,
+            "failures": self.failures,
+            "last_run": self.last_run.isoformat() if self.last_run else None,
+            "retention_months": self.retention_months,
+        }
+
+
+audit_partition_manager = AuditPartitionManager(
+    interval=settings.AUDIT_LOG_PARTITION_INTERVAL,
+    months_ahead=settings.AUDIT_LOG_PARTITIONS_AHEAD,
+    retention_months=settings.AUDIT_LOG_RETENTION_MONTHS,
+)
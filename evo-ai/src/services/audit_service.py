@@ -27,18 +27,62 @@
 └──────────────────────────────────────────────────────────────────────────────┘
 """
 
+import asyncio
+import threading
+from collections import deque
+from sqlalchemy import insert, tuple_
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.exc import DataError, IntegrityError, SQLAlchemyError
+from src.config.database import SessionLocal
+from src.config.settings import settings
 from src.models.models import AuditLog
-from datetime import datetime
-from fastapi import Request
-from typing import Optional, Dict, Any, List
+from datetime import datetime, timezone
+from fastapi import HTTPException, Request, status
+from typing import Optional, Dict, Any, List, Tuple
+import base64
+import json
 import uuid
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def _build_audit_row(
+    user_id: Optional[uuid.UUID],
+    action: str,
+    resource_type: str,
+    resource_id: Optional[str],
+    details: Optional[Dict[str, Any]],
+    request: Optional[Request],
+) -> Dict[str, Any]:
+    ip_address = None
+    user_agent = None
+
+    if request:
+        ip_address = request.client.host if hasattr(request, "client") else None
+        user_agent = request.headers.get("user-agent")
+
+    # Convert details to serializable format
+    if details:
+        # Convert UUIDs to strings
+        for key, value in details.items():
+            if isinstance(value, uuid.UUID):
+                details[key] = str(value)
+
+    # Id and timestamp are set here so buffered rows keep the time of the action
+    return {
+        "id": uuid.uuid4(),
+        "user_id": user_id,
+        "action": action,
+        "resource_type": resource_type,
+        "resource_id": str(resource_id) if resource_id else None,
+        "details": details,
+        "ip_address": ip_address,
+        "user_agent": user_agent,
+        "created_at": datetime.now(timezone.utc),
+    }
+
+
 def create_audit_log(
     db: Session,
     user_id: Optional[uuid.UUID],
@@ -51,6 +95,9 @@ def create_audit_log(
     """
     Create a new audit log
 
+    The log is handed to the background audit writer when it is running, so
+    the caller does not wait for a commit; otherwise it is written inline.
+
     Args:
         db: Database session
         user_id: User ID that performed the action (or None if anonymous)
@@ -61,33 +108,18 @@ def create_audit_log(
         request: FastAPI Request object (optional, to get IP and User-Agent)
 
     Returns:
-        Optional[AuditLog]: Created audit log or None in case of error
+        Optional[AuditLog]: Created audit log (not yet flushed when buffered)
+        or None in case of error
     """
     try:
-        ip_address = None
-        user_agent = None
-
-        if request:
-            ip_address = request.client.host if hasattr(request, "client") else None
-            user_agent = request.headers.get("user-agent")
-
-        # Convert details to serializable format
-        if details:
-            # Convert UUIDs to strings
-            for key, value in details.items():
-                if isinstance(value, uuid.UUID):
-                    details[key] = str(value)
-
-        audit_log = AuditLog(
-            user_id=user_id,
-            action=action,
-            resource_type=resource_type,
-            resource_id=str(resource_id) if resource_id else None,
-            details=details,
-            ip_address=ip_address,
-            user_agent=user_agent,
+        row = _build_audit_row(
+            user_id, action, resource_type, resource_id, details, request
         )
 
+        if audit_writer.enqueue(row):
+            return AuditLog(**row)
+
+        audit_log = AuditLog(**row)
         db.add(audit_log)
         db.commit()
         db.refresh(audit_log)
@@ -108,24 +140,227 @@ def create_audit_log(
         return None
 
 
-def get_audit_logs(
+class AuditLogWriter:
+    """Buffers audit logs in memory and inserts them in batches.
+
+    Logs are flushed every flush_interval seconds or as soon as batch_size of
+    them are waiting. When the buffer is full the overflow policy applies:
+    "drop" discards the new log, "inline" makes the caller write it itself.
+    """
+
+    def __init__(
+        self,
+        enabled: bool,
+        batch_size: int,
+        flush_interval: float,
+        max_buffer: int,
+        overflow_policy: str,
+    ):
+        self.enabled = enabled
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.overflow_policy = overflow_policy
+        self._buffer: deque = deque()
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake_event: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.written = 0
+        self.dropped = 0
+        self.spilled = 0
+        self.failed_flushes = 0
+
+    def start(self):
+        if self.enabled and (self._task is None or self._task.done()):
+            self._loop = asyncio.get_running_loop()
+            self._wake_event = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+            logger.info("Audit log writer started")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        # Write whatever is still buffered before the worker exits
+        while self._buffer:
+            if not await asyncio.to_thread(self._flush):
+                break
+        if self._buffer:
+            self.dropped += len(self._buffer)
+            logger.error(f"Dropped {len(self._buffer)} audit logs on shutdown")
+            self._buffer.clear()
+
+    def enqueue(self, row: Dict[str, Any]) -> bool:
+        """Buffer a log; False means the caller must write it inline"""
+        if self._task is None or self._task.done():
+            return False
+
+        with self._lock:
+            if len(self._buffer) >= self.max_buffer:
+                if self.overflow_policy == "inline":
+                    self.spilled += 1
+                    return False
+                self.dropped += 1
+                logger.warning("Audit log buffer full, dropping log")
+                return True
+            self._buffer.append(row)
+            full = len(self._buffer) >= self.batch_size
+
+        if full:
+            self.wake()
+        return True
+
+    def wake(self):
+        if self._loop is not None and self._wake_event is not None:
+            # enqueue may run on a threadpool worker
+            self._loop.call_soon_threadsafe(self._wake_event.set)
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake_event.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake_event.clear()
+
+            while self._buffer:
+                try:
+                    flushed = await asyncio.to_thread(self._flush)
+                except Exception as e:
+                    logger.error(f"Audit log writer error: {e}")
+                    flushed = False
+                # Stop on errors or once less than a full batch is waiting
+                if not flushed or len(self._buffer) < self.batch_size:
+                    break
+
+    def _take_batch(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            count = min(self.batch_size, len(self._buffer))
+            return [self._buffer.popleft() for _ in range(count)]
+
+    def _requeue(self, rows: List[Dict[str, Any]]):
+        """Put a failed batch back at the head of the buffer if there is room"""
+        with self._lock:
+            room = max(self.max_buffer - len(self._buffer), 0)
+            kept = rows[:room]
+            self._buffer.extendleft(reversed(kept))
+        if len(kept) < len(rows):
+            self.dropped += len(rows) - len(kept)
+
+    def _flush(self) -> bool:
+        rows = self._take_batch()
+        if not rows:
+            return True
+
+        db = SessionLocal()
+        try:
+            db.execute(insert(AuditLog), rows)
+            db.commit()
+            self.written += len(rows)
+            return True
+        except SQLAlchemyError as e:
+            db.rollback()
+            self.failed_flushes += 1
+            logger.error(f"Error flushing {len(rows)} audit logs: {e}")
+        finally:
+            db.close()
+
+        # One bad row (e.g. a deleted user) must not sink the whole batch
+        failed = self._insert_one_by_one(rows)
+        if failed:
+            self._requeue(failed)
+            return False
+        return True
+
+    def _insert_one_by_one(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Insert rows separately; returns the rows worth retrying later"""
+        db = SessionLocal()
+        try:
+            for index, row in enumerate(rows):
+                try:
+                    db.execute(insert(AuditLog), row)
+                    db.commit()
+                    self.written += 1
+                except (IntegrityError, DataError) as e:
+                    db.rollback()
+                    self.dropped += 1
+                    logger.error(f"Dropping invalid audit log {row['id']}: {e}")
+                except SQLAlchemyError:
+                    db.rollback()
+                    # The database itself is failing; retry the rest later
+                    return rows[index:]
+            return []
+        finally:
+            db.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "buffered": len(self._buffer),
+            "written": self.written,
+            "dropped": self.dropped,
+            "spilled_inline": self.spilled,
+            "failed_flushes": self.failed_flushes,
+        }
+
+
+audit_writer = AuditLogWriter(
+    enabled=settings.AUDIT_LOG_ASYNC,
+    batch_size=settings.AUDIT_LOG_BATCH_SIZE,
+    flush_interval=settings.AUDIT_LOG_FLUSH_INTERVAL,
+    max_buffer=settings.AUDIT_LOG_MAX_BUFFER,
+    overflow_policy=settings.AUDIT_LOG_OVERFLOW_POLICY,
+)
+
+
+def encode_audit_cursor(created_at: datetime, log_id: uuid.UUID) -> str:
+    """Encode the position of an audit log as an opaque pagination cursor"""
+    raw = json.dumps({"ts": created_at.isoformat(), "id": str(log_id)}).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("utf-8").rstrip("=")
+
+
+def decode_audit_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """Decode a cursor produced by encode_audit_cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("utf-8")))
+        return datetime.fromisoformat(data["ts"]), uuid.UUID(data["id"])
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
+def get_audit_logs_page(
     db: Session,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     user_id: Optional[uuid.UUID] = None,
     action: Optional[str] = None,
     resource_type: Optional[str] = None,
     resource_id: Optional[str] = None,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
-) -> List[AuditLog]:
+) -> Dict[str, Any]:
     """
-    Get audit logs with optional filters
+    Get a page of audit logs with optional filters, newest first
+
+    Pages are read by keyset on (created_at, id), so deep pages cost the same
+    as the first one; ``next_cursor`` points at older logs. ``skip`` is only
+    applied when no cursor is given.
 
     Args:
         db: Database session
-        skip: Number of records to skip
+        skip: Number of records to skip (first page only)
         limit: Maximum number of records to return
+        cursor: Cursor returned by the previous page
         user_id: Filter by user ID
         action: Filter by action
         resource_type: Filter by resource type
@@ -134,7 +369,7 @@ def get_audit_logs(
         end_date: End date
 
     Returns:
-        List[AuditLog]: List of audit logs
+        Dict[str, Any]: logs, next_cursor and has_more
     """
     query = db.query(AuditLog)
 
@@ -151,16 +386,32 @@ def get_audit_logs(
     if resource_id:
         query = query.filter(AuditLog.resource_id == resource_id)
 
+    # Date bounds also let Postgres skip the partitions outside the range
     if start_date:
         query = query.filter(AuditLog.created_at >= start_date)
 
     if end_date:
         query = query.filter(AuditLog.created_at <= end_date)
 
+    if cursor:
+        cursor_ts, cursor_id = decode_audit_cursor(cursor)
+        query = query.filter(
+            tuple_(AuditLog.created_at, AuditLog.id) < tuple_(cursor_ts, cursor_id)
+        )
+    elif skip:
+        query = query.offset(skip)
+
     # Order by creation date (most recent first)
-    query = query.order_by(AuditLog.created_at.desc())
+    rows = (
+        query.order_by(AuditLog.created_at.desc(), AuditLog.id.desc())
+        .limit(limit + 1)
+        .all()
+    )
 
-    # Apply pagination
-    query = query.offset(skip).limit(limit)
+    has_more = len(rows) > limit
+    logs = rows[:limit]
+    next_cursor = None
+    if has_more:
+        next_cursor = encode_audit_cursor(logs[-1].created_at, logs[-1].id)
 
-    return query.all()
+    return {"logs": logs, "next_cursor": next_cursor, "has_more": has_more}
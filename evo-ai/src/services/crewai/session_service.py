@@ -35,6 +35,7 @@ import copy
 from typing import Any, Dict, List, Optional, Union, Set
 
 from sqlalchemy import create_engine, Boolean, Text, ForeignKeyConstraint
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.ext.mutable import MutableDict
 from sqlalchemy.orm import (
@@ -264,22 +265,26 @@ class Session(BaseModel):
 class CrewSessionService:
     """Service for managing CrewAI agent sessions using ADK tables."""
 
-    def __init__(self, db_url: str):
+    def __init__(self, db_url: Optional[str] = None, engine: Optional[Engine] = None):
         """
         Initializes the session service.
 
         Args:
-            db_url: Database connection URL.
+            db_url: Database connection URL, used when no engine is given.
+            engine: Existing engine whose connection pool should be shared.
         """
-        try:
-            self.engine = create_engine(db_url)
-        except Exception as e:
-            raise ValueError(f"Failed to create database engine: {e}")
+        if engine is not None:
+            self.engine = engine
+        else:
+            try:
+                self.engine = create_engine(db_url)
+            except Exception as e:
+                raise ValueError(f"Failed to create database engine: {e}")
 
         # Create all tables
         Base.metadata.create_all(self.engine)
         self.Session = sessionmaker(bind=self.engine)
-        logger.info(f"CrewSessionService started with database at {db_url}")
+        logger.info(f"CrewSessionService started with database at {self.engine.url}")
 
     def create_session(
         self, agent_id: str, external_id: str, session_id: Optional[str] = None
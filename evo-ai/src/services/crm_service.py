@@ -16,9 +16,9 @@
 import logging
 from uuid import UUID
 from typing import List, Optional, Dict, Any
-from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc
+from sqlalchemy import and_, or_, desc, func, select
 
 from src.models.crm_models import (
     Lead,
@@ -31,10 +31,26 @@ from src.models.crm_models import (
 logger = logging.getLogger(__name__)
 
 
+async def _paginate_async(
+    db: AsyncSession, statement, order_by, page: int, limit: int
+) -> tuple[list, int]:
+    """Executa a contagem e a página de uma listagem na sessão assíncrona"""
+    total = await db.scalar(
+        select(func.count()).select_from(statement.order_by(None).subquery())
+    )
+    result = await db.execute(
+        statement.order_by(order_by).offset((page - 1) * limit).limit(limit)
+    )
+    return list(result.scalars().all()), total or 0
+
+
 class CRMService:
     """
     Serviço centralizado para gerenciamento de CRM.
     Encapsula toda a lógica de negócio para leads, contatos, deals e kanban.
+
+    As listagens têm variantes ``*_async`` para a sessão assíncrona, usadas
+    pelas rotas para não bloquear o event loop; os filtros são compartilhados.
     """
 
     # ════════════════════════════════
@@ -80,13 +96,48 @@ class CRMService:
         search: Optional[str] = None,
     ) -> tuple[List[Lead], int]:
         """📑 Listar leads com filtros"""
-        query = db.query(Lead).filter(Lead.client_id == client_id)
+        query = db.query(Lead).filter(
+            *CRMService._lead_filters(client_id, status, search)
+        )
+
+        total = query.count()
+        leads = (
+            query.order_by(desc(Lead.created_at))
+            .offset((page - 1) * limit)
+            .limit(limit)
+            .all()
+        )
+
+        return leads, total
+
+    @staticmethod
+    async def list_leads_async(
+        db: AsyncSession,
+        client_id: UUID,
+        page: int = 1,
+        limit: int = 20,
+        status: Optional[str] = None,
+        search: Optional[str] = None,
+    ) -> tuple[List[Lead], int]:
+        """📑 Listar leads com filtros (sessão assíncrona)"""
+        statement = select(Lead).where(
+            *CRMService._lead_filters(client_id, status, search)
+        )
+        return await _paginate_async(
+            db, statement, desc(Lead.created_at), page, limit
+        )
+
+    @staticmethod
+    def _lead_filters(
+        client_id: UUID, status: Optional[str], search: Optional[str]
+    ) -> list:
+        filters = [Lead.client_id == client_id]
 
         if status:
-            query = query.filter(Lead.status == status)
+            filters.append(Lead.status == status)
 
         if search:
-            query = query.filter(
+            filters.append(
                 or_(
                     Lead.name.ilike(f"%{search}%"),
                     Lead.email.ilike(f"%{search}%"),
@@ -95,15 +146,7 @@ class CRMService:
                 )
             )
 
-        total = query.count()
-        leads = (
-            query.order_by(desc(Lead.created_at))
-            .offset((page - 1) * limit)
-            .limit(limit)
-            .all()
-        )
-
-        return leads, total
+        return filters
 
     @staticmethod
     def update_lead(
@@ -185,10 +228,42 @@ class CRMService:
         search: Optional[str] = None,
     ) -> tuple[List[Contact], int]:
         """📑 Listar contatos com filtros"""
-        query = db.query(Contact).filter(Contact.client_id == client_id)
+        query = db.query(Contact).filter(
+            *CRMService._contact_filters(client_id, search)
+        )
+
+        total = query.count()
+        contacts = (
+            query.order_by(desc(Contact.created_at))
+            .offset((page - 1) * limit)
+            .limit(limit)
+            .all()
+        )
+
+        return contacts, total
+
+    @staticmethod
+    async def list_contacts_async(
+        db: AsyncSession,
+        client_id: UUID,
+        page: int = 1,
+        limit: int = 20,
+        search: Optional[str] = None,
+    ) -> tuple[List[Contact], int]:
+        """📑 Listar contatos com filtros (sessão assíncrona)"""
+        statement = select(Contact).where(
+            *CRMService._contact_filters(client_id, search)
+        )
+        return await _paginate_async(
+            db, statement, desc(Contact.created_at), page, limit
+        )
+
+    @staticmethod
+    def _contact_filters(client_id: UUID, search: Optional[str]) -> list:
+        filters = [Contact.client_id == client_id]
 
         if search:
-            query = query.filter(
+            filters.append(
                 or_(
                     Contact.first_name.ilike(f"%{search}%"),
                     Contact.last_name.ilike(f"%{search}%"),
@@ -198,15 +273,7 @@ class CRMService:
                 )
             )
 
-        total = query.count()
-        contacts = (
-            query.order_by(desc(Contact.created_at))
-            .offset((page - 1) * limit)
-            .limit(limit)
-            .all()
-        )
-
-        return contacts, total
+        return filters
 
     @staticmethod
     def update_contact(
@@ -280,9 +347,7 @@ class CRMService:
         limit: int = 20,
     ) -> tuple[List[Pipeline], int]:
         """📑 Listar pipelines"""
-        query = db.query(Pipeline).filter(
-            and_(Pipeline.client_id == client_id, Pipeline.is_active == True)
-        )
+        query = db.query(Pipeline).filter(*CRMService._pipeline_filters(client_id))
 
         total = query.count()
         pipelines = (
@@ -294,6 +359,21 @@ class CRMService:
 
         return pipelines, total
 
+    @staticmethod
+    async def list_pipelines_async(
+        db: AsyncSession,
+        client_id: UUID,
+        page: int = 1,
+        limit: int = 20,
+    ) -> tuple[List[Pipeline], int]:
+        """📑 Listar pipelines (sessão assíncrona)"""
+        statement = select(Pipeline).where(*CRMService._pipeline_filters(client_id))
+        return await _paginate_async(db, statement, Pipeline.order, page, limit)
+
+    @staticmethod
+    def _pipeline_filters(client_id: UUID) -> list:
+        return [Pipeline.client_id == client_id, Pipeline.is_active.is_(True)]
+
     @staticmethod
     def update_pipeline(
         db: Session, pipeline_id: UUID, client_id: UUID, data: Dict[str, Any]
@@ -359,16 +439,9 @@ class CRMService:
         search: Optional[str] = None,
     ) -> tuple[List[Deal], int]:
         """📑 Listar deals com filtros"""
-        query = db.query(Deal).filter(Deal.client_id == client_id)
-
-        if pipeline_id:
-            query = query.filter(Deal.pipeline_id == pipeline_id)
-
-        if stage:
-            query = query.filter(Deal.stage == stage)
-
-        if search:
-            query = query.filter(Deal.title.ilike(f"%{search}%"))
+        query = db.query(Deal).filter(
+            *CRMService._deal_filters(client_id, pipeline_id, stage, search)
+        )
 
         total = query.count()
         deals = (
@@ -380,6 +453,44 @@ class CRMService:
 
         return deals, total
 
+    @staticmethod
+    async def list_deals_async(
+        db: AsyncSession,
+        client_id: UUID,
+        page: int = 1,
+        limit: int = 20,
+        pipeline_id: Optional[UUID] = None,
+        stage: Optional[str] = None,
+        search: Optional[str] = None,
+    ) -> tuple[List[Deal], int]:
+        """📑 Listar deals com filtros (sessão assíncrona)"""
+        statement = select(Deal).where(
+            *CRMService._deal_filters(client_id, pipeline_id, stage, search)
+        )
+        return await _paginate_async(
+            db, statement, desc(Deal.created_at), page, limit
+        )
+
+    @staticmethod
+    def _deal_filters(
+        client_id: UUID,
+        pipeline_id: Optional[UUID],
+        stage: Optional[str],
+        search: Optional[str],
+    ) -> list:
+        filters = [Deal.client_id == client_id]
+
+        if pipeline_id:
+            filters.append(Deal.pipeline_id == pipeline_id)
+
+        if stage:
+            filters.append(Deal.stage == stage)
+
+        if search:
+            filters.append(Deal.title.ilike(f"%{search}%"))
+
+        return filters
+
     @staticmethod
     def update_deal(
         db: Session, deal_id: UUID, client_id: UUID, data: Dict[str, Any]
@@ -460,6 +571,22 @@ class CRMService:
 
         return query.order_by(KanbanCard.position).all()
 
+    @staticmethod
+    async def list_kanban_cards_async(
+        db: AsyncSession,
+        client_id: UUID,
+        pipeline_id: Optional[UUID] = None,
+    ) -> List[KanbanCard]:
+        """📑 Listar cards do kanban (sessão assíncrona)"""
+        statement = select(KanbanCard).where(KanbanCard.client_id == client_id)
+
+        if pipeline_id:
+            # Filtrar por deals do pipeline
+            statement = statement.join(Deal).where(Deal.pipeline_id == pipeline_id)
+
+        result = await db.execute(statement.order_by(KanbanCard.position))
+        return list(result.scalars().all())
+
     @staticmethod
     def update_kanban_card(
         db: Session, card_id: UUID, client_id: UUID, data: Dict[str, Any]
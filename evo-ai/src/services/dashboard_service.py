@@ -0,0 +1,532 @@
+"""
+┌──────────────────────────────────────────────────────────────────────────────┐
+│ @author: Davidson Gomes                                                      │
+│ @file: dashboard_service.py                                                  │
+│ Developed by: Davidson Gomes                                                 │
+│ Creation date: October 17, 2026                                              │
+│ Contact: contato@evolution-api.com                                           │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @copyright © Evolution API 2025. All rights reserved.                        │
+│ Licensed under the Apache License, Version 2.0                               │
+│                                                                              │
+│ You may not use this file except in compliance with the License.             │
+│ You may obtain a copy of the License at                                      │
+│                                                                              │
+│    http://www.apache.org/licenses/LICENSE-2.0                                │
+│                                                                              │
+│ Unless required by applicable law or agreed to in writing, software          │
+│ distributed under the License is distributed on an "AS IS" BASIS,            │
+│ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.     │
+│ See the License for the specific language governing permissions and          │
+│ limitations under the License.                                               │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @important                                                                   │
+│ For any future changes to the code in this file, it is recommended to        │
+│ include, together with the modification, the information of the developer    │
+│ who changed it and the date of modification.                                 │
+└──────────────────────────────────────────────────────────────────────────────┘
+"""
+
+"""
+Dashboard metrics backed by per-client daily rollups.
+
+Dashboard numbers are read from dashboard_daily_rollups, one row per client,
+day and metric holding the rows created and deleted that day, so a dashboard
+load reads O(days) rows instead of counting the source tables. Agents,
+contacts and active pipelines are kept current by row triggers that the
+aggregator installs (and backfills) on startup. Sessions live in the table
+owned by the ADK session service, so the aggregator adds new ones
+periodically from a create_time watermark, and a delete trigger subtracts
+the ones already counted. Results are cached per client for a short TTL.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import Date, case, cast, func, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from src.config.database import SessionLocal
+from src.config.settings import settings
+from src.models.models import (
+    AuditLog,
+    DashboardDailyRollup,
+    DashboardRollupWatermark,
+    User,
+)
+
+logger = logging.getLogger(__name__)
+
+# Table, metric and the optional boolean column a row must have set to count
+COUNTED_TABLES = (
+    ("agents", "agents", None),
+    ("crm_contacts", "contacts", None),
+    ("crm_pipelines", "pipelines", "is_active"),
+)
+
+SESSIONS_SOURCE = "sessions"
+
+# Advisory lock held while a worker installs triggers or aggregates
+ROLLUP_LOCK_KEY = 7310252
+
+# Audit actions too frequent to be shown as dashboard activity
+QUIET_AUDIT_ACTIONS = ("list",)
+
+ROLLUP_ADD_FUNCTION = """
+CREATE OR REPLACE FUNCTION dashboard_rollup_add(
+    p_client_id uuid, p_day date, p_metric text, p_created bigint, p_deleted bigint
+) RETURNS void AS $$
+BEGIN
+    INSERT INTO dashboard_daily_rollups (client_id, day, metric, created, deleted)
+    VALUES (p_client_id, p_day, p_metric, p_created, p_deleted)
+    ON CONFLICT (client_id, day, metric) DO UPDATE
+    SET created = dashboard_daily_rollups.created + EXCLUDED.created,
+        deleted = dashboard_daily_rollups.deleted + EXCLUDED.deleted;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+# TG_ARGV[0] is the metric, TG_ARGV[1] an optional boolean gate column
+ROLLUP_COUNT_FUNCTION = """
+CREATE OR REPLACE FUNCTION dashboard_rollup_count() RETURNS trigger AS $$
+DECLARE
+    gate text := CASE WHEN TG_NARGS > 1 THEN TG_ARGV[1] END;
+    was_counted boolean := false;
+    is_counted boolean := false;
+    today date := (now() AT TIME ZONE 'UTC')::date;
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        was_counted := OLD.client_id IS NOT NULL AND (
+            gate IS NULL OR COALESCE((to_jsonb(OLD) ->> gate)::boolean, false)
+        );
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        is_counted := NEW.client_id IS NOT NULL AND (
+            gate IS NULL OR COALESCE((to_jsonb(NEW) ->> gate)::boolean, false)
+        );
+    END IF;
+
+    IF is_counted AND NOT was_counted THEN
+        PERFORM dashboard_rollup_add(
+            NEW.client_id,
+            CASE WHEN TG_OP = 'INSERT'
+                THEN (COALESCE(NEW.created_at, now()) AT TIME ZONE 'UTC')::date
+                ELSE today
+            END,
+            TG_ARGV[0], 1, 0
+        );
+    ELSIF was_counted AND NOT is_counted THEN
+        PERFORM dashboard_rollup_add(OLD.client_id, today, TG_ARGV[0], 0, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+# Deletes are only subtracted for sessions the aggregator has already counted;
+# FOR SHARE waits for a running aggregation to commit its new watermark
+SESSION_DELETE_FUNCTION = """
+CREATE OR REPLACE FUNCTION dashboard_rollup_session_deleted() RETURNS trigger AS $$
+BEGIN
+    IF OLD.create_time < (
+        SELECT watermark FROM dashboard_rollup_watermarks
+        WHERE source = 'sessions' FOR SHARE
+    ) THEN
+        PERFORM dashboard_rollup_add(
+            a.client_id, (now() AT TIME ZONE 'UTC')::date, 'sessions', 0, 1
+        )
+        FROM agents a
+        WHERE a.id::text = OLD.app_name AND a.client_id IS NOT NULL;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def _existing_tables(db: Session) -> set:
+    rows = db.execute(
+        text("SELECT tablename FROM pg_tables WHERE schemaname = current_schema()")
+    ).all()
+    return {row.tablename for row in rows}
+
+
+def ensure_rollup_triggers(db: Session) -> List[str]:
+    """Install the counting triggers that are missing and backfill their tables"""
+    tables = _existing_tables(db)
+    installed = {
+        row.tgname
+        for row in db.execute(
+            text("SELECT tgname FROM pg_trigger WHERE NOT tgisinternal")
+        ).all()
+    }
+    missing = [
+        entry
+        for entry in COUNTED_TABLES
+        if entry[0] in tables and f"{entry[0]}_dashboard_rollup" not in installed
+    ]
+    sessions_missing = (
+        SESSIONS_SOURCE in tables
+        and f"{SESSIONS_SOURCE}_dashboard_rollup" not in installed
+    )
+    if not missing and not sessions_missing:
+        return []
+
+    db.execute(text(ROLLUP_ADD_FUNCTION))
+    db.execute(text(ROLLUP_COUNT_FUNCTION))
+    db.execute(text(SESSION_DELETE_FUNCTION))
+
+    installed_now = []
+    if sessions_missing:
+        db.execute(
+            text(
+                f"CREATE TRIGGER {SESSIONS_SOURCE}_dashboard_rollup "
+                f"AFTER DELETE ON {SESSIONS_SOURCE} "
+                "FOR EACH ROW EXECUTE FUNCTION dashboard_rollup_session_deleted()"
+            )
+        )
+        installed_now.append(SESSIONS_SOURCE)
+
+    for table, metric, gate in missing:
+        events = "INSERT OR DELETE" + (f" OR UPDATE OF {gate}" if gate else "")
+        arguments = f"'{metric}'" + (f", '{gate}'" if gate else "")
+        # CREATE TRIGGER locks out writers until commit, so the backfill
+        # below and the trigger never count the same row
+        db.execute(
+            text(
+                f"CREATE TRIGGER {table}_dashboard_rollup "
+                f"AFTER {events} ON {table} "
+                f"FOR EACH ROW EXECUTE FUNCTION dashboard_rollup_count({arguments})"
+            )
+        )
+        condition = "client_id IS NOT NULL" + (f" AND {gate}" if gate else "")
+        db.execute(
+            text(
+                "INSERT INTO dashboard_daily_rollups "
+                "(client_id, day, metric, created, deleted) "
+                "SELECT client_id, "
+                "(COALESCE(created_at, now()) AT TIME ZONE 'UTC')::date, "
+                f"'{metric}', count(*), 0 FROM {table} WHERE {condition} "
+                "GROUP BY 1, 2 "
+                "ON CONFLICT (client_id, day, metric) DO UPDATE "
+                "SET created = dashboard_daily_rollups.created + EXCLUDED.created"
+            )
+        )
+        installed_now.append(table)
+
+    return installed_now
+
+
+def aggregate_sessions(db: Session, lag: float) -> int:
+    """Add the sessions created since the watermark to the rollups"""
+    if SESSIONS_SOURCE not in _existing_tables(db):
+        return 0
+
+    # Session deletes wait on this lock until the new watermark is committed
+    watermark = db.get(
+        DashboardRollupWatermark, SESSIONS_SOURCE, with_for_update=True
+    )
+    low = (
+        watermark.watermark
+        if watermark
+        else datetime(1970, 1, 1, tzinfo=timezone.utc)
+    )
+    # Stay behind now so sessions still being committed are not skipped
+    high = datetime.now(timezone.utc) - timedelta(seconds=lag)
+    if high <= low:
+        return 0
+
+    result = db.execute(
+        text(
+            "INSERT INTO dashboard_daily_rollups "
+            "(client_id, day, metric, created, deleted) "
+            "SELECT a.client_id, s.create_time::date, 'sessions', count(*), 0 "
+            "FROM sessions s JOIN agents a ON a.id::text = s.app_name "
+            "WHERE s.create_time >= :low AND s.create_time < :high "
+            "AND a.client_id IS NOT NULL "
+            "GROUP BY 1, 2 "
+            "ON CONFLICT (client_id, day, metric) DO UPDATE "
+            "SET created = dashboard_daily_rollups.created + EXCLUDED.created"
+        ),
+        {"low": low, "high": high},
+    )
+
+    if watermark:
+        watermark.watermark = high
+    else:
+        db.add(DashboardRollupWatermark(source=SESSIONS_SOURCE, watermark=high))
+    return result.rowcount or 0
+
+
+def _today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def _net():
+    return DashboardDailyRollup.created - DashboardDailyRollup.deleted
+
+
+def get_dashboard_stats(db: Session, client_id: uuid.UUID) -> Dict[str, int]:
+    """Totals per metric and their net change over the growth window"""
+    since = _today() - timedelta(days=settings.DASHBOARD_GROWTH_DAYS)
+    rows = (
+        db.query(
+            DashboardDailyRollup.metric,
+            func.coalesce(func.sum(_net()), 0).label("total"),
+            func.coalesce(
+                func.sum(case((DashboardDailyRollup.day > since, _net()), else_=0)),
+                0,
+            ).label("growth"),
+        )
+        .filter(DashboardDailyRollup.client_id == client_id)
+        .group_by(DashboardDailyRollup.metric)
+        .all()
+    )
+    metrics = {row.metric: (int(row.total), int(row.growth)) for row in rows}
+
+    def total(metric: str) -> int:
+        return metrics.get(metric, (0, 0))[0]
+
+    def growth(metric: str) -> int:
+        return metrics.get(metric, (0, 0))[1]
+
+    return {
+        "totalAgents": total("agents"),
+        "chatSessions": total("sessions"),
+        "activeContacts": total("contacts"),
+        "activePipelines": total("pipelines"),
+        "agentGrowth": growth("agents"),
+        "chatGrowth": growth("sessions"),
+        "contactGrowth": growth("contacts"),
+        "pipelineGrowth": growth("pipelines"),
+    }
+
+
+def get_chat_chart(
+    db: Session, client_id: uuid.UUID, days: int = 7
+) -> List[Dict[str, Any]]:
+    """Sessions started per day over the last ``days`` days"""
+    start = _today() - timedelta(days=days - 1)
+    rows = (
+        db.query(DashboardDailyRollup.day, DashboardDailyRollup.created)
+        .filter(
+            DashboardDailyRollup.client_id == client_id,
+            DashboardDailyRollup.metric == "sessions",
+            DashboardDailyRollup.day >= start,
+        )
+        .all()
+    )
+    per_day = {row.day: int(row.created) for row in rows}
+    return [
+        {
+            "date": (start + timedelta(days=offset)).isoformat(),
+            "sessions": per_day.get(start + timedelta(days=offset), 0),
+        }
+        for offset in range(days)
+    ]
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def get_contacts_chart(
+    db: Session, client_id: uuid.UUID, months: int = 6
+) -> List[Dict[str, Any]]:
+    """Number of contacts at the end of each of the last ``months`` months"""
+    today = _today()
+    first = _add_months(date(today.year, today.month, 1), -(months - 1))
+    filters = [
+        DashboardDailyRollup.client_id == client_id,
+        DashboardDailyRollup.metric == "contacts",
+    ]
+
+    running = (
+        db.query(func.coalesce(func.sum(_net()), 0))
+        .filter(*filters, DashboardDailyRollup.day < first)
+        .scalar()
+    )
+    month_of = cast(func.date_trunc("month", DashboardDailyRollup.day), Date)
+    rows = (
+        db.query(month_of.label("month"), func.sum(_net()).label("net"))
+        .filter(*filters, DashboardDailyRollup.day >= first)
+        .group_by(month_of)
+        .all()
+    )
+    per_month = {row.month: int(row.net) for row in rows}
+
+    data = []
+    running = int(running)
+    for offset in range(months):
+        month = _add_months(first, offset)
+        running += per_month.get(month, 0)
+        data.append({"month": f"{month:%Y-%m}", "contacts": running})
+    return data
+
+
+def get_recent_activity(
+    db: Session, client_id: uuid.UUID, limit: int = 10
+) -> List[Dict[str, Any]]:
+    """Latest audited actions of the client's users"""
+    # The date bound keeps the query on the newest audit_logs partitions
+    since = datetime.now(timezone.utc) - timedelta(
+        days=settings.DASHBOARD_GROWTH_DAYS
+    )
+    rows = (
+        db.query(
+            AuditLog.action, AuditLog.resource_type, AuditLog.created_at, User.email
+        )
+        .join(User, User.id == AuditLog.user_id)
+        .filter(
+            User.client_id == client_id,
+            AuditLog.created_at >= since,
+            AuditLog.action.notin_(QUIET_AUDIT_ACTIONS),
+        )
+        .order_by(AuditLog.created_at.desc())
+        .limit(limit)
+        .all()
+    )
+    return [
+        {
+            "action": f"{row.action} {row.resource_type}",
+            "time": row.created_at.isoformat(),
+            "user": row.email,
+        }
+        for row in rows
+    ]
+
+
+class DashboardCache:
+    """Short-lived per-client cache of computed dashboard payloads."""
+
+    def __init__(self, ttl: int, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = (
+            OrderedDict()
+        )
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_load(self, client_id: uuid.UUID, name: str, loader: Callable[[], Any]):
+        if self.ttl <= 0:
+            return loader()
+
+        key = (str(client_id), name)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        value = loader()
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+class DashboardAggregator:
+    """Installs the rollup triggers and keeps the session rollups current."""
+
+    def __init__(self, interval: float, lag: float):
+        self.interval = interval
+        self.lag = lag
+        self._task: Optional[asyncio.Task] = None
+        self._triggers_ready = False
+        self.sessions_added = 0
+        self.failures = 0
+        self.last_run: Optional[datetime] = None
+
+    def start(self):
+        if self.interval > 0 and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._run())
+            logger.info("Dashboard aggregator started")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.to_thread(self.run_once)
+            except Exception as e:
+                self.failures += 1
+                logger.error(f"Dashboard aggregation error: {e}")
+            await asyncio.sleep(self.interval)
+
+    def run_once(self):
+        db = SessionLocal()
+        try:
+            locked = db.execute(
+                text("SELECT pg_try_advisory_xact_lock(:key)"),
+                {"key": ROLLUP_LOCK_KEY},
+            ).scalar()
+            if not locked:
+                db.rollback()
+                return
+
+            if not self._triggers_ready:
+                installed = ensure_rollup_triggers(db)
+                if installed:
+                    logger.info(f"Dashboard rollup triggers installed on {installed}")
+                # Tables created later (e.g. CRM) are picked up on the next run
+                tables = _existing_tables(db)
+                self._triggers_ready = len(installed) == 0 and all(
+                    table in tables
+                    for table in [entry[0] for entry in COUNTED_TABLES]
+                    + [SESSIONS_SOURCE]
+                )
+
+            added = aggregate_sessions(db, self.lag)
+            db.commit()
+            self.sessions_added += added
+            self.last_run = datetime.now(timezone.utc)
+        except SQLAlchemyError:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "triggers_ready": self._triggers_ready,
+            "session_rollup_rows": self.sessions_added,
+            "failures": self.failures,
+            "last_run": self.last_run.isoformat() if self.last_run else None,
+        }
+
+
+dashboard_cache = DashboardCache(
+    ttl=settings.DASHBOARD_CACHE_TTL, max_size=settings.DASHBOARD_CACHE_MAX_SIZE
+)
+
+dashboard_aggregator = DashboardAggregator(
+    interval=settings.DASHBOARD_ROLLUP_INTERVAL, lag=settings.DASHBOARD_ROLLUP_LAG
+)
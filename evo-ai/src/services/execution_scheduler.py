@@ -0,0 +1,278 @@
+"""
+┌──────────────────────────────────────────────────────────────────────────────┐
+│ @author: Davidson Gomes                                                      │
+│ @file: execution_scheduler.py                                                │
+│ Developed by: Davidson Gomes                                                 │
+│ Creation date: October 17, 2026                                              │
+│ Contact: contato@evolution-api.com                                           │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @copyright © Evolution API 2025. All rights reserved.                        │
+│ Licensed under the Apache License, Version 2.0                               │
+│                                                                              │
+│ You may not use this file except in compliance with the License.             │
+│ You may obtain a copy of the License at                                      │
+│                                                                              │
+│    http://www.apache.org/licenses/LICENSE-2.0                                │
+│                                                                              │
+│ Unless required by applicable law or agreed to in writing, software          │
+│ distributed under the License is distributed on an "AS IS" BASIS,            │
+│ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.     │
+│ See the License for the specific language governing permissions and          │
+│ limitations under the License.                                               │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @important                                                                   │
+│ For any future changes to the code in this file, it is recommended to        │
+│ include, together with the modification, the information of the developer    │
+│ who changed it and the date of modification.                                 │
+└──────────────────────────────────────────────────────────────────────────────┘
+"""
+
+"""
+Bounded-concurrency scheduler for agent executions.
+
+Every chat, A2A and WebSocket turn takes a slot here before running the agent.
+The scheduler enforces a global and a per-client concurrency limit and, when
+slots are busy, queues the turn with weighted fair queuing between clients so
+a single busy tenant cannot starve the others. When the queues are full, or a
+turn waits longer than the queue timeout, TooManyRequestsError is raised so
+the API can answer with back-pressure (HTTP 429 / JSON-RPC error).
+"""
+
+import asyncio
+import itertools
+import logging
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+
+from src.config.settings import settings
+from src.core.exceptions import TooManyRequestsError
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Waiter:
+    finish_tag: float
+    seq: int
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class _Tenant:
+    weight: float = 1.0
+    running: int = 0
+    last_finish_tag: float = 0.0
+    queue: Deque[_Waiter] = field(default_factory=deque)
+
+
+def parse_client_weights(raw: str) -> Dict[str, float]:
+    """Parse "client_id:weight,client_id:weight" into a mapping."""
+    weights = {}
+    for item in (raw or "").split(","):
+        if ":" not in item:
+            continue
+        client_id, weight = item.rsplit(":", 1)
+        try:
+            weights[client_id.strip()] = max(float(weight), 0.01)
+        except ValueError:
+            logger.warning(f"Ignoring invalid scheduler weight: {item}")
+    return weights
+
+
+class ExecutionScheduler:
+    """Global and per-client concurrency limits with weighted fair queuing."""
+
+    def __init__(
+        self,
+        max_concurrent: int = 32,
+        max_concurrent_per_client: int = 8,
+        max_queue: int = 200,
+        max_queue_per_client: int = 50,
+        queue_timeout: float = 30,
+        client_weights: Optional[Dict[str, float]] = None,
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_concurrent_per_client = max_concurrent_per_client
+        self.max_queue = max_queue
+        self.max_queue_per_client = max_queue_per_client
+        self.queue_timeout = queue_timeout
+        self.client_weights = client_weights or {}
+        self._tenants: Dict[str, _Tenant] = {}
+        self._running = 0
+        self._queued = 0
+        self._virtual_time = 0.0
+        self._seq = itertools.count()
+        self.started = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _get_tenant(self, client_id: str) -> _Tenant:
+        tenant = self._tenants.get(client_id)
+        if tenant is None:
+            tenant = _Tenant(weight=self.client_weights.get(client_id, 1.0))
+            self._tenants[client_id] = tenant
+        return tenant
+
+    def retry_after(self) -> int:
+        """Seconds a rejected caller should wait, based on the average queue wait."""
+        average_wait = self.total_wait / self.started if self.started else 0
+        return max(1, math.ceil(average_wait))
+
+    def _reject(self, message: str) -> TooManyRequestsError:
+        self.rejected += 1
+        logger.warning(f"Execution rejected: {message}")
+        return TooManyRequestsError(message, retry_after=self.retry_after())
+
+    def would_reject(self, client_id: Any) -> bool:
+        """Whether a new turn for this client would be rejected right now."""
+        tenant = self._tenants.get(str(client_id))
+        if self._can_start(tenant):
+            return False
+        queued = len(tenant.queue) if tenant else 0
+        return self._queued >= self.max_queue or queued >= self.max_queue_per_client
+
+    def _can_start(self, tenant: Optional[_Tenant]) -> bool:
+        running = tenant.running if tenant else 0
+        return (
+            self._running < self.max_concurrent
+            and running < self.max_concurrent_per_client
+        )
+
+    def _start(self, tenant: _Tenant, waited: float) -> None:
+        tenant.running += 1
+        self._running += 1
+        self.started += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+
+    async def acquire(self, client_id: Any) -> None:
+        """Wait for an execution slot for the client or raise TooManyRequestsError."""
+        key = str(client_id)
+        tenant = self._get_tenant(key)
+
+        # Queued turns are always blocked by a limit, so a free slot is fair game
+        if self._can_start(tenant):
+            self._start(tenant, 0.0)
+            return
+
+        if self._queued >= self.max_queue:
+            self._cleanup(key)
+            raise self._reject("Execution queue is full")
+        if len(tenant.queue) >= self.max_queue_per_client:
+            raise self._reject("Too many queued executions for this client")
+
+        finish_tag = (
+            max(self._virtual_time, tenant.last_finish_tag) + 1.0 / tenant.weight
+        )
+        tenant.last_finish_tag = finish_tag
+        waiter = _Waiter(
+            finish_tag=finish_tag,
+            seq=next(self._seq),
+            future=asyncio.get_running_loop().create_future(),
+        )
+        tenant.queue.append(waiter)
+        self._queued += 1
+
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), self.queue_timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.future.done():
+                # The slot was granted while we were giving up; hand it back
+                self.release(key)
+            else:
+                waiter.future.cancel()
+                tenant.queue.remove(waiter)
+                self._queued -= 1
+                self._cleanup(key)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            self.timed_out += 1
+            raise self._reject(
+                f"No execution slot available after {self.queue_timeout}s"
+            )
+
+    def release(self, client_id: Any) -> None:
+        key = str(client_id)
+        tenant = self._tenants.get(key)
+        if tenant is None or tenant.running == 0:
+            return
+        tenant.running -= 1
+        self._running -= 1
+        self._dispatch()
+        self._cleanup(key)
+
+    def _dispatch(self) -> None:
+        """Start queued turns in finish-tag order while slots are free."""
+        while self._running < self.max_concurrent:
+            best_tenant = None
+            for tenant in self._tenants.values():
+                if not tenant.queue or tenant.running >= self.max_concurrent_per_client:
+                    continue
+                head = tenant.queue[0]
+                if best_tenant is None or (head.finish_tag, head.seq) < (
+                    best_tenant.queue[0].finish_tag,
+                    best_tenant.queue[0].seq,
+                ):
+                    best_tenant = tenant
+            if best_tenant is None:
+                return
+
+            waiter = best_tenant.queue.popleft()
+            self._queued -= 1
+            self._virtual_time = waiter.finish_tag
+            self._start(best_tenant, time.monotonic() - waiter.enqueued_at)
+            waiter.future.set_result(None)
+
+    def _cleanup(self, key: str) -> None:
+        tenant = self._tenants.get(key)
+        if tenant is not None and tenant.running == 0 and not tenant.queue:
+            del self._tenants[key]
+
+    @asynccontextmanager
+    async def slot(self, client_id: Any) -> AsyncIterator[None]:
+        """Hold an execution slot for the duration of the block."""
+        await self.acquire(client_id)
+        try:
+            yield
+        finally:
+            self.release(client_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_concurrent_per_client": self.max_concurrent_per_client,
+            "running": self._running,
+            "queue_depth": self._queued,
+            "started": self.started,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "avg_wait_seconds": (
+                round(self.total_wait / self.started, 4) if self.started else 0.0
+            ),
+            "max_wait_seconds": round(self.max_wait, 4),
+            "clients": {
+                client_id: {
+                    "running": tenant.running,
+                    "queued": len(tenant.queue),
+                    "weight": tenant.weight,
+                }
+                for client_id, tenant in self._tenants.items()
+            },
+        }
+
+
+execution_scheduler = ExecutionScheduler(
+    max_concurrent=settings.SCHEDULER_MAX_CONCURRENT_RUNS,
+    max_concurrent_per_client=settings.SCHEDULER_MAX_CONCURRENT_RUNS_PER_CLIENT,
+    max_queue=settings.SCHEDULER_MAX_QUEUE,
+    max_queue_per_client=settings.SCHEDULER_MAX_QUEUE_PER_CLIENT,
+    queue_timeout=settings.SCHEDULER_QUEUE_TIMEOUT,
+    client_weights=parse_client_weights(settings.SCHEDULER_CLIENT_WEIGHTS),
+)
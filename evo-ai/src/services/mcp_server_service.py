@@ -31,6 +31,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from fastapi import HTTPException, status
 from src.models.models import MCPServer
+from src.services.adk.agent_cache import agent_cache
 from src.schemas.schemas import MCPServerCreate
 from src.utils.mcp_discovery import discover_mcp_tools
 from typing import List, Optional
@@ -40,6 +41,11 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+def mcp_server_dependency(server_id) -> str:
+    """Dependency tag recorded in the agent cache for trees using this server"""
+    return f"mcp_server:{server_id}"
+
+
 def get_mcp_server(db: Session, server_id: uuid.UUID) -> Optional[MCPServer]:
     """Search for an MCP server by ID"""
     try:
@@ -116,6 +122,8 @@ def update_mcp_server(
 
         db.commit()
         db.refresh(db_server)
+        # Cached trees hold tools bound to the old configuration
+        agent_cache.invalidate(mcp_server_dependency(server_id))
         logger.info(f"MCP server updated successfully: {server_id}")
         return db_server
     except SQLAlchemyError as e:
@@ -136,6 +144,7 @@ def delete_mcp_server(db: Session, server_id: uuid.UUID) -> bool:
 
         db.delete(db_server)
         db.commit()
+        agent_cache.invalidate(mcp_server_dependency(server_id))
         logger.info(f"MCP server removed successfully: {server_id}")
         return True
     except SQLAlchemyError as e:
@@ -0,0 +1,507 @@
+"""
+┌──────────────────────────────────────────────────────────────────────────────┐
+│ @author: Davidson Gomes                                                      │
+│ @file: push_notification_service.py                                          │
+│ Developed by: Davidson Gomes                                                 │
+│ Creation date: October 17, 2026                                              │
+│ Contact: contato@evolution-api.com                                           │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @copyright © Evolution API 2025. All rights reserved.                        │
+│ Licensed under the Apache License, Version 2.0                               │
+│                                                                              │
+│ You may not use this file except in compliance with the License.             │
+│ You may obtain a copy of the License at                                      │
+│                                                                              │
+│    http://www.apache.org/licenses/LICENSE-2.0                                │
+│                                                                              │
+│ Unless required by applicable law or agreed to in writing, software          │
+│ distributed under the License is distributed on an "AS IS" BASIS,            │
+│ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.     │
+│ See the License for the specific language governing permissions and          │
+│ limitations under the License.                                               │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @important                                                                   │
+│ For any future changes to the code in this file, it is recommended to        │
+│ include, together with the modification, the information of the developer    │
+│ who changed it and the date of modification.                                 │
+└──────────────────────────────────────────────────────────────────────────────┘
+"""
+
+"""
+Background delivery of A2A push notifications.
+
+Notifications are written to the push_notification_outbox table and delivered
+by a dispatcher running in every worker. Rows are claimed in batches with
+SELECT ... FOR UPDATE SKIP LOCKED, so several workers can share the outbox.
+Deliveries use the shared HTTP client, are capped per destination host across
+all workers, are retried with exponential backoff and are dead-lettered after
+the last attempt.
+"""
+
+import asyncio
+import json
+import logging
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import httpx
+from fastapi import HTTPException, status
+from sqlalchemy import func, select, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from src.config.database import SessionLocal
+from src.config.settings import settings
+from src.models.models import PushNotificationOutbox
+from src.utils.http_client import get_http_client
+
+logger = logging.getLogger(__name__)
+
+# Status codes worth retrying; any other non-2xx answer is dead-lettered
+RETRYABLE_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+
+# Advisory lock held while a worker claims outbox rows
+CLAIM_LOCK_KEY = 7310252
+
+
+def build_push_request(
+    push_notification_config: Dict[str, Any],
+) -> Tuple[str, Dict[str, str]]:
+    """Resolve the webhook URL and headers of a PushNotificationConfig (A2A spec 9.5).
+
+    Alternative formats supported for compatibility:
+    - webhookUrl instead of url
+    - webhookAuthenticationInfo instead of authentication
+    """
+    webhook_url = push_notification_config.get("url") or push_notification_config.get(
+        "webhookUrl"
+    )
+    webhook_token = push_notification_config.get("token")
+    authentication = push_notification_config.get(
+        "authentication"
+    ) or push_notification_config.get("webhookAuthenticationInfo")
+
+    if not webhook_url:
+        raise ValueError("pushNotificationConfig.url (or webhookUrl) is required")
+
+    # A2A spec: url MUST be HTTPS to prevent SSRF
+    if not webhook_url.startswith("https://"):
+        raise ValueError(
+            "pushNotificationConfig.url MUST use HTTPS to prevent SSRF attacks"
+        )
+
+    headers = {
+        "Content-Type": "application/json",
+        "User-Agent": f"A2A-Server/{getattr(settings, 'API_VERSION', '1.0.0')}",
+    }
+
+    # A2A spec: server SHOULD include the client token in X-A2A-Notification-Token
+    if webhook_token:
+        headers["X-A2A-Notification-Token"] = webhook_token
+
+    if not authentication:
+        return webhook_url, headers
+
+    auth_type = authentication.get("type")
+
+    if auth_type == "none":
+        pass
+
+    # Schemes-based authentication (official A2A spec format)
+    elif "schemes" in authentication:
+        auth_credentials = authentication.get("credentials")
+
+        for scheme in authentication.get("schemes", []):
+            if scheme.lower() == "bearer":
+                if auth_credentials:
+                    headers["Authorization"] = f"Bearer {auth_credentials}"
+                else:
+                    logger.warning("Bearer scheme specified but no credentials provided")
+
+            elif scheme.lower() == "apikey":
+                if not auth_credentials:
+                    logger.warning("ApiKey scheme specified but no credentials provided")
+                    continue
+                try:
+                    # A2A spec example: {"in": "header", "name": "X-Client-Webhook-Key", "value": "actual_key"}
+                    if isinstance(auth_credentials, str):
+                        cred_data = json.loads(auth_credentials)
+                    else:
+                        cred_data = auth_credentials
+
+                    if cred_data.get("in") == "header" and cred_data.get("value"):
+                        headers[cred_data.get("name", "X-API-Key")] = cred_data["value"]
+                except (json.JSONDecodeError, TypeError, AttributeError):
+                    # Fallback: treat credentials as direct API key value
+                    headers["X-API-Key"] = str(auth_credentials)
+
+            else:
+                logger.warning(f"Unsupported authentication scheme: {scheme}")
+
+    # Basic authentication types (alternative format)
+    elif auth_type == "bearer":
+        token = authentication.get("token") or authentication.get("credentials")
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+
+    elif auth_type == "apikey":
+        api_key = (
+            authentication.get("apiKey")
+            or authentication.get("key")
+            or authentication.get("credentials")
+        )
+        if api_key:
+            headers[authentication.get("headerName", "X-API-Key")] = api_key
+
+    else:
+        logger.warning(f"Unsupported authentication type: {auth_type}")
+
+    return webhook_url, headers
+
+
+def enqueue_push_notification(
+    db: Session,
+    payload: Dict[str, Any],
+    push_notification_config: Dict[str, Any],
+    task_id: Optional[str] = None,
+) -> PushNotificationOutbox:
+    """Store a notification in the outbox; the dispatcher delivers it in the background"""
+    # Validate now so a bad config is reported to the caller, not dead-lettered later
+    webhook_url, _ = build_push_request(push_notification_config)
+
+    try:
+        notification = PushNotificationOutbox(
+            task_id=uuid.UUID(str(task_id)) if task_id else None,
+            url=webhook_url,
+            destination=urlparse(webhook_url).netloc,
+            payload=payload,
+            push_config=push_notification_config,
+            status="pending",
+            attempts=0,
+        )
+        db.add(notification)
+        db.commit()
+        db.refresh(notification)
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error(f"Error queuing push notification: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error queuing push notification",
+        )
+
+    push_dispatcher.wake()
+    logger.info(f"Push notification {notification.id} queued for {webhook_url}")
+    return notification
+
+
+def get_outbox_stats(db: Session) -> Dict[str, int]:
+    """Count outbox rows by status"""
+    rows = (
+        db.query(PushNotificationOutbox.status, func.count(PushNotificationOutbox.id))
+        .group_by(PushNotificationOutbox.status)
+        .all()
+    )
+    return {row_status: count for row_status, count in rows}
+
+
+class PushNotificationDispatcher:
+    """Claims due outbox rows and delivers them with bounded concurrency."""
+
+    def __init__(
+        self,
+        workers: int = 10,
+        per_destination: int = 2,
+        batch_size: int = 50,
+        poll_interval: float = 2.0,
+        max_attempts: int = 8,
+        backoff_base: float = 2.0,
+        backoff_max: float = 3600.0,
+        timeout: float = 30.0,
+    ):
+        self.workers = workers
+        self.per_destination = per_destination
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        # Claimed rows become due again after this lease if a worker dies mid-delivery
+        self.lease = timedelta(seconds=timeout * 2)
+        self._wake_event: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._worker_slots: Optional[asyncio.Semaphore] = None
+        self._in_flight: set = set()
+        self.delivered = 0
+        self.retried = 0
+        self.dead_lettered = 0
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._wake_event = asyncio.Event()
+            self._worker_slots = asyncio.Semaphore(self.workers)
+            self._task = asyncio.create_task(self._run())
+            logger.info("Push notification dispatcher started")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+
+    def wake(self):
+        if self._wake_event is not None:
+            self._wake_event.set()
+
+    async def _run(self):
+        while True:
+            try:
+                claimed = await self._dispatch_batch()
+            except Exception as e:
+                logger.error(f"Push notification dispatcher error: {e}")
+                claimed = 0
+
+            # A full batch means more rows are probably due; loop right away
+            if claimed >= self.batch_size:
+                continue
+
+            try:
+                await asyncio.wait_for(self._wake_event.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake_event.clear()
+
+    async def _dispatch_batch(self) -> int:
+        # Only claim what the workers can take right now
+        capacity = min(self.batch_size, self.workers - len(self._in_flight))
+        if capacity <= 0:
+            return 0
+
+        notifications = self._claim(capacity)
+        for notification in notifications:
+            await self._worker_slots.acquire()
+            delivery = asyncio.create_task(self._deliver(notification))
+            self._in_flight.add(delivery)
+            delivery.add_done_callback(self._delivery_done)
+        return len(notifications)
+
+    def _delivery_done(self, delivery: asyncio.Task):
+        self._in_flight.discard(delivery)
+        self._worker_slots.release()
+        # A worker is free again; pick up rows that were left unclaimed
+        self.wake()
+
+    def _claim(self, limit: int) -> list:
+        """Lock due rows, push their next attempt past the lease and return detached copies.
+
+        The per-destination cap counts the leased deliveries of every worker.
+        Claims are serialized with a transaction-level advisory lock, so two
+        workers never both fill the same free slots of a destination.
+        """
+        db = SessionLocal()
+        try:
+            db.execute(
+                text("SELECT pg_advisory_xact_lock(:key)"), {"key": CLAIM_LOCK_KEY}
+            )
+            now = datetime.now(timezone.utc)
+
+            # Deliveries in flight on any worker: rows still within their lease
+            in_flight = dict(
+                db.query(
+                    PushNotificationOutbox.destination,
+                    func.count(PushNotificationOutbox.id),
+                )
+                .filter(
+                    PushNotificationOutbox.status == "delivering",
+                    PushNotificationOutbox.next_attempt_at > now,
+                )
+                .group_by(PushNotificationOutbox.destination)
+                .all()
+            )
+            room = {
+                destination: self.per_destination - count
+                for destination, count in in_flight.items()
+            }
+            saturated = [
+                destination for destination, free in room.items() if free <= 0
+            ]
+
+            due = [
+                PushNotificationOutbox.status.in_(["pending", "delivering"]),
+                PushNotificationOutbox.next_attempt_at <= now,
+            ]
+            if saturated:
+                due.append(PushNotificationOutbox.destination.notin_(saturated))
+
+            # At most per_destination candidates per host, oldest first
+            ranked = (
+                db.query(
+                    PushNotificationOutbox.id,
+                    func.row_number()
+                    .over(
+                        partition_by=PushNotificationOutbox.destination,
+                        order_by=PushNotificationOutbox.next_attempt_at,
+                    )
+                    .label("rank"),
+                )
+                .filter(*due)
+                .subquery()
+            )
+            rows = (
+                db.query(PushNotificationOutbox)
+                .filter(
+                    *due,
+                    PushNotificationOutbox.id.in_(
+                        select(ranked.c.id).where(
+                            ranked.c.rank <= self.per_destination
+                        )
+                    ),
+                )
+                .order_by(PushNotificationOutbox.next_attempt_at)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+                .all()
+            )
+            claimed = []
+            lease_expires = now + self.lease
+            for row in rows:
+                free = room.get(row.destination, self.per_destination)
+                if free <= 0:
+                    # Left unclaimed; the lock is released on commit
+                    continue
+                room[row.destination] = free - 1
+                row.status = "delivering"
+                row.next_attempt_at = lease_expires
+                claimed.append(
+                    {
+                        "id": row.id,
+                        "url": row.url,
+                        "destination": row.destination,
+                        "payload": row.payload,
+                        "push_config": row.push_config,
+                        "attempts": row.attempts,
+                        # Identifies this claim; a re-claim sets a new deadline
+                        "lease_expires": lease_expires,
+                    }
+                )
+            db.commit()
+            return claimed
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.error(f"Error claiming push notifications: {str(e)}")
+            return []
+        finally:
+            db.close()
+
+    async def _deliver(self, notification: Dict[str, Any]):
+        error = None
+        retryable = True
+        try:
+            url, headers = build_push_request(notification["push_config"])
+            response = await get_http_client().post(
+                url,
+                headers=headers,
+                json=notification["payload"],
+                timeout=self.timeout,
+            )
+            if not 200 <= response.status_code < 300:
+                error = f"HTTP {response.status_code}: {response.text[:200]}"
+                retryable = response.status_code in RETRYABLE_STATUS_CODES
+        except ValueError as e:
+            error = str(e)
+            retryable = False
+        except httpx.HTTPError as e:
+            error = f"{type(e).__name__}: {e}"
+        except Exception as e:
+            # Anything else (e.g. a malformed push_config) still counts as an attempt
+            error = f"{type(e).__name__}: {e}"
+
+        self._record_result(notification, error, retryable)
+
+    def _record_result(
+        self, notification: Dict[str, Any], error: Optional[str], retryable: bool
+    ):
+        db = SessionLocal()
+        try:
+            # Only the worker still holding the lease records the result
+            row = (
+                db.query(PushNotificationOutbox)
+                .filter(
+                    PushNotificationOutbox.id == notification["id"],
+                    PushNotificationOutbox.status == "delivering",
+                    PushNotificationOutbox.next_attempt_at
+                    == notification["lease_expires"],
+                )
+                .with_for_update()
+                .first()
+            )
+            if row is None:
+                logger.warning(
+                    f"Push notification {notification['id']} was re-claimed after "
+                    "its lease expired; result discarded"
+                )
+                return
+
+            row.attempts = notification["attempts"] + 1
+            if error is None:
+                row.status = "delivered"
+                row.delivered_at = datetime.now(timezone.utc)
+                row.last_error = None
+                self.delivered += 1
+                logger.info(f"Push notification {row.id} delivered to {row.url}")
+            elif not retryable or row.attempts >= self.max_attempts:
+                row.status = "dead"
+                row.last_error = error
+                self.dead_lettered += 1
+                logger.error(
+                    f"Push notification {row.id} dead-lettered after {row.attempts} attempts: {error}"
+                )
+            else:
+                delay = min(
+                    self.backoff_max, self.backoff_base ** row.attempts
+                ) * random.uniform(0.8, 1.2)
+                row.status = "pending"
+                row.last_error = error
+                row.next_attempt_at = datetime.now(timezone.utc) + timedelta(
+                    seconds=delay
+                )
+                self.retried += 1
+                logger.warning(
+                    f"Push notification {row.id} failed ({error}), retry in {delay:.0f}s"
+                )
+            db.commit()
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.error(f"Error recording push notification result: {str(e)}")
+        finally:
+            db.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "in_flight": len(self._in_flight),
+            "delivered": self.delivered,
+            "retried": self.retried,
+            "dead_lettered": self.dead_lettered,
+        }
+
+
+push_dispatcher = PushNotificationDispatcher(
+    workers=settings.PUSH_NOTIFICATION_WORKERS,
+    per_destination=settings.PUSH_NOTIFICATION_MAX_PER_DESTINATION,
+    batch_size=settings.PUSH_NOTIFICATION_BATCH_SIZE,
+    poll_interval=settings.PUSH_NOTIFICATION_POLL_INTERVAL,
+    max_attempts=settings.PUSH_NOTIFICATION_MAX_ATTEMPTS,
+    backoff_base=settings.PUSH_NOTIFICATION_BACKOFF_BASE,
+    backoff_max=settings.PUSH_NOTIFICATION_BACKOFF_MAX,
+    timeout=settings.PUSH_NOTIFICATION_TIMEOUT,
+)
@@ -28,21 +28,34 @@
 """
 
 import os
-from google.adk.artifacts.in_memory_artifact_service import InMemoryArtifactService
 from google.adk.sessions import DatabaseSessionService
-from google.adk.memory import InMemoryMemoryService
+from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
 
 load_dotenv()
 
+from src.config.database import engine
 from src.services.crewai.session_service import CrewSessionService
+from src.services.adk.artifact_service import create_artifact_service
+from src.services.adk.memory_service import create_memory_service
+
+
+def _share_engine(service: DatabaseSessionService) -> DatabaseSessionService:
+    """Move the ADK session service onto the shared connection pool"""
+    own_engine = service.db_engine
+    service.db_engine = engine
+    service.DatabaseSessionFactory = sessionmaker(bind=engine)
+    # The service's own engine is only needed for its startup table checks
+    own_engine.dispose()
+    return service
+
 
 if os.getenv("AI_ENGINE") == "crewai":
-    session_service = CrewSessionService(db_url=os.getenv("POSTGRES_CONNECTION_STRING"))
+    session_service = CrewSessionService(engine=engine)
 else:
-    session_service = DatabaseSessionService(
-        db_url=os.getenv("POSTGRES_CONNECTION_STRING")
+    session_service = _share_engine(
+        DatabaseSessionService(db_url=os.getenv("POSTGRES_CONNECTION_STRING"))
     )
 
-artifacts_service = InMemoryArtifactService()
-memory_service = InMemoryMemoryService()
+artifacts_service = create_artifact_service()
+memory_service = create_memory_service()
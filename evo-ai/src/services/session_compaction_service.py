@@ -0,0 +1,514 @@
+"""
+┌──────────────────────────────────────────────────────────────────────────────┐
+│ @author: Davidson Gomes                                                      │
+│ @file: session_compaction_service.py                                         │
+│ Developed by: Davidson Gomes                                                 │
+│ Creation date: October 17, 2026                                              │
+│ Contact: contato@evolution-api.com                                           │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @copyright © Evolution API 2025. All rights reserved.                        │
+│ Licensed under the Apache License, Version 2.0                               │
+│                                                                              │
+│ You may not use this file except in compliance with the License.             │
+│ You may obtain a copy of the License at                                      │
+│                                                                              │
+│    http://www.apache.org/licenses/LICENSE-2.0                                │
+│                                                                              │
+│ Unless required by applicable law or agreed to in writing, software          │
+│ distributed under the License is distributed on an "AS IS" BASIS,            │
+│ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.     │
+│ See the License for the specific language governing permissions and          │
+│ limitations under the License.                                               │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @important                                                                   │
+│ For any future changes to the code in this file, it is recommended to        │
+│ include, together with the modification, the information of the developer    │
+│ who changed it and the date of modification.                                 │
+└──────────────────────────────────────────────────────────────────────────────┘
+"""
+
+"""
+Compaction of long ADK sessions.
+
+The ADK session service replays every stored event of a session into each
+run, so recurring contacts get slower and more expensive over time. Agents
+that enable ``session_compaction`` in their config have the older events of
+a session moved to the session_event_archive table once the session passes
+the configured size; a single summary event takes their place so the hot
+events table keeps a bounded tail per session.
+
+Compaction is scheduled in the background after each run and by a periodic
+sweep. The session row is locked with SKIP LOCKED while events are moved, so
+workers never compact the same session twice.
+"""
+
+import asyncio
+import logging
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from google.adk.events.event_actions import EventActions
+from google.adk.sessions.database_session_service import StorageEvent
+from google.genai import types
+from pydantic import ValidationError
+from sqlalchemy import Text, cast, func, or_, tuple_
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.config.database import SessionLocal
+from src.config.settings import settings
+from src.models.models import Agent, SessionEventArchive
+from src.models.models import Session as SessionModel
+from src.schemas.agent_config import SessionCompactionConfig
+from src.services.apikey_service import get_decrypted_api_key
+
+logger = logging.getLogger(__name__)
+
+# Author of the summary events; ADK shows them to the model as context
+SUMMARY_AUTHOR = "session_summary"
+
+# Maximum transcript size sent to the summarization model
+MAX_TRANSCRIPT_CHARS = 60000
+
+SUMMARY_PROMPT = (
+    "Summarize the conversation below so it can replace the original messages "
+    "as context for future turns. Keep names, identifiers, decisions, open "
+    "questions and user preferences. Answer with the summary only, in the "
+    "language of the conversation, in at most {max_chars} characters."
+)
+
+
+@dataclass
+class CompactionTarget:
+    """Detached snapshot of the agent a session belongs to"""
+
+    agent_id: str
+    agent_type: str
+    model: Optional[str]
+    api_key_id: Optional[uuid.UUID]
+    config: SessionCompactionConfig
+
+
+def get_compaction_config(agent: Agent) -> Optional[SessionCompactionConfig]:
+    """Return the enabled session compaction config of an agent, if any"""
+    config = agent.config if isinstance(agent.config, dict) else None
+    if not config or not config.get("session_compaction"):
+        return None
+
+    try:
+        compaction = SessionCompactionConfig(**config["session_compaction"])
+    except ValidationError as e:
+        logger.warning(f"Invalid session_compaction config for agent {agent.id}: {e}")
+        return None
+
+    return compaction if compaction.enabled else None
+
+
+def _session_filters(app_name: str, user_id: str, session_id: str) -> list:
+    return [
+        StorageEvent.app_name == app_name,
+        StorageEvent.user_id == user_id,
+        StorageEvent.session_id == session_id,
+    ]
+
+
+def _content_text(content: Any) -> str:
+    if not isinstance(content, dict):
+        return ""
+    parts = content.get("parts") or []
+    return " ".join(
+        part["text"].strip()
+        for part in parts
+        if isinstance(part, dict) and part.get("text")
+    )
+
+
+def _extractive_summary(lines: List[str], max_chars: int) -> str:
+    """Keep the newest transcript lines that fit in max_chars"""
+    kept = []
+    size = 0
+    for line in reversed(lines):
+        if size + len(line) + 1 > max_chars:
+            break
+        kept.append(line)
+        size += len(line) + 1
+
+    kept.reverse()
+    if len(kept) < len(lines):
+        kept.insert(0, f"[{len(lines) - len(kept)} earlier messages omitted]")
+    return "\n".join(kept)[:max_chars]
+
+
+class SessionCompactor:
+    """Compacts sessions in the background and sweeps for oversized ones."""
+
+    def __init__(self, interval: float, batch_size: int):
+        self.interval = interval
+        self.batch_size = batch_size
+        self._task: Optional[asyncio.Task] = None
+        self._pending: Dict[str, asyncio.Task] = {}
+        self.compactions = 0
+        self.events_archived = 0
+        self.llm_summaries = 0
+        self.extractive_summaries = 0
+        self.failures = 0
+
+    def start(self):
+        if self.interval > 0 and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._run())
+            logger.info("Session compactor started")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._pending:
+            await asyncio.gather(*self._pending.values(), return_exceptions=True)
+
+    def schedule(self, agent: Agent, session_id: str):
+        """Compact a session in the background if its agent enables compaction"""
+        config = get_compaction_config(agent)
+        if config is None or session_id in self._pending:
+            return
+
+        target = CompactionTarget(
+            agent_id=str(agent.id),
+            agent_type=agent.type,
+            model=agent.model,
+            api_key_id=agent.api_key_id,
+            config=config,
+        )
+        task = asyncio.create_task(self._compact_if_needed(target, session_id))
+        self._pending[session_id] = task
+        task.add_done_callback(lambda _: self._pending.pop(session_id, None))
+
+    async def _run(self):
+        while True:
+            try:
+                await self.sweep()
+            except Exception as e:
+                logger.error(f"Session compaction sweep error: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def sweep(self):
+        """Compact the oversized sessions of every agent that enables compaction"""
+        targets = await asyncio.to_thread(self._load_targets)
+        for target in targets:
+            session_ids = await asyncio.to_thread(self._oversized_sessions, target)
+            for session_id in session_ids:
+                if session_id not in self._pending:
+                    await self._compact_if_needed(target, session_id)
+
+    def _load_targets(self) -> List[CompactionTarget]:
+        db = SessionLocal()
+        try:
+            targets = []
+            for agent in db.query(Agent).all():
+                config = get_compaction_config(agent)
+                if config is not None:
+                    targets.append(
+                        CompactionTarget(
+                            agent_id=str(agent.id),
+                            agent_type=agent.type,
+                            model=agent.model,
+                            api_key_id=agent.api_key_id,
+                            config=config,
+                        )
+                    )
+            return targets
+        finally:
+            db.close()
+
+    def _oversized_sessions(self, target: CompactionTarget) -> List[str]:
+        config = target.config
+        having = [func.count(StorageEvent.id) > config.max_events]
+        if config.max_bytes:
+            having.append(
+                func.sum(func.length(cast(StorageEvent.content, Text)))
+                > config.max_bytes
+            )
+
+        db = SessionLocal()
+        try:
+            rows = (
+                db.query(StorageEvent.session_id)
+                .filter(StorageEvent.app_name == target.agent_id)
+                .group_by(StorageEvent.session_id)
+                .having(func.count(StorageEvent.id) > config.keep_recent_events)
+                .having(or_(*having))
+                .limit(self.batch_size)
+                .all()
+            )
+            return [row.session_id for row in rows]
+        finally:
+            db.close()
+
+    async def _compact_if_needed(self, target: CompactionTarget, session_id: str):
+        try:
+            if await asyncio.to_thread(self._exceeds_threshold, target, session_id):
+                await self._compact(target, session_id)
+        except Exception as e:
+            self.failures += 1
+            logger.error(f"Error compacting session {session_id}: {e}")
+
+    def _exceeds_threshold(self, target: CompactionTarget, session_id: str) -> bool:
+        config = target.config
+        user_id = session_id.split("_", 1)[0]
+        db = SessionLocal()
+        try:
+            filters = _session_filters(target.agent_id, user_id, session_id)
+            count = db.query(func.count(StorageEvent.id)).filter(*filters).scalar()
+            if count <= config.keep_recent_events:
+                return False
+            if count > config.max_events:
+                return True
+            if config.max_bytes:
+                size = (
+                    db.query(
+                        func.coalesce(
+                            func.sum(func.length(cast(StorageEvent.content, Text))), 0
+                        )
+                    )
+                    .filter(*filters)
+                    .scalar()
+                )
+                return size > config.max_bytes
+            return False
+        finally:
+            db.close()
+
+    async def _compact(self, target: CompactionTarget, session_id: str):
+        """Summarize the events older than the kept tail and archive them"""
+        old_events = await asyncio.to_thread(self._load_old_events, target, session_id)
+        if not old_events:
+            return
+
+        lines = []
+        for event in old_events:
+            text = _content_text(event["content"])
+            if text:
+                lines.append(f"{event['author']}: {text}")
+
+        summary = None
+        if target.config.summarize and lines:
+            summary = await self._llm_summary(target, lines)
+        if summary:
+            self.llm_summaries += 1
+        else:
+            summary = _extractive_summary(lines, target.config.max_summary_chars)
+            self.extractive_summaries += 1
+
+        archived = await asyncio.to_thread(
+            self._archive, target, session_id, old_events, summary
+        )
+        if archived:
+            self.compactions += 1
+            self.events_archived += archived
+            logger.info(f"Compacted session {session_id}: {archived} events archived")
+
+    def _load_old_events(
+        self, target: CompactionTarget, session_id: str
+    ) -> List[Dict[str, Any]]:
+        user_id = session_id.split("_", 1)[0]
+        filters = _session_filters(target.agent_id, user_id, session_id)
+        db = SessionLocal()
+        try:
+            # Oldest event of the tail that stays in place
+            boundary = (
+                db.query(
+                    StorageEvent.timestamp,
+                    StorageEvent.id,
+                    StorageEvent.invocation_id,
+                )
+                .filter(*filters)
+                .order_by(StorageEvent.timestamp.desc(), StorageEvent.id.desc())
+                .offset(max(target.config.keep_recent_events - 1, 0))
+                .first()
+            )
+            if boundary is None:
+                return []
+
+            # Keep the boundary's whole invocation, so a function_call is never
+            # archived while its function_response stays in the tail
+            if boundary.invocation_id:
+                boundary = (
+                    db.query(StorageEvent.timestamp, StorageEvent.id)
+                    .filter(
+                        *filters, StorageEvent.invocation_id == boundary.invocation_id
+                    )
+                    .order_by(StorageEvent.timestamp.asc(), StorageEvent.id.asc())
+                    .first()
+                )
+
+            query = db.query(
+                StorageEvent.id,
+                StorageEvent.invocation_id,
+                StorageEvent.author,
+                StorageEvent.content,
+                StorageEvent.timestamp,
+            ).filter(*filters)
+            if target.config.keep_recent_events > 0:
+                query = query.filter(
+                    tuple_(StorageEvent.timestamp, StorageEvent.id)
+                    < tuple_(boundary.timestamp, boundary.id)
+                )
+
+            return [
+                {
+                    "id": row.id,
+                    "invocation_id": row.invocation_id,
+                    "author": row.author,
+                    "content": row.content,
+                    "timestamp": row.timestamp,
+                }
+                for row in query.order_by(
+                    StorageEvent.timestamp.asc(), StorageEvent.id.asc()
+                ).all()
+            ]
+        finally:
+            db.close()
+
+    async def _llm_summary(
+        self, target: CompactionTarget, lines: List[str]
+    ) -> Optional[str]:
+        if target.agent_type != "llm" or not target.model:
+            return None
+
+        try:
+            import litellm
+
+            api_key = None
+            if target.api_key_id:
+                db = SessionLocal()
+                try:
+                    api_key = get_decrypted_api_key(db, target.api_key_id)
+                finally:
+                    db.close()
+
+            max_chars = target.config.max_summary_chars
+            transcript = "\n".join(lines)[-MAX_TRANSCRIPT_CHARS:]
+            response = await litellm.acompletion(
+                model=target.model,
+                api_key=api_key,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": SUMMARY_PROMPT.format(max_chars=max_chars),
+                    },
+                    {"role": "user", "content": transcript},
+                ],
+            )
+            summary = response.choices[0].message.content
+            return summary.strip()[:max_chars] if summary else None
+        except Exception as e:
+            logger.warning(f"Falling back to extractive session summary: {e}")
+            return None
+
+    def _archive(
+        self,
+        target: CompactionTarget,
+        session_id: str,
+        old_events: List[Dict[str, Any]],
+        summary: str,
+    ) -> int:
+        user_id = session_id.split("_", 1)[0]
+        event_ids = [event["id"] for event in old_events]
+        summary_event_id = str(uuid.uuid4())
+
+        db = SessionLocal()
+        try:
+            # Another worker holding the row is already compacting this session
+            locked = (
+                db.query(SessionModel.id)
+                .filter(
+                    SessionModel.app_name == target.agent_id,
+                    SessionModel.user_id == user_id,
+                    SessionModel.id == session_id,
+                )
+                .with_for_update(skip_locked=True)
+                .first()
+            )
+            if locked is None:
+                return 0
+
+            filters = _session_filters(target.agent_id, user_id, session_id)
+            present = {
+                row.id
+                for row in db.query(StorageEvent.id)
+                .filter(*filters, StorageEvent.id.in_(event_ids))
+                .all()
+            }
+            archived = [event for event in old_events if event["id"] in present]
+            if not archived:
+                db.rollback()
+                return 0
+
+            db.bulk_save_objects(
+                [
+                    SessionEventArchive(
+                        event_id=event["id"],
+                        app_name=target.agent_id,
+                        user_id=user_id,
+                        session_id=session_id,
+                        invocation_id=event["invocation_id"],
+                        author=event["author"],
+                        content=event["content"],
+                        event_timestamp=event["timestamp"],
+                        summary_event_id=summary_event_id,
+                    )
+                    for event in archived
+                ]
+            )
+            db.query(StorageEvent).filter(
+                *filters, StorageEvent.id.in_(list(present))
+            ).delete(synchronize_session=False)
+
+            # The summary takes the place of the newest archived event
+            db.add(
+                StorageEvent(
+                    id=summary_event_id,
+                    app_name=target.agent_id,
+                    user_id=user_id,
+                    session_id=session_id,
+                    invocation_id=f"compaction-{summary_event_id}",
+                    author=SUMMARY_AUTHOR,
+                    timestamp=archived[-1]["timestamp"],
+                    content=types.Content(
+                        role="model",
+                        parts=[
+                            types.Part(text=f"Summary of earlier conversation:\n{summary}")
+                        ],
+                    ).model_dump(exclude_none=True),
+                    actions=EventActions(),
+                )
+            )
+            db.commit()
+            return len(archived)
+        except SQLAlchemyError as e:
+            db.rollback()
+            self.failures += 1
+            logger.error(f"Error archiving events of session {session_id}: {str(e)}")
+            return 0
+        finally:
+            db.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "pending": len(self._pending),
+            "compactions": self.compactions,
+            "events_archived": self.events_archived,
+            "llm_summaries": self.llm_summaries,
+            "extractive_summaries": self.extractive_summaries,
+            "failures": self.failures,
+        }
+
+
+session_compactor = SessionCompactor(
+    interval=settings.SESSION_COMPACTION_INTERVAL,
+    batch_size=settings.SESSION_COMPACTION_BATCH_SIZE,
+)
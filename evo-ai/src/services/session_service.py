@@ -28,16 +28,24 @@
 """
 
 from google.adk.sessions import DatabaseSessionService
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from src.models.models import Session as SessionModel
 from google.adk.events import Event
 from google.adk.sessions import Session as SessionADK
-from typing import Optional, List
+from google.adk.sessions.database_session_service import StorageEvent
+from google.genai import types
+from typing import Optional, List, Dict, Any, Tuple
 from fastapi import HTTPException, status
+from sqlalchemy import select, tuple_
 from sqlalchemy.exc import SQLAlchemyError
 
+from src.config.settings import settings
 from src.services.agent_service import get_agents_by_client
 
+from datetime import datetime
+import base64
+import json
 import uuid
 import logging
 
@@ -101,6 +109,37 @@ def get_sessions_by_agent(
         )
 
 
+def get_session_record(db: Session, session_id: str) -> Optional[dict]:
+    """Search for a session row by ID without loading its events"""
+    try:
+        session = db.query(SessionModel).filter(SessionModel.id == session_id).first()
+        return _session_to_dict(session) if session else None
+    except SQLAlchemyError as e:
+        logger.error(f"Error searching for session {session_id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error searching for session",
+        )
+
+
+async def get_session_record_async(
+    db: AsyncSession, session_id: str
+) -> Optional[dict]:
+    """Search for a session row by ID without blocking the event loop"""
+    try:
+        result = await db.execute(
+            select(SessionModel).where(SessionModel.id == session_id)
+        )
+        session = result.scalars().first()
+        return _session_to_dict(session) if session else None
+    except SQLAlchemyError as e:
+        logger.error(f"Error searching for session {session_id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error searching for session",
+        )
+
+
 def get_session_by_id(
     session_service: DatabaseSessionService, session_id: str
 ) -> Optional[SessionADK]:
@@ -197,3 +236,178 @@ def get_session_events(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error searching for events of session: {str(e)}",
         )
+
+
+def encode_events_cursor(timestamp: datetime, event_id: str) -> str:
+    """Encode the position of an event as an opaque pagination cursor"""
+    raw = json.dumps({"ts": timestamp.isoformat(), "id": event_id}).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("utf-8").rstrip("=")
+
+
+def decode_events_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Decode a cursor produced by encode_events_cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("utf-8")))
+        return datetime.fromisoformat(data["ts"]), str(data["id"])
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
+def _storage_event_to_event(storage_event: StorageEvent) -> Event:
+    """Convert a row of the ADK events table to an Event"""
+    content = storage_event.content
+    if isinstance(content, str):
+        content = json.loads(content)
+
+    event = Event(
+        id=storage_event.id,
+        author=storage_event.author,
+        branch=storage_event.branch,
+        invocation_id=storage_event.invocation_id,
+        content=types.Content.model_validate(content) if content else None,
+        timestamp=storage_event.timestamp.timestamp(),
+    )
+
+    # Optional columns vary between ADK releases
+    actions = getattr(storage_event, "actions", None)
+    if actions is not None:
+        event.actions = actions
+    for field in (
+        "long_running_tool_ids",
+        "grounding_metadata",
+        "partial",
+        "turn_complete",
+        "error_code",
+        "error_message",
+        "interrupted",
+    ):
+        value = getattr(storage_event, field, None)
+        if value is not None:
+            setattr(event, field, value)
+
+    return event
+
+
+def get_session_events_page(
+    db: Session,
+    session_id: str,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    before_timestamp: Optional[float] = None,
+    paged: bool = True,
+) -> Dict[str, Any]:
+    """Search for the newest events of a session, one page at a time.
+
+    Events are read straight from the events table, newest first, so only
+    ``limit`` rows are loaded no matter how long the session is. The page is
+    returned in chronological order; ``next_cursor`` points at older events.
+    With ``paged=False`` every matching event is returned in a single page.
+    """
+    if not session_id or "_" not in session_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid session ID. Expected format: app_name_user_id",
+        )
+
+    user_id, app_name = session_id.split("_", 1)
+    if not paged:
+        limit = None
+    else:
+        if not limit or limit <= 0:
+            limit = settings.SESSION_HISTORY_PAGE_SIZE
+        limit = min(limit, settings.SESSION_HISTORY_MAX_PAGE_SIZE)
+
+    try:
+        query = db.query(StorageEvent).filter(
+            StorageEvent.app_name == app_name,
+            StorageEvent.user_id == user_id,
+            StorageEvent.session_id == session_id,
+        )
+
+        if cursor:
+            cursor_ts, cursor_id = decode_events_cursor(cursor)
+            query = query.filter(
+                tuple_(StorageEvent.timestamp, StorageEvent.id)
+                < tuple_(cursor_ts, cursor_id)
+            )
+        if before_timestamp is not None:
+            query = query.filter(
+                StorageEvent.timestamp < datetime.fromtimestamp(before_timestamp)
+            )
+
+        query = query.order_by(StorageEvent.timestamp.desc(), StorageEvent.id.desc())
+        if limit is not None:
+            query = query.limit(limit + 1)
+        rows = query.all()
+
+        has_more = limit is not None and len(rows) > limit
+        rows = rows[:limit]
+        events = [_storage_event_to_event(row) for row in reversed(rows)]
+
+        next_cursor = None
+        if has_more and rows:
+            next_cursor = encode_events_cursor(rows[-1].timestamp, rows[-1].id)
+
+        return {"events": events, "next_cursor": next_cursor, "has_more": has_more}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error searching for events of session {session_id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error searching for events of session: {str(e)}",
+        )
+
+
+def count_session_events(db: Session, session_id: str) -> int:
+    """Count the events of a session without loading them"""
+    if not session_id or "_" not in session_id:
+        return 0
+
+    user_id, app_name = session_id.split("_", 1)
+    try:
+        return (
+            db.query(StorageEvent)
+            .filter(
+                StorageEvent.app_name == app_name,
+                StorageEvent.user_id == user_id,
+                StorageEvent.session_id == session_id,
+            )
+            .count()
+        )
+    except SQLAlchemyError as e:
+        logger.error(f"Error counting events of session {session_id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error counting events of session",
+        )
+
+
+def get_session_events_since(
+    db: Session, session_id: str, since_timestamp: float
+) -> List[Event]:
+    """Search for the events of a session stored at or after a timestamp"""
+    if not session_id or "_" not in session_id:
+        return []
+
+    user_id, app_name = session_id.split("_", 1)
+    try:
+        rows = (
+            db.query(StorageEvent)
+            .filter(
+                StorageEvent.app_name == app_name,
+                StorageEvent.user_id == user_id,
+                StorageEvent.session_id == session_id,
+                StorageEvent.timestamp >= datetime.fromtimestamp(since_timestamp),
+            )
+            .order_by(StorageEvent.timestamp.asc(), StorageEvent.id.asc())
+            .all()
+        )
+        return [_storage_event_to_event(row) for row in rows]
+    except SQLAlchemyError as e:
+        logger.error(f"Error searching for new events of session {session_id}: {str(e)}")
+        return []
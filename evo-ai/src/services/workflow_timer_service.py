@@ -0,0 +1,448 @@
+"""
+┌──────────────────────────────────────────────────────────────────────────────┐
+│ @author: Davidson Gomes                                                      │
+│ @file: workflow_timer_service.py                                             │
+│ Developed by: Davidson Gomes                                                 │
+│ Creation date: October 17, 2026                                              │
+│ Contact: contato@evolution-api.com                                           │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @copyright © Evolution API 2025. All rights reserved.                        │
+│ Licensed under the Apache License, Version 2.0                               │
+│                                                                              │
+│ You may not use this file except in compliance with the License.             │
+│ You may obtain a copy of the License at                                      │
+│                                                                              │
+│    http://www.apache.org/licenses/LICENSE-2.0                                │
+│                                                                              │
+│ Unless required by applicable law or agreed to in writing, software          │
+│ distributed under the License is distributed on an "AS IS" BASIS,            │
+│ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.     │
+│ See the License for the specific language governing permissions and          │
+│ limitations under the License.                                               │
+├──────────────────────────────────────────────────────────────────────────────┤
+│ @important                                                                   │
+│ For any future changes to the code in this file, it is recommended to        │
+│ include, together with the modification, the information of the developer    │
+│ who changed it and the date of modification.                                 │
+└──────────────────────────────────────────────────────────────────────────────┘
+"""
+
+"""
+Durable timers for workflow delay nodes.
+
+A delay longer than WORKFLOW_DELAY_INLINE_MAX does not sleep inside the
+request. The delay node stores a checkpoint of the workflow state in the
+workflow_timers table and the run ends; when the timer is due, the scheduler
+running in every worker rebuilds the workflow agent and resumes it from the
+delay node, appending the resulting events to the original session.
+
+Only runs with somewhere to send the post-delay output use a timer: A2A tasks
+whose execution sets a delivery task with deliver_resumed_output_to. The text
+of a resumed run is added to that task as an artifact and pushed through its
+push notification config. Runs without a delivery target keep sleeping inline,
+so their caller still receives the messages that follow the delay.
+
+Due timers are claimed with SELECT ... FOR UPDATE SKIP LOCKED and leased, so
+each timer fires in exactly one worker and a timer claimed by a worker that
+dies is picked up again once its lease expires. A resume is cancelled when its
+lease runs out, and a resume that already appended events to the session is
+marked failed rather than retried, so events are never replayed.
+"""
+
+import asyncio
+import logging
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from fastapi import HTTPException, status
+from google.adk.agents.invocation_context import (
+    InvocationContext,
+    new_invocation_context_id,
+)
+from google.adk.agents.run_config import RunConfig
+from sqlalchemy import func
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from src.config.database import SessionLocal
+from src.config.settings import settings
+from src.models.models import WorkflowTimer
+
+logger = logging.getLogger(__name__)
+
+# A2A task that receives the output of a run resumed later by a timer
+_delivery_task: ContextVar[Optional[str]] = ContextVar(
+    "workflow_delivery_task", default=None
+)
+
+
+@contextmanager
+def deliver_resumed_output_to(task_id: Optional[str]):
+    """Send the output of workflows paused during this run to the A2A task"""
+    token = _delivery_task.set(str(task_id) if task_id else None)
+    try:
+        yield
+    finally:
+        _delivery_task.reset(token)
+
+
+def get_delivery_task() -> Optional[str]:
+    """A2A task set by deliver_resumed_output_to, or None when there is none"""
+    return _delivery_task.get()
+
+
+def schedule_workflow_timer(
+    db: Session,
+    agent_id: str,
+    app_name: str,
+    user_id: str,
+    session_id: str,
+    node_id: str,
+    checkpoint: Dict[str, Any],
+    delay_seconds: float,
+    delivery_task_id: Optional[str] = None,
+) -> WorkflowTimer:
+    """Persist a timer that resumes the workflow at node_id after the delay"""
+    try:
+        timer = WorkflowTimer(
+            agent_id=agent_id,
+            app_name=app_name,
+            user_id=user_id,
+            session_id=session_id,
+            node_id=node_id,
+            checkpoint=checkpoint,
+            delivery_task_id=uuid.UUID(delivery_task_id) if delivery_task_id else None,
+            status="pending",
+            attempts=0,
+            fire_at=datetime.now(timezone.utc) + timedelta(seconds=delay_seconds),
+        )
+        db.add(timer)
+        db.commit()
+        db.refresh(timer)
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error(f"Error scheduling workflow timer: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error scheduling workflow timer",
+        )
+
+    workflow_timer_scheduler.wake()
+    logger.info(
+        f"Workflow timer {timer.id} scheduled for node {node_id} at {timer.fire_at}"
+    )
+    return timer
+
+
+def get_timer_stats(db: Session) -> Dict[str, int]:
+    """Count workflow timers by status"""
+    rows = (
+        db.query(WorkflowTimer.status, func.count(WorkflowTimer.id))
+        .group_by(WorkflowTimer.status)
+        .all()
+    )
+    return {row_status: count for row_status, count in rows}
+
+
+def _event_texts(event) -> List[str]:
+    """Text parts of an agent event, as delivered to the client"""
+    if event.author == "user" or not event.content or not event.content.parts:
+        return []
+    return [part.text for part in event.content.parts if getattr(part, "text", None)]
+
+
+class WorkflowTimerScheduler:
+    """Claims due workflow timers and resumes their workflows with bounded concurrency."""
+
+    def __init__(
+        self,
+        workers: int = 5,
+        batch_size: int = 20,
+        poll_interval: float = 1.0,
+        max_attempts: int = 3,
+        lease: float = 600,
+    ):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        # Running timers become due again after this lease if a worker dies mid-run
+        self.lease = timedelta(seconds=lease)
+        self._wake_event: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._worker_slots: Optional[asyncio.Semaphore] = None
+        self._in_flight: set = set()
+        self.fired = 0
+        self.retried = 0
+        self.failed = 0
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._wake_event = asyncio.Event()
+            self._worker_slots = asyncio.Semaphore(self.workers)
+            self._task = asyncio.create_task(self._run())
+            logger.info("Workflow timer scheduler started")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+
+    def wake(self):
+        if self._wake_event is not None:
+            self._wake_event.set()
+
+    async def _run(self):
+        while True:
+            try:
+                claimed = await self._dispatch_batch()
+            except Exception as e:
+                logger.error(f"Workflow timer scheduler error: {e}")
+                claimed = 0
+
+            # A full batch means more timers are probably due; loop right away
+            if claimed >= self.batch_size:
+                continue
+
+            try:
+                await asyncio.wait_for(self._wake_event.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake_event.clear()
+
+    async def _dispatch_batch(self) -> int:
+        # Only claim what the workers can take right now
+        capacity = min(self.batch_size, self.workers - len(self._in_flight))
+        if capacity <= 0:
+            return 0
+
+        timers = self._claim(capacity)
+        for timer in timers:
+            await self._worker_slots.acquire()
+            resume = asyncio.create_task(self._fire(timer))
+            self._in_flight.add(resume)
+            resume.add_done_callback(self._fire_done)
+        return len(timers)
+
+    def _fire_done(self, resume: asyncio.Task):
+        self._in_flight.discard(resume)
+        self._worker_slots.release()
+        self.wake()
+
+    def _claim(self, limit: int) -> list:
+        """Lock due timers, push them past the lease and return detached copies."""
+        db = SessionLocal()
+        try:
+            now = datetime.now(timezone.utc)
+            rows = (
+                db.query(WorkflowTimer)
+                .filter(
+                    WorkflowTimer.status.in_(["pending", "running"]),
+                    WorkflowTimer.fire_at <= now,
+                )
+                .order_by(WorkflowTimer.fire_at)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+                .all()
+            )
+            claimed = []
+            for row in rows:
+                row.status = "running"
+                row.fire_at = now + self.lease
+                claimed.append(
+                    {
+                        "id": row.id,
+                        "agent_id": row.agent_id,
+                        "app_name": row.app_name,
+                        "user_id": row.user_id,
+                        "session_id": row.session_id,
+                        "node_id": row.node_id,
+                        "checkpoint": row.checkpoint,
+                        "attempts": row.attempts,
+                        "delivery_task_id": row.delivery_task_id,
+                        "lease_expires": row.fire_at,
+                        "appended": 0,
+                        "output": [],
+                    }
+                )
+            db.commit()
+            return claimed
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.error(f"Error claiming workflow timers: {str(e)}")
+            return []
+        finally:
+            db.close()
+
+    async def _fire(self, timer: Dict[str, Any]):
+        error = None
+        retryable = True
+        # Stop before the lease lets another worker claim the same timer
+        remaining = (timer["lease_expires"] - datetime.now(timezone.utc)).total_seconds()
+        try:
+            await asyncio.wait_for(self._resume(timer), max(remaining, 0))
+        except LookupError as e:
+            error = str(e)
+            retryable = False
+        except asyncio.TimeoutError:
+            error = f"Resume exceeded the {self.lease.total_seconds():.0f}s lease"
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+
+        # Retrying would append the already recorded events a second time
+        if error is not None and timer["appended"]:
+            error = f"{error} (after {timer['appended']} events were appended)"
+            retryable = False
+
+        self._record_result(timer, error, retryable)
+
+        if error is None and timer["delivery_task_id"] and timer["output"]:
+            try:
+                await asyncio.to_thread(self._deliver, timer)
+            except Exception as e:
+                logger.error(f"Error delivering workflow timer {timer['id']}: {e}")
+
+    def _deliver(self, timer: Dict[str, Any]):
+        """Add the resumed output to the A2A task and push it to the client."""
+        # Imports moved to inside the function to avoid circular import
+        from src.services.a2a_task_service import append_task_artifacts, task_to_a2a
+        from src.services.push_notification_service import enqueue_push_notification
+
+        artifacts = [
+            {
+                "artifactId": str(uuid.uuid4()),
+                "parts": [{"type": "text", "text": "\n".join(timer["output"])}],
+            }
+        ]
+        db = SessionLocal()
+        try:
+            task = append_task_artifacts(db, timer["delivery_task_id"], artifacts)
+            if task and task.push_notification_config:
+                enqueue_push_notification(
+                    db, task_to_a2a(task), task.push_notification_config, str(task.id)
+                )
+        finally:
+            db.close()
+
+    async def _resume(self, timer: Dict[str, Any]):
+        """Rebuild the workflow agent and run it from the delay node."""
+        # Imports moved to inside the function to avoid circular import
+        from src.services.agent_service import get_agent
+        from src.services.adk.agent_builder import AgentBuilder
+        from src.services.service_providers import (
+            artifacts_service,
+            memory_service,
+            session_service,
+        )
+
+        db = SessionLocal()
+        exit_stack = None
+        try:
+            agent = get_agent(db, timer["agent_id"])
+            if agent is None:
+                raise LookupError(f"Agent {timer['agent_id']} not found")
+
+            workflow_agent, exit_stack = await AgentBuilder(db).get_or_build_agent(
+                agent
+            )
+            if not hasattr(workflow_agent, "resume_async"):
+                raise LookupError(f"Agent {timer['agent_id']} is not a workflow agent")
+
+            # The session services are sync and load every event
+            session = await asyncio.to_thread(
+                session_service.get_session,
+                app_name=timer["app_name"],
+                user_id=timer["user_id"],
+                session_id=timer["session_id"],
+            )
+            if session is None:
+                raise LookupError(f"Session {timer['session_id']} not found")
+
+            ctx = InvocationContext(
+                artifact_service=artifacts_service,
+                session_service=session_service,
+                memory_service=memory_service,
+                invocation_id=new_invocation_context_id(),
+                agent=workflow_agent,
+                session=session,
+                user_content=None,
+                run_config=RunConfig(),
+            )
+            async for event in workflow_agent.resume_async(
+                ctx, timer["node_id"], timer["checkpoint"]
+            ):
+                if not event.partial:
+                    await asyncio.to_thread(
+                        session_service.append_event, session=session, event=event
+                    )
+                    timer["appended"] += 1
+                    timer["output"].extend(_event_texts(event))
+        finally:
+            if exit_stack:
+                await exit_stack.aclose()
+            db.close()
+
+    def _record_result(
+        self, timer: Dict[str, Any], error: Optional[str], retryable: bool
+    ):
+        db = SessionLocal()
+        try:
+            row = db.get(WorkflowTimer, timer["id"])
+            if row is None:
+                return
+
+            row.attempts = timer["attempts"] + 1
+            if error is None:
+                row.status = "fired"
+                row.last_error = None
+                self.fired += 1
+                logger.info(f"Workflow timer {row.id} fired at node {row.node_id}")
+            elif not retryable or row.attempts >= self.max_attempts:
+                row.status = "failed"
+                row.last_error = error
+                self.failed += 1
+                logger.error(
+                    f"Workflow timer {row.id} failed after {row.attempts} attempts: {error}"
+                )
+            else:
+                delay = self.poll_interval * 30 * row.attempts
+                row.status = "pending"
+                row.last_error = error
+                row.fire_at = datetime.now(timezone.utc) + timedelta(seconds=delay)
+                self.retried += 1
+                logger.warning(
+                    f"Workflow timer {row.id} failed ({error}), retry in {delay:.0f}s"
+                )
+            db.commit()
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.error(f"Error recording workflow timer result: {str(e)}")
+        finally:
+            db.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "in_flight": len(self._in_flight),
+            "fired": self.fired,
+            "retried": self.retried,
+            "failed": self.failed,
+        }
+
+
+workflow_timer_scheduler = WorkflowTimerScheduler(
+    workers=settings.WORKFLOW_TIMER_WORKERS,
+    batch_size=settings.WORKFLOW_TIMER_BATCH_SIZE,
+    poll_interval=settings.WORKFLOW_TIMER_POLL_INTERVAL,
+    max_attempts=settings.WORKFLOW_TIMER_MAX_ATTEMPTS,
+    lease=settings.WORKFLOW_TIMER_LEASE,
+)
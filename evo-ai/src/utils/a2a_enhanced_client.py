@@ -37,6 +37,8 @@ automatically detecting and using the best available implementation.
 import logging
 import asyncio
 import json
+import time
+from collections import OrderedDict
 from typing import Dict, Any, Optional, AsyncIterator, Union, List
 from uuid import uuid4, UUID
 from dataclasses import dataclass
@@ -72,6 +74,7 @@ from src.schemas.a2a_enhanced_types import (
     convert_to_sdk_format,
     convert_from_sdk_format,
 )
+from src.config.settings import settings
 
 logger = logging.getLogger(__name__)
 
@@ -114,12 +117,26 @@ class EnhancedA2AClient:
     and provides a unified interface for communication with A2A agents.
     """
 
-    def __init__(self, config: A2AClientConfig):
+    # Failed detections are retried sooner than successful ones are refreshed
+    NEGATIVE_DETECTION_TTL = 10
+
+    def __init__(
+        self,
+        config: A2AClientConfig,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        detection_ttl: Optional[int] = None,
+        card_ttl: Optional[int] = None,
+    ):
         self.config = config
         self.httpx_client = None
         self.sdk_client = None
         self.available_implementations = []
         self._agent_cards_cache = {}
+        self._transport = transport
+        # None keeps the detection/cards for the lifetime of the client
+        self.detection_ttl = detection_ttl
+        self.card_ttl = card_ttl
+        self._detected_at: Optional[float] = None
 
     async def __aenter__(self):
         """Context manager entry."""
@@ -137,20 +154,42 @@ class EnhancedA2AClient:
         if self.config.custom_headers:
             headers.update(self.config.custom_headers)
 
-        self.httpx_client = httpx.AsyncClient(
-            timeout=self.config.timeout, headers=headers
-        )
+        if self.httpx_client is None:
+            # A shared transport lets every client reuse the same connection pool
+            self.httpx_client = httpx.AsyncClient(
+                timeout=self.config.timeout, headers=headers, transport=self._transport
+            )
+
+        await self.ensure_implementations()
+
+    async def ensure_implementations(self):
+        """Detect available implementations unless a previous detection is still fresh."""
+        if self._detected_at is not None:
+            if self.detection_ttl is None:
+                return
+            ttl = (
+                self.detection_ttl
+                if self.available_implementations
+                else min(self.detection_ttl, self.NEGATIVE_DETECTION_TTL)
+            )
+            if time.monotonic() - self._detected_at < ttl:
+                return
 
         # Detect available implementations
         await self._detect_available_implementations()
+        self._detected_at = time.monotonic()
 
         # Initialize SDK client if available
         if A2AImplementation.SDK in self.available_implementations and SDK_AVAILABLE:
             await self._initialize_sdk_client()
 
     async def close(self):
-        """Close client resources."""
-        if self.httpx_client:
+        """Close client resources.
+
+        A transport passed in by the caller is shared with other clients and
+        stays open; the client holds no connections of its own in that case.
+        """
+        if self.httpx_client and self._transport is None:
             await self.httpx_client.aclose()
 
         if self.sdk_client:
@@ -236,9 +275,13 @@ class EnhancedA2AClient:
 
         # Check
         cache_key = f"{agent_id_str}_{implementation}"
-        if cache_key in self._agent_cards_cache:
-            logger.debug(f"Returning cached agent card for {agent_id_str}")
-            return self._agent_cards_cache[cache_key]
+        cached = self._agent_cards_cache.get(cache_key)
+        if cached is not None:
+            expires_at, cached_response = cached
+            if expires_at is None or expires_at > time.monotonic():
+                logger.debug(f"Returning cached agent card for {agent_id_str}")
+                return cached_response
+            del self._agent_cards_cache[cache_key]
 
         chosen_impl = self._choose_implementation(implementation)
 
@@ -252,7 +295,12 @@ class EnhancedA2AClient:
 
             # Cache successful responses
             if response.success:
-                self._agent_cards_cache[cache_key] = response
+                expires_at = (
+                    time.monotonic() + self.card_ttl
+                    if self.card_ttl is not None
+                    else None
+                )
+                self._agent_cards_cache[cache_key] = (expires_at, response)
 
             return response
 
@@ -683,6 +731,112 @@ class EnhancedA2AClient:
         return A2AImplementation.CUSTOM
 
 
+class A2AClientRegistry:
+    """
+    Process-wide registry of initialized EnhancedA2AClient instances.
+
+    Clients are keyed by base URL (and the credentials/options sent to it) and
+    share a single connection pool, so implementation detection and agent cards
+    are reused across messages instead of being re-fetched per call. At most
+    max_clients are kept; the least recently used one is evicted beyond that.
+    """
+
+    def __init__(
+        self, detection_ttl: int = 300, card_ttl: int = 300, max_clients: int = 256
+    ):
+        self.detection_ttl = detection_ttl
+        self.card_ttl = card_ttl
+        self.max_clients = max_clients
+        self._clients: "OrderedDict[tuple, EnhancedA2AClient]" = OrderedDict()
+        self._locks: Dict[tuple, asyncio.Lock] = {}
+        self._transport: Optional[httpx.AsyncHTTPTransport] = None
+        self.evictions = 0
+
+    @staticmethod
+    def _make_key(config: A2AClientConfig) -> tuple:
+        return (
+            config.base_url.rstrip("/"),
+            config.api_key,
+            config.implementation,
+            config.timeout,
+            tuple(sorted((config.custom_headers or {}).items())),
+        )
+
+    def _get_transport(self) -> httpx.AsyncHTTPTransport:
+        if self._transport is None:
+            self._transport = httpx.AsyncHTTPTransport(
+                limits=httpx.Limits(
+                    max_connections=settings.HTTP_CLIENT_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.HTTP_CLIENT_MAX_KEEPALIVE,
+                    keepalive_expiry=settings.HTTP_CLIENT_KEEPALIVE_EXPIRY,
+                )
+            )
+        return self._transport
+
+    async def get_client(self, config: A2AClientConfig) -> EnhancedA2AClient:
+        """Return the shared client for this configuration, initializing it once.
+
+        The returned client is owned by the registry and must not be closed.
+        """
+        key = self._make_key(config)
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = EnhancedA2AClient(
+                    config,
+                    transport=self._get_transport(),
+                    detection_ttl=self.detection_ttl,
+                    card_ttl=self.card_ttl,
+                )
+                await client.initialize()
+                self._clients[key] = client
+                await self._evict()
+            else:
+                self._clients.move_to_end(key)
+                await client.ensure_implementations()
+        return client
+
+    async def _evict(self):
+        """Drop the least recently used clients beyond max_clients.
+
+        Evicted clients share the registry's transport, so closing them leaves
+        the connection pool open for the others.
+        """
+        while len(self._clients) > self.max_clients:
+            key, client = self._clients.popitem(last=False)
+            self._locks.pop(key, None)
+            self.evictions += 1
+            await client.close()
+
+    async def close(self):
+        """Close every registered client and the shared transport."""
+        for client in list(self._clients.values()):
+            await client.close()
+        self._clients.clear()
+        self._locks.clear()
+        if self._transport is not None:
+            await self._transport.aclose()
+            self._transport = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "clients": len(self._clients),
+            "max_clients": self.max_clients,
+            "evictions": self.evictions,
+            "base_urls": sorted({key[0] for key in self._clients}),
+            "detection_ttl": self.detection_ttl,
+            "card_ttl": self.card_ttl,
+        }
+
+
+a2a_client_registry = A2AClientRegistry(
+    detection_ttl=settings.A2A_CLIENT_DETECTION_TTL,
+    card_ttl=settings.A2A_AGENT_CARD_TTL,
+    max_clients=settings.A2A_CLIENT_REGISTRY_SIZE,
+)
+
+
 # Utility function to create client easily
 async def create_enhanced_a2a_client(
     base_url: str,